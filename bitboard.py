@@ -0,0 +1,602 @@
+# bitboard.py
+from itertools import product
+from board import FRAME_DIRECTIONS, id_sort_key
+from lanes import lane_tables
+
+
+class BitboardEngine:
+    def __init__(self, board):
+        """
+        Prépare une représentation compacte d'un plateau pour la recherche.
+
+        Un état est un couple (occupation, clé) où `occupation` est un entier
+        dont le bit `y * width + x` vaut 1 si la cellule (x, y) est occupée, et
+        `clé` un entier qui regroupe la position de chaque véhicule sur sa ligne
+        (x pour un véhicule horizontal, y pour un véhicule vertical), à raison de
+        `bits` bits par véhicule. La clé identifie l'état sans collision possible
+        et se met à jour en O(1) quand un seul véhicule bouge ; les entiers Python
+        n'ayant pas de taille maximale, elle convient à tous les plateaux (plus de
+        60 bits pour 30 véhicules sur une grille 10x10).
+
+        Le moteur travaille dans le repère où la sortie est à droite (voir
+        `Board.to_exit_frame`) : les mouvements décodés sont ramenés dans le repère
+        du plateau d'origine.
+
+        Args:
+            board (Board): Plateau à partir duquel l'état initial est construit
+        """
+        self.exit_side = board.exit_side
+        self.directions = FRAME_DIRECTIONS[board.exit_side]
+        if board.exit_side != 'right':
+            board = board.to_exit_frame()
+
+        self.width = board.width
+        self.height = board.height
+        self.exit_pos = board.exit_pos
+
+        # Ordre fixe des véhicules : l'indice d'un véhicule dans ce tuple détermine
+        # l'emplacement de sa position dans la clé
+        self.ids = tuple(sorted(board.vehicles, key=id_sort_key))
+        self.bits = max(self.width, self.height).bit_length()
+        self.position_mask = (1 << self.bits) - 1
+        self.shifts = [index * self.bits for index in range(len(self.ids))]
+        self.lengths = []
+        self.orientations = []
+        self.lanes = []  # Ligne (H) ou colonne (V) sur laquelle se déplace le véhicule
+        self.main_index = None
+
+        # Tables précalculées par véhicule et par position
+        self.masks = []  # Cellules occupées
+        self.back_cells = []  # Cellule à libérer pour reculer (ou 0 si impossible)
+        self.front_cells = []  # Cellule à libérer pour avancer (ou 0 si impossible)
+        self.back_toggles = []  # Bits à inverser pour reculer d'une case
+        self.front_toggles = []  # Bits à inverser pour avancer d'une case
+
+        positions = []
+        for index, vid in enumerate(self.ids):
+            vehicle = board.vehicles[vid]
+            horizontal = vehicle.orientation == 'H'
+            self.lengths.append(vehicle.length)
+            self.orientations.append(vehicle.orientation)
+            self.lanes.append(vehicle.y if horizontal else vehicle.x)
+            positions.append(vehicle.x if horizontal else vehicle.y)
+            if vehicle.is_main:
+                self.main_index = index
+
+            lane_size = self.width if horizontal else self.height
+            cells = [self._cell_bit(index, p) for p in range(lane_size)]
+            masks, back_cells, front_cells, back_toggles, front_toggles = [], [], [], [], []
+            for p in range(lane_size - vehicle.length + 1):
+                mask = 0
+                for i in range(vehicle.length):
+                    mask |= cells[p + i]
+                masks.append(mask)
+
+                if p > 0:
+                    back_cells.append(cells[p - 1])
+                    back_toggles.append(cells[p - 1] | cells[p + vehicle.length - 1])
+                else:
+                    back_cells.append(0)
+                    back_toggles.append(0)
+
+                if p + vehicle.length < lane_size:
+                    front_cells.append(cells[p + vehicle.length])
+                    front_toggles.append(cells[p] | cells[p + vehicle.length])
+                else:
+                    front_cells.append(0)
+                    front_toggles.append(0)
+
+            self.masks.append(masks)
+            self.back_cells.append(back_cells)
+            self.front_cells.append(front_cells)
+            self.back_toggles.append(back_toggles)
+            self.front_toggles.append(front_toggles)
+
+        self.initial_positions = tuple(positions)
+
+        # Position de la voiture principale pour laquelle le niveau est résolu,
+        # exprimée directement sur les bits de la clé
+        self.goal_position = None
+        if self.main_index is not None and self.orientations[self.main_index] == 'H':
+            self.goal_position = self.exit_pos[0] - self.lengths[self.main_index] + 1
+            self.goal_mask = self.position_mask << self.shifts[self.main_index]
+            self.goal_bits = self.goal_position << self.shifts[self.main_index]
+
+        # Masques de colonnes, utiles au calcul de l'heuristique
+        self.column_masks = []
+        for x in range(self.width):
+            mask = 0
+            for y in range(self.height):
+                mask |= 1 << (y * self.width + x)
+            self.column_masks.append(mask)
+
+        # Tables de déplacement par ligne (voir lanes.py) : pour chaque véhicule, le
+        # masque de sa ligne dans l'occupation, la table qui ramène ces bits à une
+        # occupation de ligne compacte, et la table des cases libres pour sa longueur
+        self.row_tables = lane_tables(self.width)
+        self.column_tables = lane_tables(self.height)
+        self.lane_masks = []
+        self.lane_bits = []
+        self.free_ranges = []
+        row_bits = self._compact_table(self.width, self.height, lambda i, lane: 1 << (lane * self.width + i))
+        column_bits = self._compact_table(self.height, self.width, lambda i, lane: 1 << (i * self.width + lane))
+        for index in range(len(self.ids)):
+            lane = self.lanes[index]
+            if self.orientations[index] == 'H':
+                self.lane_masks.append(((1 << self.width) - 1) << (lane * self.width))
+                self.lane_bits.append(row_bits[lane])
+                self.free_ranges.append(self.row_tables.free[self.lengths[index]])
+            else:
+                self.lane_masks.append(self.column_masks[lane])
+                self.lane_bits.append(column_bits[lane])
+                self.free_ranges.append(self.column_tables.free[self.lengths[index]])
+
+        # Véhicules verticaux de chaque colonne, de haut en bas (leur ordre ne change jamais),
+        # et véhicules horizontaux qui partagent la ligne de la voiture principale
+        self.column_groups = [[] for _ in range(self.width)]
+        self.row_vehicles = []
+        for index in sorted(range(len(self.ids)), key=lambda i: positions[i]):
+            if index == self.main_index:
+                continue
+            if self.orientations[index] == 'V':
+                self.column_groups[self.lanes[index]].append(index)
+            elif self.main_index is not None and self.lanes[index] == self.lanes[self.main_index]:
+                self.row_vehicles.append(index)
+        self._pattern_tables = {}  # Tables de la base de motifs par métrique, chargées à la demande
+
+    @staticmethod
+    def _compact_table(lane_size, lane_count, cell_bit):
+        """
+        Construit, pour chaque ligne (ou colonne), la table qui associe les bits
+        d'occupation de ses cellules à l'occupation compacte de la ligne.
+
+        Args:
+            lane_size (int): Nombre de cases d'une ligne
+            lane_count (int): Nombre de lignes
+            cell_bit (callable): cell_bit(i, lane) donne le bit de la case i de la ligne `lane`
+
+        Returns:
+            list: Un dictionnaire {bits d'occupation: occupation compacte} par ligne
+        """
+        tables = []
+        for lane in range(lane_count):
+            bits = [cell_bit(i, lane) for i in range(lane_size)]
+            # Chaque occupation se déduit de celle sans son bit de poids fort
+            table = [0]
+            for i in range(lane_size):
+                table += [spread | bits[i] for spread in table]
+            tables.append({spread: compact for compact, spread in enumerate(table)})
+        return tables
+
+    def free_range(self, state, index):
+        """
+        Retourne le nombre de cases libres derrière et devant un véhicule.
+
+        Args:
+            state (tuple): (occupation, clé)
+            index (int): Indice du véhicule dans `ids`
+
+        Returns:
+            tuple: (cases libres en reculant, cases libres en avançant)
+        """
+        occupancy, key = state
+        position = (key >> self.shifts[index]) & self.position_mask
+        bits = self.lane_bits[index][occupancy & self.lane_masks[index]]
+        return self.free_ranges[index][position][bits]
+
+    def _cell_bit(self, index, position):
+        """Retourne le bit de la cellule `position` sur la ligne du véhicule `index`."""
+        lane = self.lanes[index]
+        if self.orientations[index] == 'H':
+            return 1 << (lane * self.width + position)
+        return 1 << (position * self.width + lane)
+
+    def initial_state(self):
+        """
+        Retourne l'état initial.
+
+        Returns:
+            tuple: (occupation, clé)
+        """
+        return self.state_from_positions(self.initial_positions)
+
+    def state_from_positions(self, positions):
+        """
+        Construit l'état correspondant à une position de chaque véhicule.
+
+        Args:
+            positions (tuple): Position de chaque véhicule, dans l'ordre de `ids`
+
+        Returns:
+            tuple: (occupation, clé)
+        """
+        occupancy = 0
+        key = 0
+        for index, position in enumerate(positions):
+            occupancy |= self.masks[index][position]
+            key |= position << self.shifts[index]
+        return occupancy, key
+
+    def state_from_board(self, board):
+        """
+        Construit l'état correspondant à un plateau du même niveau.
+
+        Args:
+            board (Board): Plateau contenant les mêmes véhicules
+
+        Returns:
+            tuple: (occupation, clé), ou None si les véhicules ne correspondent pas
+        """
+        if self.exit_side != 'right':
+            board = board.to_exit_frame()
+
+        positions = []
+        for vid, orientation in zip(self.ids, self.orientations):
+            vehicle = board.vehicles.get(vid)
+            if vehicle is None:
+                return None
+            positions.append(vehicle.x if orientation == 'H' else vehicle.y)
+        return self.state_from_positions(positions)
+
+    def positions(self, key):
+        """
+        Décode une clé en tuple de positions.
+
+        Args:
+            key (int): Clé d'état
+
+        Returns:
+            tuple: Position de chaque véhicule, dans l'ordre de `ids`
+        """
+        mask = self.position_mask
+        return tuple((key >> shift) & mask for shift in self.shifts)
+
+    def is_goal(self, state):
+        """
+        Vérifie si la voiture principale a atteint la sortie.
+
+        Args:
+            state (tuple): (occupation, clé)
+
+        Returns:
+            bool: True si l'état est résolu
+        """
+        if self.goal_position is None:
+            return False
+        return state[1] & self.goal_mask == self.goal_bits
+
+    def neighbors(self, state, metric='step'):
+        """
+        Génère tous les états accessibles en un mouvement.
+
+        Le mouvement est codé par un entier : `2 * indice` pour reculer
+        (gauche/haut) et `2 * indice + 1` pour avancer (droite/bas), augmenté de
+        `2 * nombre de véhicules * (distance - 1)` pour un glissement de plusieurs cases.
+
+        Args:
+            state (tuple): (occupation, clé)
+            metric (str): 'step' (une case par mouvement) ou 'slide' (autant de cases
+                libres que souhaité en un seul mouvement)
+
+        Yields:
+            tuple: (mouvement, nouvel état)
+        """
+        if metric == 'slide':
+            yield from self._slide_neighbors(state)
+            return
+
+        occupancy, key = state
+        mask = self.position_mask
+        for index, shift in enumerate(self.shifts):
+            position = (key >> shift) & mask
+
+            cell = self.back_cells[index][position]
+            if cell and not occupancy & cell:
+                yield 2 * index, (occupancy ^ self.back_toggles[index][position], key - (1 << shift))
+
+            cell = self.front_cells[index][position]
+            if cell and not occupancy & cell:
+                yield 2 * index + 1, (occupancy ^ self.front_toggles[index][position], key + (1 << shift))
+
+    def _slide_neighbors(self, state):
+        """Génère les glissements d'une ou plusieurs cases (voir `neighbors`)."""
+        occupancy, key = state
+        stride = 2 * len(self.ids)
+        mask = self.position_mask
+        for index, shift in enumerate(self.shifts):
+            position = (key >> shift) & mask
+
+            # Étendue des glissements possibles, lue dans la table de la ligne du véhicule
+            bits = self.lane_bits[index][occupancy & self.lane_masks[index]]
+            back, forward = self.free_ranges[index][position][bits]
+            if not back and not forward:
+                continue
+
+            masks = self.masks[index]
+            vacated = occupancy ^ masks[position]
+            for distance in range(1, back + 1):
+                yield stride * (distance - 1) + 2 * index, (vacated | masks[position - distance],
+                                                            key - (distance << shift))
+            for distance in range(1, forward + 1):
+                yield stride * (distance - 1) + 2 * index + 1, (vacated | masks[position + distance],
+                                                                key + (distance << shift))
+
+    def decode_move(self, move, with_distance=False):
+        """
+        Traduit un mouvement codé en tuple (vehicle_id, direction).
+
+        Args:
+            move (int): Mouvement codé par `neighbors`
+            with_distance (bool): True pour ajouter la distance parcourue (métrique 'slide')
+
+        Returns:
+            tuple: (vehicle_id, direction) ou (vehicle_id, direction, distance)
+        """
+        extra, move = divmod(move, 2 * len(self.ids))
+        index, forward = divmod(move, 2)
+        if self.orientations[index] == 'H':
+            direction = 'right' if forward else 'left'
+        else:
+            direction = 'down' if forward else 'up'
+        direction = self.directions[direction]
+
+        if with_distance:
+            return self.ids[index], direction, extra + 1
+        return self.ids[index], direction
+
+    def heuristic(self, state, metric='step'):
+        """
+        Évalue un état avec la même formule que `Solver.heuristic`, mais par
+        opérations binaires plutôt qu'en parcourant les véhicules.
+
+        Args:
+            state (tuple): (occupation, clé)
+            metric (str): 'step' ou 'slide' ; en 'slide', la voiture principale
+                rejoint la sortie en un seul mouvement quelle que soit la distance
+
+        Returns:
+            float: Valeur heuristique
+        """
+        if self.main_index is None:
+            return float('inf')
+
+        occupancy, key = state
+        positions = self.positions(key)
+        main = self.main_index
+        main_end = positions[main] + self.lengths[main]
+        main_row = self.lanes[main]
+        exit_x = self.exit_pos[0]
+
+        distance_to_exit = exit_x - (main_end - 1)
+        if metric == 'slide':
+            distance_to_exit = min(distance_to_exit, 1)
+
+        direct_blockers = 0
+        secondary_blockers = 0
+
+        # Si la table de la ligne de sortie indique un chemin libre, aucun véhicule ne bloque
+        _, forward = self.free_range(state, main)
+        if main_end + forward <= exit_x:
+            counts = self.column_tables.counts
+            for index, position in enumerate(positions):
+                if index == main:
+                    continue
+
+                if self.orientations[index] == 'V':
+                    x = self.lanes[index]
+                    if main_end <= x <= exit_x and position <= main_row < position + self.lengths[index]:
+                        direct_blockers += 1
+                        # Cellules occupées dans la colonne du bloqueur, hors bloqueur lui-même
+                        bits = self.lane_bits[index][occupancy & self.lane_masks[index]]
+                        secondary_blockers += counts[bits] - self.lengths[index]
+                elif self.lanes[index] == main_row:
+                    if position + self.lengths[index] > main_end and position <= exit_x:
+                        direct_blockers += 1
+
+        density_factor = len(positions) / (self.width * self.height)
+
+        return (
+                distance_to_exit * 1.0 +
+                direct_blockers * 2.0 +
+                secondary_blockers * 0.5 +
+                density_factor * 3.0
+        )
+
+    def lower_bound(self, state, metric='step'):
+        """
+        Heuristique admissible : ne surestime jamais le nombre de mouvements restants.
+
+        Chaque véhicule qui occupe la ligne de sortie devant la voiture principale
+        doit bouger au moins une fois (en 'step', au moins du nombre de cases
+        nécessaires pour libérer la ligne), et la voiture principale doit parcourir
+        la distance qui la sépare de la sortie.
+
+        Args:
+            state (tuple): (occupation, clé)
+            metric (str): 'step' ou 'slide'
+
+        Returns:
+            int: Borne inférieure du nombre de mouvements (inf si la sortie est
+                 définitivement bloquée)
+        """
+        if self.goal_position is None:
+            return float('inf')
+
+        key = state[1]
+        mask = self.position_mask
+        main = self.main_index
+        main_position = (key >> self.shifts[main]) & mask
+        main_end = main_position + self.lengths[main]
+        main_row = self.lanes[main]
+        exit_x = self.exit_pos[0]
+
+        distance = self.goal_position - main_position
+        bound = distance if metric == 'step' else min(distance, 1)
+
+        # Chemin libre jusqu'à la sortie (table de la ligne) : aucun bloqueur à compter
+        _, forward = self.free_range(state, main)
+        if forward >= distance:
+            return bound
+
+        for index, shift in enumerate(self.shifts):
+            if index == main:
+                continue
+            position = (key >> shift) & mask
+            length = self.lengths[index]
+
+            if self.orientations[index] == 'V':
+                x = self.lanes[index]
+                if main_end <= x <= exit_x and position <= main_row < position + length:
+                    if metric == 'slide':
+                        bound += 1
+                        continue
+                    # Nombre de cases à parcourir pour libérer la ligne, vers le haut ou vers le bas
+                    up = position + length - main_row
+                    down = main_row - position + 1
+                    if main_row - length < 0:
+                        up = float('inf')
+                    if main_row + length >= self.height:
+                        down = float('inf')
+                    bound += min(up, down)
+            elif self.lanes[index] == main_row and position >= main_end:
+                # Un véhicule horizontal devant la voiture principale ne peut jamais lui céder la place
+                return float('inf')
+
+        return bound
+
+    def _exit_row_bound(self, state, metric):
+        """
+        Partie commune des heuristiques admissibles.
+
+        Returns:
+            tuple: (borne due à la voiture principale, fin de la voiture principale,
+                    True si des véhicules bloquent encore la sortie)
+        """
+        key = state[1]
+        main = self.main_index
+        main_position = (key >> self.shifts[main]) & self.position_mask
+        main_end = main_position + self.lengths[main]
+
+        distance = self.goal_position - main_position
+        bound = distance if metric == 'step' else min(distance, 1)
+
+        _, forward = self.free_range(state, main)
+        if forward >= distance:
+            return bound, main_end, False
+
+        # Un véhicule horizontal devant la voiture principale ne peut jamais lui céder la place
+        for index in self.row_vehicles:
+            if (key >> self.shifts[index]) & self.position_mask >= main_end:
+                return float('inf'), main_end, True
+        return bound, main_end, True
+
+    def obstruction_bound(self, state, metric='step'):
+        """
+        Heuristique admissible "bloqueurs de bloqueurs".
+
+        Chaque bloqueur vertical de la ligne de sortie doit la libérer vers le haut
+        ou vers le bas ; tous les véhicules qui occupent les cases qu'il doit
+        traverser devront bouger au moins une fois. Les directions sont choisies
+        conjointement pour tous les bloqueurs, et un véhicule gênant plusieurs
+        bloqueurs n'est compté qu'une fois : la borne reste admissible.
+
+        Args:
+            state (tuple): (occupation, clé)
+            metric (str): 'step' ou 'slide'
+
+        Returns:
+            int: Borne inférieure du nombre de mouvements (inf si la sortie est
+                 définitivement bloquée)
+        """
+        if self.goal_position is None:
+            return float('inf')
+
+        bound, main_end, blocked = self._exit_row_bound(state, metric)
+        if not blocked or bound == float('inf'):
+            return bound
+
+        occupancy, key = state
+        positions = self.positions(key)
+        main_row = self.lanes[self.main_index]
+        exit_x = self.exit_pos[0]
+        cells = [self.masks[index][position] for index, position in enumerate(positions)]
+
+        options = []
+        for x in range(main_end, exit_x + 1):
+            for index in self.column_groups[x]:
+                position = positions[index]
+                length = self.lengths[index]
+                if not position <= main_row < position + length:
+                    continue
+
+                choices = []
+                # Vers le haut : le véhicule doit finir au-dessus de la ligne de sortie
+                if main_row - length >= 0:
+                    target = main_row - length
+                    choices.append((position - target, range(target, position)))
+                # Vers le bas : le véhicule doit finir sous la ligne de sortie
+                if main_row + length < self.height:
+                    target = main_row + 1
+                    choices.append((target - position, range(position + length, target + length)))
+
+                if not choices:
+                    return float('inf')
+
+                blocker_options = []
+                for steps, rows in choices:
+                    traversed = 0
+                    for y in rows:
+                        traversed |= 1 << (y * self.width + x)
+                    obstructors = frozenset()
+                    if occupancy & traversed:
+                        obstructors = frozenset(i for i, mask in enumerate(cells) if mask & traversed)
+                    blocker_options.append((steps if metric == 'step' else 1, obstructors))
+                options.append(blocker_options)
+
+        best = float('inf')
+        for combination in product(*options):
+            obstructors = frozenset().union(*(o for _, o in combination))
+            best = min(best, sum(cost for cost, _ in combination) + len(obstructors))
+        return bound + best
+
+    def pattern_bound(self, state, metric='step'):
+        """
+        Heuristique admissible fondée sur la base de motifs additive (pattern_db.py).
+
+        La distance de la voiture principale à la sortie s'ajoute, pour chaque
+        colonne devant elle, au nombre minimal de mouvements des véhicules verticaux
+        de cette colonne pour libérer la ligne de sortie.
+
+        Args:
+            state (tuple): (occupation, clé)
+            metric (str): 'step' ou 'slide'
+
+        Returns:
+            int: Borne inférieure du nombre de mouvements (inf si la sortie est
+                 définitivement bloquée)
+        """
+        if self.goal_position is None:
+            return float('inf')
+
+        bound, main_end, blocked = self._exit_row_bound(state, metric)
+        if not blocked or bound == float('inf'):
+            return bound
+
+        tables = self._pattern_tables.get(metric)
+        if tables is None:
+            from pattern_db import pattern_database  # Import ici : la base n'est chargée qu'à la demande
+            database = pattern_database(self.height)
+            main_row = self.lanes[self.main_index]
+            tables = []
+            for group in self.column_groups:
+                lengths = tuple(self.lengths[index] for index in group)
+                tables.append(database.table(metric, main_row, lengths) if group else None)
+            self._pattern_tables[metric] = tables
+
+        key = state[1]
+        mask = self.position_mask
+        for x in range(main_end, self.exit_pos[0] + 1):
+            group = self.column_groups[x]
+            if group:
+                bound += tables[x][tuple((key >> self.shifts[index]) & mask for index in group)]
+        return bound
@@ -1,17 +1,143 @@
-from copy import deepcopy
+import os
+import random
+
+# Valeurs aléatoires de Zobrist, tirées à la demande pour chaque (véhicule, x, y)
+_zobrist_table = {}
+_zobrist_random = random.Random(0x52554348)
+
+# Direction inverse de chaque déplacement, pour annuler un mouvement
+OPPOSITE_DIRECTIONS = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+# Côtés possibles pour la sortie
+EXIT_SIDES = ('right', 'left', 'bottom', 'top')
+
+# Direction sur le plateau correspondant à chaque direction du repère "sortie à droite"
+# (voir Board.to_exit_frame)
+FRAME_DIRECTIONS = {
+    'right': {'right': 'right', 'left': 'left', 'down': 'down', 'up': 'up'},
+    'left': {'right': 'left', 'left': 'right', 'down': 'down', 'up': 'up'},
+    'bottom': {'right': 'down', 'left': 'up', 'down': 'right', 'up': 'left'},
+    'top': {'right': 'up', 'left': 'down', 'down': 'right', 'up': 'left'},
+}
+
+
+def id_sort_key(vehicle_id):
+    """
+    Clé de tri des identifiants de véhicules.
+
+    Les identifiants peuvent être des lettres ou des entiers (au-delà de 25
+    véhicules) : les entiers sont placés avant les chaînes pour que le tri ne
+    mélange jamais les deux types.
+    """
+    return isinstance(vehicle_id, str), vehicle_id
+
+
+def zobrist_value(vehicle_id, x, y):
+    """
+    Retourne la valeur de Zobrist associée à un véhicule placé en (x, y).
+
+    Args:
+        vehicle_id (str): ID du véhicule
+        x (int): Coordonnée x
+        y (int): Coordonnée y
+
+    Returns:
+        int: Entier aléatoire de 64 bits, toujours le même pour un triplet donné
+    """
+    key = (vehicle_id, x, y)
+    value = _zobrist_table.get(key)
+    if value is None:
+        value = _zobrist_random.getrandbits(64)
+        _zobrist_table[key] = value
+    return value
 
 
 class Board:
-    def __init__(self, size=6):
+    # Vérifie la cohérence de la grille d'occupation après chaque modification
+    # (coûteux : à activer uniquement pour les tests, ou via RUSHHOUR_DEBUG=1)
+    debug_checks = os.environ.get('RUSHHOUR_DEBUG') == '1'
+
+    def __init__(self, size=6, height=None, exit_side='right', exit_line=None):
         """
         Initialise un la grille de jeu
 
         Args:
-            size (int): Taille de la grille de jeu (6x6)
+            size (int): Largeur de la grille de jeu (6 pour la grille 6x6 standard)
+            height (int): Hauteur de la grille (None pour une grille carrée)
+            exit_side (str): Côté de la sortie : 'right', 'left', 'bottom' ou 'top'
+            exit_line (int): Ligne (sortie à gauche ou à droite) ou colonne (sortie en
+                             haut ou en bas) de la sortie ; par défaut celle du milieu,
+                             soit la ligne 2 sur une grille 6x6
         """
-        self.size = size
+        self.width = size
+        self.height = height if height is not None else size
+        self.size = max(self.width, self.height)  # Plus grande dimension
         self.vehicles = {}  # Dictionnaire permettant de stocker les véhicules
-        self.exit_pos = (size - 1, 2)  # Position de la sortie
+        self.set_exit(exit_side, exit_line)
+        self.zobrist_hash = 0  # Hash de Zobrist, mis à jour à chaque ajout ou déplacement
+
+        # Clé exacte de l'état (voir get_state_key) : description des véhicules, refaite
+        # quand un véhicule est ajouté, puis un octet de position par véhicule, tenu à jour
+        # à chaque déplacement. _slots donne l'indice de chaque véhicule dans _positions
+        # (None tant que la description n'a pas été refaite)
+        self._layout = b''
+        self._slots = None
+        self._positions = bytearray()
+
+        # Grille d'occupation : grid[y][x] contient l'ID du véhicule présent, ou None.
+        # Elle est tenue à jour par add_vehicle et move_vehicle.
+        self.grid = [[None] * self.width for _ in range(self.height)]
+
+        # Occupation de chaque ligne et de chaque colonne sous forme de bits
+        # (bit x de row_bits[y], bit y de column_bits[x]), pour les tables de lanes.py
+        self.row_bits = [0] * self.height
+        self.column_bits = [0] * self.width
+
+        # Journal des mouvements joués avec `apply`, annulables avec `undo`
+        self.history = []
+
+    def set_exit(self, side='right', line=None):
+        """
+        Place la sortie sur un bord du plateau.
+
+        Args:
+            side (str): 'right', 'left', 'bottom' ou 'top'
+            line (int): Ligne (gauche/droite) ou colonne (haut/bas) de la sortie,
+                        celle du milieu par défaut
+        """
+        if side not in EXIT_SIDES:
+            raise ValueError(f"Côté de sortie inconnu: {side}")
+
+        if side in ('right', 'left'):
+            line = (self.height - 1) // 2 if line is None else line
+            self.exit_pos = (self.width - 1 if side == 'right' else 0, line)
+        else:
+            line = (self.width - 1) // 2 if line is None else line
+            self.exit_pos = (line, self.height - 1 if side == 'bottom' else 0)
+        self.exit_side = side
+
+    def lane_size(self, vehicle):
+        """Retourne le nombre de cases de la ligne (ou colonne) sur laquelle se déplace le véhicule."""
+        return self.width if vehicle.orientation == 'H' else self.height
+
+    def _place(self, vehicle, vehicle_id):
+        """Inscrit `vehicle_id` (ou None pour libérer) dans les cellules du véhicule."""
+        grid = self.grid
+        # Les cellules sont toutes libres avant une pose et toutes occupées avant un retrait :
+        # un XOR suffit à mettre à jour les bits de lignes et de colonnes
+        if vehicle.orientation == 'H':
+            y = vehicle.y
+            row = grid[y]
+            for x in range(vehicle.x, vehicle.x + vehicle.length):
+                row[x] = vehicle_id
+                self.column_bits[x] ^= 1 << y
+            self.row_bits[y] ^= ((1 << vehicle.length) - 1) << vehicle.x
+        else:
+            x = vehicle.x
+            for y in range(vehicle.y, vehicle.y + vehicle.length):
+                grid[y][x] = vehicle_id
+                self.row_bits[y] ^= 1 << x
+            self.column_bits[x] ^= ((1 << vehicle.length) - 1) << vehicle.y
 
     def add_vehicle(self, vehicle):
         """
@@ -29,8 +155,20 @@ class Board:
                 print(f"Impossible d'ajouter le véhicule {vehicle.id} aux coordonnées {x},{y} - cellule occupée")
                 return False
 
+        # Un véhicule qui porte le même ID remplace le précédent
+        previous = self.vehicles.get(vehicle.id)
+        if previous is not None:
+            self._place(previous, None)
+            self.zobrist_hash ^= zobrist_value(previous.id, previous.x, previous.y)
+
         # Si toutes les cellules sont vides, ajoute le véhicule
         self.vehicles[vehicle.id] = vehicle
+        self._place(vehicle, vehicle.id)
+        self.zobrist_hash ^= zobrist_value(vehicle.id, vehicle.x, vehicle.y)
+        self._slots = None  # La description des véhicules sera refaite par get_state_key
+
+        if self.debug_checks:
+            self.check_consistency()
         return True
 
     def is_cell_empty(self, x, y):
@@ -45,31 +183,30 @@ class Board:
             bool: True si la cellule est vide
         """
         # On vérifie si la position est en dehors de la grille
-        if x < 0 or y < 0 or x >= self.size or y >= self.size:
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
             return False
 
-        # On vérifie si un véhicule occupe une cellule
-        for vehicle in self.vehicles.values():
-            coords = vehicle.get_coordinates()
-            if (x, y) in coords:
-                return False
-
-        return True
+        # On vérifie si un véhicule occupe la cellule
+        return self.grid[y][x] is None
 
     def get_vehicle_at(self, x, y):
         """Retourne le véhicule à la position donnée ou None si je ne trouve rien."""
-        for vehicle in self.vehicles.values():
-            if (x, y) in vehicle.get_coordinates():
-                return vehicle
-        return None
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return None
 
-    def move_vehicle(self, vehicle_id, direction):
+        vehicle_id = self.grid[y][x]
+        if vehicle_id is None:
+            return None
+        return self.vehicles[vehicle_id]
+
+    def move_vehicle(self, vehicle_id, direction, distance=1):
         """
         Déplace un véhicule dans la direction donnée.
 
         Args:
             vehicle_id (str): ID du véhicule à déplacer
             direction (str): 'up', 'down', 'left', 'right'
+            distance (int): Nombre de cases à parcourir (glissement)
 
         Returns:
             bool: True si le mouvement a été effectué
@@ -78,53 +215,325 @@ class Board:
             return False
 
         vehicle = self.vehicles[vehicle_id]
-        if vehicle.can_move(direction, self):
-            vehicle.move(direction)
+        if vehicle.can_move(direction, self, distance):
+            self.zobrist_hash ^= zobrist_value(vehicle_id, vehicle.x, vehicle.y)
+            self._place(vehicle, None)
+            vehicle.move(direction, distance)
+            self._place(vehicle, vehicle_id)
+            self.zobrist_hash ^= zobrist_value(vehicle_id, vehicle.x, vehicle.y)
+            if self._slots is not None:
+                self._positions[self._slots[vehicle_id]] = vehicle.position
+
+            if self.debug_checks:
+                self.check_consistency()
             return True
 
         return False
 
+    def apply(self, move):
+        """
+        Joue un mouvement sur place et l'inscrit dans le journal.
+
+        Args:
+            move (tuple): (vehicle_id, direction) ou (vehicle_id, direction, distance)
+
+        Returns:
+            bool: True si le mouvement a été effectué
+        """
+        vehicle_id, direction = move[0], move[1]
+        distance = move[2] if len(move) > 2 else 1
+        if self.move_vehicle(vehicle_id, direction, distance):
+            self.history.append((vehicle_id, direction, distance))
+            return True
+        return False
+
+    def undo(self):
+        """
+        Annule sur place le dernier mouvement du journal.
+
+        Le mouvement inverse est toujours possible (les cases qu'il parcourt viennent
+        d'être libérées), il est donc appliqué sans nouvelle vérification.
+
+        Returns:
+            tuple: (vehicle_id, direction, distance) du mouvement annulé, ou None si
+                   le journal est vide
+        """
+        if not self.history:
+            return None
+
+        move = self.history.pop()
+        vehicle_id, direction, distance = move
+        vehicle = self.vehicles[vehicle_id]
+
+        self.zobrist_hash ^= zobrist_value(vehicle_id, vehicle.x, vehicle.y)
+        self._place(vehicle, None)
+        vehicle.move(OPPOSITE_DIRECTIONS[direction], distance)
+        self._place(vehicle, vehicle_id)
+        self.zobrist_hash ^= zobrist_value(vehicle_id, vehicle.x, vehicle.y)
+        if self._slots is not None:
+            self._positions[self._slots[vehicle_id]] = vehicle.position
+
+        if self.debug_checks:
+            self.check_consistency()
+        return move
+
+    def check_consistency(self):
+        """
+        Vérifie que la grille d'occupation correspond exactement aux véhicules.
+
+        La grille est reconstruite à partir des positions des véhicules puis
+        comparée à celle tenue à jour de façon incrémentale.
+
+        Raises:
+            AssertionError: Si la grille, les bits d'occupation, le hash de Zobrist ou
+                            la clé d'état sont incohérents
+        """
+        expected = [[None] * self.width for _ in range(self.height)]
+        expected_hash = 0
+        for vehicle_id, vehicle in self.vehicles.items():
+            expected_hash ^= zobrist_value(vehicle_id, vehicle.x, vehicle.y)
+            for x, y in vehicle.get_coordinates():
+                if not (0 <= x < self.width and 0 <= y < self.height):
+                    raise AssertionError(f"Véhicule {vehicle_id} hors de la grille en ({x}, {y})")
+                if expected[y][x] is not None:
+                    raise AssertionError(f"Cellule ({x}, {y}) occupée par {expected[y][x]} et {vehicle_id}")
+                expected[y][x] = vehicle_id
+
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.grid[y][x] != expected[y][x]:
+                    raise AssertionError(
+                        f"Grille incohérente en ({x}, {y}): {self.grid[y][x]} au lieu de {expected[y][x]}"
+                    )
+
+        for y in range(self.height):
+            bits = sum(1 << x for x in range(self.width) if expected[y][x] is not None)
+            if self.row_bits[y] != bits:
+                raise AssertionError(f"Occupation de la ligne {y} incohérente")
+        for x in range(self.width):
+            bits = sum(1 << y for y in range(self.height) if expected[y][x] is not None)
+            if self.column_bits[x] != bits:
+                raise AssertionError(f"Occupation de la colonne {x} incohérente")
+
+        if self.zobrist_hash != expected_hash:
+            raise AssertionError("Hash de Zobrist incohérent")
+
+        if self._slots is not None:
+            for vehicle_id, slot in self._slots.items():
+                if self._positions[slot] != self.vehicles[vehicle_id].position:
+                    raise AssertionError(f"Clé d'état incohérente pour le véhicule {vehicle_id}")
+
     def is_solved(self):
         """
         Vérifie si le niveau est résolu (voiture rouge à la sortie).
 
+        La voiture principale doit couvrir la case de sortie en étant orientée
+        vers le bord où se trouve la sortie.
+
         Returns:
             bool: True si le nivéau est résolu
         """
+        axis = 'H' if self.exit_side in ('right', 'left') else 'V'
         for vehicle in self.vehicles.values():
             if vehicle.is_main:
-                if vehicle.orientation == 'H' and vehicle.x + vehicle.length - 1 == self.exit_pos[0]:
+                if vehicle.orientation == axis and self.exit_pos in vehicle.get_coordinates():
                     return True
         return False
 
     def get_state_hash(self):
         """
-        Retourne un hash unique de l'état actuel du plateau.
-        Utile pour l'algorithme A*.
+        Retourne le hash de Zobrist de l'état actuel du plateau.
+
+        Le hash est tenu à jour de façon incrémentale (O(1) par déplacement). Deux
+        états différents peuvent partager le même hash : pour identifier un état
+        sans ambiguïté, utiliser `get_state_key`.
         """
-        state = []
-        for vid, vehicle in sorted(self.vehicles.items()):
-            state.append((vid, vehicle.x, vehicle.y))
-        return hash(tuple(state))
+        return self.zobrist_hash
+
+    def _index_vehicles(self):
+        """Refait la description des véhicules et les positions de la clé d'état."""
+        parts = []
+        slots = {}
+        positions = bytearray()
+        for vid, vehicle in sorted(self.vehicles.items(), key=lambda item: id_sort_key(item[0])):
+            main = '*' if vehicle.is_main else ''
+            parts.append(f"{vid}:{vehicle.orientation}{vehicle.length}{main}@{vehicle.spec.lane}")
+            slots[vid] = len(positions)
+            positions.append(vehicle.position)
+        self._layout = (';'.join(parts) + '|').encode()
+        self._slots = slots
+        self._positions = positions
+
+    def get_state_key(self):
+        """
+        Retourne une clé exacte et compacte de l'état du plateau.
+
+        La clé est formée de la description des véhicules (ID, orientation,
+        longueur, ligne et voiture principale), qui ne change pas quand ils se
+        déplacent, suivie d'un octet par véhicule : sa position sur sa ligne.
+        Ces octets sont tenus à jour à chaque déplacement ; seul l'ajout d'un
+        véhicule oblige à refaire la description. Deux plateaux ont la même clé
+        si et seulement s'ils sont identiques.
+
+        Returns:
+            bytes: Clé de l'état
+        """
+        if self._slots is None:
+            self._index_vehicles()
+        return self._layout + bytes(self._positions)
 
     def clone(self):
         """
         Crée une copie de la grille et de tous ses véhicules.
-        Utile pour l'algorithme de recherche A*.
+
+        Les descriptions immuables des véhicules sont partagées avec le plateau
+        d'origine : seules les positions sont recopiées, sans nouvelle validation.
         """
-        new_board = Board(self.size)
+        from vehicle import Vehicle  # Import ici pour éviter l'import circulaire
+
+        new_board = Board.__new__(Board)
+        new_board.width = self.width
+        new_board.height = self.height
+        new_board.size = self.size
         new_board.exit_pos = self.exit_pos
+        new_board.exit_side = self.exit_side
+        new_board.zobrist_hash = self.zobrist_hash
+        new_board.grid = [row[:] for row in self.grid]
+        new_board.row_bits = self.row_bits[:]
+        new_board.column_bits = self.column_bits[:]
+        new_board.history = []
+        # La description est partagée (refaite et non modifiée lors d'un ajout) ; les positions sont recopiées
+        new_board._layout = self._layout
+        new_board._slots = self._slots
+        new_board._positions = self._positions[:]
+        new_board.vehicles = {
+            vehicle_id: Vehicle.from_spec(vehicle.spec, vehicle.position)
+            for vehicle_id, vehicle in self.vehicles.items()
+        }
+        return new_board
+
+    def to_exit_frame(self):
+        """
+        Retourne une copie du plateau tournée ou retournée pour que la sortie soit à droite.
+
+        Le solveur et l'analyse statique ne raisonnent que sur une sortie à droite ;
+        les directions de ce repère se traduisent en directions du plateau avec
+        FRAME_DIRECTIONS[self.exit_side].
+
+        Returns:
+            Board: Plateau équivalent dont la sortie est à droite
+        """
+        side = self.exit_side
+        if side == 'right':
+            return self.clone()
+
+        if side == 'left':
+            def cell(x, y): return self.width - 1 - x, y
+        elif side == 'bottom':
+            def cell(x, y): return y, x
+        else:  # 'top'
+            def cell(x, y): return self.height - 1 - y, x
 
+        transposed = side in ('bottom', 'top')
+        width, height = (self.height, self.width) if transposed else (self.width, self.height)
+        frame = Board(width, height, 'right', cell(*self.exit_pos)[1])
+        frame._add_mapped_vehicles(self.vehicles.values(), cell, transposed)
+        return frame
+
+    def from_exit_frame(self, side, line=None):
+        """
+        Opération inverse de `to_exit_frame` : le plateau, dont la sortie est à
+        droite, est tourné ou retourné pour placer la sortie du côté demandé.
+
+        Args:
+            side (str): Côté de la sortie du plateau obtenu
+            line (int): Ligne ou colonne de la sortie (déduite de la sortie actuelle si None)
+
+        Returns:
+            Board: Plateau équivalent dont la sortie est du côté `side`
+        """
+        if side == 'right':
+            board = self.clone()
+            if line is not None:
+                board.set_exit('right', line)
+            return board
+
+        transposed = side in ('bottom', 'top')
+        width, height = (self.height, self.width) if transposed else (self.width, self.height)
+        if side == 'left':
+            def cell(x, y): return width - 1 - x, y
+        elif side == 'bottom':
+            def cell(x, y): return y, x
+        else:  # 'top'
+            def cell(x, y): return y, height - 1 - x
+
+        board = Board(width, height, side, self.exit_pos[1] if line is None else line)
+        board._add_mapped_vehicles(self.vehicles.values(), cell, transposed)
+        return board
+
+    def _add_mapped_vehicles(self, vehicles, cell, transposed):
+        """Ajoute des copies de véhicules dont les cases sont transformées par `cell`."""
+        from vehicle import Vehicle  # Import ici pour éviter l'import circulaire
+
+        for vehicle in vehicles:
+            cells = [cell(x, y) for x, y in vehicle.get_coordinates()]
+            orientation = vehicle.orientation
+            if transposed:
+                orientation = 'V' if orientation == 'H' else 'H'
+            self.add_vehicle(Vehicle(vehicle.id, min(x for x, _ in cells), min(y for _, y in cells),
+                                     vehicle.length, orientation, vehicle.is_main))
+
+    def to_dict(self):
+        """
+        Sérialise le plateau en dictionnaire (format de `Game.serialize_board`).
+
+        Returns:
+            dict: Plateau sérialisé
+        """
+        vehicles_data = []
         for vehicle in self.vehicles.values():
-            from vehicle import Vehicle  # Import ici pour éviter l'import circulaire
-            new_vehicle = Vehicle(
-                vehicle.id,
-                vehicle.x,
-                vehicle.y,
-                vehicle.length,
-                vehicle.orientation,
-                vehicle.is_main
+            vehicles_data.append({
+                'id': vehicle.id,
+                'x': vehicle.x,
+                'y': vehicle.y,
+                'length': vehicle.length,
+                'orientation': vehicle.orientation,
+                'is_main': vehicle.is_main
+            })
+
+        return {
+            'size': self.width,
+            'height': self.height,
+            'exit_side': self.exit_side,
+            'exit_pos': self.exit_pos,
+            'vehicles': vehicles_data
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstruit un plateau à partir d'un dictionnaire produit par `to_dict`.
+
+        Args:
+            data (dict): Plateau sérialisé
+
+        Returns:
+            Board: Plateau désérialisé
+        """
+        from vehicle import Vehicle  # Import ici pour éviter l'import circulaire
+
+        board = cls(data['size'], data.get('height'), data.get('exit_side', 'right'))
+        board.exit_pos = tuple(data['exit_pos'])
+
+        for vehicle_data in data['vehicles']:
+            vehicle = Vehicle(
+                vehicle_data['id'],
+                vehicle_data['x'],
+                vehicle_data['y'],
+                vehicle_data['length'],
+                vehicle_data['orientation'],
+                vehicle_data['is_main']
             )
-            new_board.add_vehicle(new_vehicle)
+            board.add_vehicle(vehicle)
 
-        return new_board
+        return board
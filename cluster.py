@@ -0,0 +1,258 @@
+# cluster.py
+import time
+from bitboard import BitboardEngine
+from board import Board
+from vehicle import Vehicle
+
+# Nombre d'états développés entre deux vérifications du temps et de l'annulation
+CHECK_INTERVAL = 1024
+
+
+class ClusterAnalysis:
+    def __init__(self, board, metric='step', verbose=True):
+        """
+        Prépare l'analyse rétrograde du groupe d'états ("cluster") accessible
+        depuis un plateau.
+
+        Args:
+            board (Board): Plateau de départ (généralement l'état initial du niveau)
+            metric (str): 'step' ou 'slide', métrique dans laquelle les distances sont comptées
+            verbose (bool): Affiche le bilan de l'analyse
+        """
+        self.engine = BitboardEngine(board)
+        self.metric = metric
+        self.verbose = verbose
+
+        # Distance exacte jusqu'à l'état résolu le plus proche, pour chaque état du cluster
+        # (les états d'où la sortie est inaccessible valent None)
+        self.distances = {}
+        self.goal_count = 0
+        self.max_distance = None  # Distance de l'état le plus éloigné de la sortie
+        self.move_count = 0  # Somme, sur tous les états, du nombre de mouvements possibles
+        self.dead_end_count = 0  # Impasses : aucun mouvement n'y éloigne davantage de la sortie
+        self.analyzed = False
+
+    def analyze(self, max_time=30.0, max_states=2000000, cancel_event=None, progress=None):
+        """
+        Énumère tout le cluster puis calcule la distance à la sortie de chaque état.
+
+        Le cluster est parcouru en largeur depuis l'état initial, puis un second
+        parcours en largeur part simultanément de tous les états résolus. Les
+        mouvements étant réversibles, ce parcours rétrograde donne la distance
+        exacte de chaque état à la sortie.
+
+        Les limites sont vérifiées au fil du parcours, et non à chaque couche :
+        une couche d'un grand plateau peut à elle seule dépasser `max_states`.
+
+        Args:
+            max_time (float): Temps maximum d'analyse en secondes
+            max_states (int): Nombre maximum d'états énumérés
+            cancel_event (threading.Event): Interrompt l'analyse dès qu'il est levé
+            progress (dict): Reçoit le nombre d'états énumérés ('nodes_explored')
+
+        Returns:
+            bool: True si l'analyse a pu être menée à terme
+        """
+        start_time = time.time()
+        engine = self.engine
+        metric = self.metric
+
+        # 1. Énumération du cluster
+        start_state = engine.initial_state()
+        states = {start_state[1]}
+        frontier = [start_state]
+        goals = []
+        move_count = 0
+
+        expanded = 0
+        while frontier:
+            next_frontier = []
+            for state in frontier:
+                expanded += 1
+                if expanded % CHECK_INTERVAL == 0:
+                    if progress is not None:
+                        progress['nodes_explored'] = len(states)
+                    if self._interrupted(start_time, max_time, cancel_event):
+                        return self._abort(len(states))
+
+                if engine.is_goal(state):
+                    goals.append(state)
+                for _, neighbor in engine.neighbors(state, metric):
+                    move_count += 1
+                    if neighbor[1] not in states:
+                        states.add(neighbor[1])
+                        next_frontier.append(neighbor)
+                if len(states) > max_states:
+                    return self._abort(len(states))
+            frontier = next_frontier
+
+        if progress is not None:
+            progress['nodes_explored'] = len(states)
+
+        # 2. Parcours rétrograde depuis tous les états résolus
+        distances = dict.fromkeys(states)
+        for goal in goals:
+            distances[goal[1]] = 0
+
+        # Un état non résolu dont aucun voisin n'est plus loin de la sortie est une impasse :
+        # le joueur qui s'y est éloigné de la solution doit revenir sur ses pas
+        dead_end_count = 0
+        depth = 0
+        frontier = goals
+        expanded = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for state in frontier:
+                expanded += 1
+                if expanded % CHECK_INTERVAL == 0 and self._interrupted(start_time, max_time, cancel_event):
+                    return self._abort(len(states))
+
+                farther = False
+                for _, neighbor in engine.neighbors(state, metric):
+                    distance = distances[neighbor[1]]
+                    if distance is None:
+                        distances[neighbor[1]] = depth
+                        next_frontier.append(neighbor)
+                        farther = True
+                    elif distance == depth:
+                        farther = True
+                if not farther and depth > 1:
+                    dead_end_count += 1
+            frontier = next_frontier
+
+        self.distances = distances
+        self.goal_count = len(goals)
+        self.max_distance = depth - 1 if goals else None
+        self.move_count = move_count
+        self.dead_end_count = dead_end_count
+        self.analyzed = True
+
+        if self.verbose:
+            print(f"Cluster analysé en {time.time() - start_time:.3f}s: "
+                  f"{len(states)} états, {len(goals)} états résolus")
+        return True
+
+    @staticmethod
+    def _interrupted(start_time, max_time, cancel_event):
+        """True si le temps est écoulé ou si l'annulation a été demandée."""
+        return (time.time() - start_time > max_time
+                or (cancel_event is not None and cancel_event.is_set()))
+
+    def _abort(self, state_count):
+        """Signale l'interruption de l'analyse et renvoie False."""
+        if self.verbose:
+            print(f"Analyse du cluster interrompue après {state_count} états")
+        return False
+
+    def states_at(self, distance):
+        """
+        Retourne les clés des états situés à une distance donnée de la sortie.
+
+        Args:
+            distance (int): Nombre minimal de mouvements jusqu'à la sortie
+
+        Returns:
+            list: Clés d'état (voir `board_at`)
+        """
+        return [key for key, value in self.distances.items() if value == distance]
+
+    def board_at(self, key):
+        """
+        Construit le plateau correspondant à un état du cluster.
+
+        Args:
+            key (int): Clé d'état du BitboardEngine
+
+        Returns:
+            Board: Plateau dont les véhicules occupent les positions de l'état
+        """
+        engine = self.engine
+        # Le moteur travaille dans le repère où la sortie est à droite
+        board = Board(engine.width, engine.height, 'right', engine.exit_pos[1])
+        for index, position in enumerate(engine.positions(key)):
+            lane = engine.lanes[index]
+            if engine.orientations[index] == 'H':
+                x, y = position, lane
+            else:
+                x, y = lane, position
+            board.add_vehicle(Vehicle(engine.ids[index], x, y, engine.lengths[index],
+                                      engine.orientations[index], index == engine.main_index))
+
+        if engine.exit_side != 'right':
+            board = board.from_exit_frame(engine.exit_side)
+        return board
+
+    def _state_of(self, board):
+        """Retourne l'état moteur correspondant à un plateau, ou None s'il n'est pas dans le cluster."""
+        state = self.engine.state_from_board(board)
+        if state is None or state[1] not in self.distances:
+            return None
+        return state
+
+    def distance(self, board):
+        """
+        Retourne la distance exacte du plateau à la sortie.
+
+        Args:
+            board (Board): Plateau issu du même niveau
+
+        Returns:
+            int: Nombre minimal de mouvements, ou None si le plateau n'est pas
+                 dans le cluster ou si la sortie est inaccessible
+        """
+        state = self._state_of(board)
+        if state is None:
+            return None
+        return self.distances[state[1]]
+
+    def best_move(self, board):
+        """
+        Retourne un mouvement qui rapproche le plateau de la sortie.
+
+        Args:
+            board (Board): Plateau issu du même niveau
+
+        Returns:
+            tuple: (vehicle_id, direction) (avec la distance en métrique 'slide'),
+                   ou None si le plateau est résolu ou sans issue
+        """
+        state = self._state_of(board)
+        if state is None:
+            return None
+        move, _ = self._descend(state)
+        if move is None:
+            return None
+        return self.engine.decode_move(move, self.metric == 'slide')
+
+    def solution_from(self, board):
+        """
+        Retourne une solution optimale depuis n'importe quel état du cluster.
+
+        Args:
+            board (Board): Plateau issu du même niveau
+
+        Returns:
+            list: Liste de mouvements, ou None si la sortie est inaccessible
+        """
+        state = self._state_of(board)
+        if state is None or self.distances[state[1]] is None:
+            return None
+
+        path = []
+        move, state = self._descend(state)
+        while move is not None:
+            path.append(self.engine.decode_move(move, self.metric == 'slide'))
+            move, state = self._descend(state)
+        return path
+
+    def _descend(self, state):
+        """Retourne (mouvement, état voisin) vers un état plus proche de la sortie, ou (None, None)."""
+        distance = self.distances[state[1]]
+        if not distance:
+            return None, None
+
+        for move, neighbor in self.engine.neighbors(state, self.metric):
+            if self.distances[neighbor[1]] == distance - 1:
+                return move, neighbor
+        return None, None
@@ -0,0 +1,284 @@
+# difficulty.py
+import argparse
+import json
+import math
+import multiprocessing
+import sys
+import time
+from board import Board
+from cluster import ClusterAnalysis
+from solver import Solver
+
+# Transformation appliquée à chaque facteur avant normalisation
+FEATURE_TRANSFORMS = {
+    'slide_moves': math.log1p,
+    'step_moves': math.log1p,
+    'vehicles_moved': float,
+    'cluster_size': math.log1p,
+    'dead_end_ratio': float,
+    'branching_factor': float,
+}
+
+# Poids des facteurs dans le score (leur somme vaut 1) : la longueur de la solution en
+# glissements domine, suivie du nombre de véhicules à déplacer et de la taille de l'espace d'états
+SCORE_WEIGHTS = {
+    'slide_moves': 0.35,
+    'step_moves': 0.15,
+    'vehicles_moved': 0.2,
+    'cluster_size': 0.1,
+    'dead_end_ratio': 0.1,
+    'branching_factor': 0.1,
+}
+
+# Moyenne et écart type de chaque facteur transformé sur le corpus de référence
+# (recalculés avec `python -m difficulty rate --calibrate`)
+REFERENCE = {
+    'slide_moves': (1.824, 0.401),
+    'step_moves': (2.473, 0.347),
+    'vehicles_moved': (5.327, 2.041),
+    'cluster_size': (8.084, 1.38),
+    'dead_end_ratio': (0.08, 0.077),
+    'branching_factor': (7.565, 1.38),
+}
+
+# Seuils du score (0 à 100, 50 pour un niveau médian du corpus de référence) : libellé
+LABELS = [(35.0, "Facile"), (65.0, "Moyenne"), (float('inf'), "Difficile")]
+
+
+def difficulty_score(features, reference=None):
+    """
+    Combine les facteurs de difficulté en un score unique.
+
+    Chaque facteur est transformé (voir FEATURE_TRANSFORMS), centré et réduit
+    avec les statistiques du corpus de référence, puis pondéré ; la somme est
+    ramenée entre 0 et 100 par une sigmoïde, si bien qu'un niveau médian du
+    corpus obtient environ 50.
+
+    Args:
+        features (dict): Facteurs produits par `analyze_difficulty`
+        reference (dict): Statistiques de normalisation (REFERENCE par défaut)
+
+    Returns:
+        float: Score de difficulté entre 0 et 100
+    """
+    reference = reference or REFERENCE
+    z = 0.0
+    for name, weight in SCORE_WEIGHTS.items():
+        mean, deviation = reference[name]
+        z += weight * (FEATURE_TRANSFORMS[name](features[name]) - mean) / deviation
+    # Les facteurs étant corrélés, leur somme pondérée varie plus qu'un seul facteur réduit
+    return 100.0 / (1.0 + math.exp(-1.5 * z))
+
+
+def difficulty_label(score):
+    """Retourne le libellé ("Facile", "Moyenne" ou "Difficile") d'un score."""
+    for threshold, label in LABELS:
+        if score < threshold:
+            return label
+    return LABELS[-1][1]
+
+
+def analyze_difficulty(board, max_time=30.0, cluster=None, cancel_event=None, progress=None):
+    """
+    Mesure les facteurs de difficulté d'un niveau et calcule son score.
+
+    L'analyse du cluster (métrique 'step') fournit dans le même parcours la
+    solution optimale, la taille du cluster, les impasses et le facteur de
+    branchement moyen ; seule la longueur de la solution en glissements
+    demande une recherche supplémentaire, bornée par la taille du cluster.
+
+    Args:
+        board (Board): Plateau initial du niveau
+        max_time (float): Temps maximum de l'analyse du cluster
+        cluster (ClusterAnalysis): Analyse déjà menée sur ce plateau en métrique 'step', le cas échéant
+        cancel_event (threading.Event): Interrompt l'analyse
+        progress (dict): Reçoit le nombre d'états énumérés ('nodes_explored')
+
+    Returns:
+        dict: Facteurs, score et libellé, ou None si le cluster n'a pas pu être
+              analysé ou si le niveau est insoluble
+    """
+    if cluster is None or cluster.metric != 'step' or not cluster.analyzed:
+        cluster = ClusterAnalysis(board, 'step', verbose=False)
+        if not cluster.analyze(max_time=max_time, cancel_event=cancel_event, progress=progress):
+            return None
+
+    solution = cluster.solution_from(board)
+    if solution is None:
+        return None
+
+    slide_solution = Solver(board, 'slide', verbose=False, cancel_event=cancel_event).solve(
+        max_time=max_time, method='bfs')
+    if slide_solution is None:
+        return None
+
+    cluster_size = len(cluster.distances)
+    features = {
+        'step_moves': len(solution),
+        'slide_moves': len(slide_solution),
+        'vehicles_moved': len({move[0] for move in solution}),
+        'cluster_size': cluster_size,
+        'dead_ends': cluster.dead_end_count,
+        'dead_end_ratio': cluster.dead_end_count / cluster_size,
+        'branching_factor': cluster.move_count / cluster_size,
+    }
+    features['score'] = round(difficulty_score(features), 1)
+    features['label'] = difficulty_label(features['score'])
+    features['solution'] = solution
+    return features
+
+
+def calibrate(analyses):
+    """
+    Calcule les statistiques de normalisation (voir REFERENCE) sur un corpus.
+
+    Args:
+        analyses (list): Facteurs produits par `analyze_difficulty`
+
+    Returns:
+        dict: {facteur: (moyenne, écart type)} des facteurs transformés
+    """
+    reference = {}
+    for name, transform in FEATURE_TRANSFORMS.items():
+        values = [transform(analysis[name]) for analysis in analyses]
+        mean = sum(values) / len(values)
+        deviation = math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+        reference[name] = (round(mean, 3), round(deviation, 3) or 1.0)
+    return reference
+
+
+def _load_board(source):
+    """Reconstruit le plateau d'une tâche : ligne JSONL, ou (base de niveaux, indice)."""
+    if isinstance(source, str):
+        data = json.loads(source)
+        return Board.from_dict(data), data.get('id')
+
+    from level_db import LevelDatabase  # Import ici : seule la notation d'une base en a besoin
+    path, index = source
+    database = _databases.get(path)
+    if database is None:
+        database = _databases[path] = LevelDatabase(path)
+    return database.board(index), None
+
+
+# Bases de niveaux ouvertes par chaque processus du pool
+_databases = {}
+
+
+def _rate_record(task):
+    """
+    Note un niveau d'un lot (exécuté dans un processus du pool).
+
+    Args:
+        task (tuple): (indice du niveau, ligne JSONL ou (base, indice), temps maximum)
+
+    Returns:
+        dict: Résultat sérialisable en JSON
+    """
+    index, source, max_time = task
+    result = {'index': index}
+    try:
+        board, level_id = _load_board(source)
+        if level_id is not None:
+            result['id'] = level_id
+
+        start_time = time.time()
+        features = analyze_difficulty(board, max_time=max_time)
+        result['time'] = time.time() - start_time
+        if features is None:
+            result['status'] = 'unrated'
+        else:
+            del features['solution']
+            result['status'] = 'rated'
+            result.update(features)
+    except Exception as e:
+        result.update({'status': 'error', 'error': str(e)})
+    return result
+
+
+def rate_batch(input_path, output_path=None, max_time=30.0, workers=None):
+    """
+    Note tous les niveaux d'un fichier JSONL ou d'une base de niveaux, en parallèle.
+
+    Les résultats sont écrits en JSONL au fur et à mesure, dans un ordre
+    quelconque : le champ 'index' donne la ligne (ou l'indice dans la base).
+
+    Args:
+        input_path (str): Fichier JSONL de plateaux, ou base de niveaux (level_db.py)
+        output_path (str): Fichier JSONL des résultats (sortie standard si None)
+        max_time (float): Temps maximum d'analyse par niveau, en secondes
+        workers (int): Nombre de processus (par défaut, un par cœur)
+
+    Returns:
+        tuple: (bilan du lot, facteurs des niveaux notés)
+    """
+    from level_db import MAGIC, LevelDatabase  # Import ici : seule la notation d'une base en a besoin
+
+    with open(input_path, 'rb') as f:
+        is_database = f.read(len(MAGIC)) == MAGIC
+
+    if is_database:
+        database = LevelDatabase(input_path)
+        count = len(database)
+        database.close()
+        tasks = ((index, (input_path, index), max_time) for index in range(count))
+    else:
+        lines = open(input_path)
+        tasks = ((index, line, max_time) for index, line in enumerate(lines) if line.strip())
+
+    summary = {'levels': 0, 'rated': 0, 'unrated': 0, 'error': 0}
+    rated = []
+    start_time = time.time()
+
+    output = open(output_path, 'w') if output_path else sys.stdout
+    try:
+        with multiprocessing.Pool(workers) as pool:
+            for result in pool.imap_unordered(_rate_record, tasks, chunksize=4):
+                output.write(json.dumps(result) + '\n')
+                output.flush()
+
+                summary['levels'] += 1
+                summary[result['status']] += 1
+                if result['status'] == 'rated':
+                    rated.append(result)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if not is_database:
+            lines.close()
+
+    elapsed = time.time() - start_time
+    summary['time'] = elapsed
+    summary['levels_per_second'] = summary['levels'] / elapsed if elapsed > 0 else 0.0
+    return summary, rated
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : `python -m difficulty rate niveaux.jsonl`."""
+    parser = argparse.ArgumentParser(prog='python -m difficulty', description="Difficulté des niveaux Rush Hour")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    rate = subparsers.add_parser('rate', help="Note un fichier JSONL de plateaux ou une base de niveaux")
+    rate.add_argument('input', help="Fichier JSONL (un plateau par ligne) ou base de niveaux")
+    rate.add_argument('-o', '--output', help="Fichier JSONL des résultats (sortie standard par défaut)")
+    rate.add_argument('--max-time', type=float, default=30.0, help="Temps maximum d'analyse par niveau (s)")
+    rate.add_argument('--workers', type=int, default=None, help="Nombre de processus (un par cœur par défaut)")
+    rate.add_argument('--calibrate', action='store_true',
+                      help="Affiche les statistiques de normalisation (REFERENCE) du corpus noté")
+
+    args = parser.parse_args(argv)
+
+    summary, rated = rate_batch(args.input, args.output, args.max_time, args.workers)
+    labels = {}
+    for result in rated:
+        labels[result['label']] = labels.get(result['label'], 0) + 1
+    print(f"{summary['levels']} niveaux en {summary['time']:.2f}s ({summary['levels_per_second']:.1f} niveaux/s) : "
+          f"{summary['rated']} notés {labels}, {summary['unrated']} non notés, {summary['error']} erreurs",
+          file=sys.stderr)
+
+    if args.calibrate and rated:
+        print(json.dumps(calibrate(rated), indent=4), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
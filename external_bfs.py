@@ -0,0 +1,311 @@
+# external_bfs.py
+import glob
+import hashlib
+import heapq
+import json
+import mmap
+import os
+from bitboard import BitboardEngine
+
+# Répertoire des parcours sur disque (un sous-répertoire par plateau et par métrique)
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'bfs')
+
+# Nombre d'enregistrements lus d'un coup dans un fichier de couche
+READ_CHUNK = 65536
+
+# Fichiers écrits par un parcours dans son répertoire (les seuls qu'il supprime)
+WORK_FILES = ('layer_*.bin', 'layer_*.bin.tmp', 'run_*.tmp', 'progress.json', 'progress.json.tmp')
+
+
+def _read_keys(path, record_size, chunk_records=READ_CHUNK):
+    """Lit séquentiellement les clés (octets de taille fixe) d'un fichier trié."""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(record_size * chunk_records)
+            if not chunk:
+                return
+            for offset in range(0, len(chunk), record_size):
+                yield chunk[offset:offset + record_size]
+
+
+def _subtract(candidates, excluded):
+    """
+    Filtre un flux trié de clés : retire les doublons et les clés du flux trié `excluded`.
+
+    Les deux flux sont parcourus une seule fois, en parallèle (fusion).
+    """
+    excluded = iter(excluded)
+    current = next(excluded, None)
+    last = None
+    for key in candidates:
+        if key == last:
+            continue
+        last = key
+        while current is not None and current < key:
+            current = next(excluded, None)
+        if current != key:
+            yield key
+
+
+class LayerFile:
+    def __init__(self, path, record_size):
+        """
+        Couche du parcours enregistrée sur disque : clés triées de taille fixe,
+        projetées en mémoire (mmap) pour les recherches par dichotomie.
+
+        Args:
+            path (str): Fichier de la couche
+            record_size (int): Taille d'une clé en octets
+        """
+        self.record_size = record_size
+        self.count = os.path.getsize(path) // record_size
+        self.file = open(path, 'rb')
+        # Un fichier vide ne peut pas être projeté en mémoire
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.count else b''
+
+    def __contains__(self, key):
+        size = self.record_size
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record = self.data[middle * size:(middle + 1) * size]
+            if record < key:
+                low = middle + 1
+            elif record > key:
+                high = middle
+            else:
+                return True
+        return False
+
+    def close(self):
+        """Libère la projection et le fichier."""
+        if self.count:
+            self.data.close()
+        self.file.close()
+
+
+class ExternalBFS:
+    def __init__(self, board, metric='step', directory=None, buffer_size=500000):
+        """
+        Parcours en largeur dont les couches sont stockées sur disque.
+
+        Chaque couche est un fichier de clés d'état triées et dédoublonnées, de
+        taille fixe (la clé du BitboardEngine en octets, poids fort en tête : l'ordre
+        des octets est celui des entiers). Seuls les successeurs en attente de tri
+        sont gardés en mémoire, par paquets d'au plus `buffer_size` clés ; chaque
+        paquet trié est écrit dans un fichier temporaire, puis les paquets sont
+        fusionnés et soustraits des deux couches précédentes par une lecture
+        séquentielle (les mouvements étant réversibles, un successeur d'un état de
+        profondeur d est de profondeur d - 1, d ou d + 1).
+
+        L'avancement est enregistré après chaque couche : un parcours interrompu
+        reprend à la dernière couche terminée.
+
+        Les fichiers sont écrits dans un sous-répertoire propre au plateau et à la
+        métrique (rushhour_<empreinte>_<métrique>) ; seuls les fichiers du parcours
+        (WORK_FILES) sont supprimés, jamais le reste du répertoire.
+
+        Args:
+            board (Board): Plateau de départ
+            metric (str): 'step' ou 'slide'
+            directory (str): Répertoire où créer le sous-répertoire de travail
+                             (DEFAULT_DIRECTORY par défaut)
+            buffer_size (int): Nombre maximum de clés gardées en mémoire
+        """
+        self.engine = BitboardEngine(board)
+        self.metric = metric
+        self.buffer_size = buffer_size
+        self.record_size = max(1, (len(self.engine.ids) * self.engine.bits + 7) // 8)
+
+        # Signature du problème : une reprise n'est possible que sur le même plateau
+        self.signature = (f"{board.width}x{board.height}:{board.exit_side}:{board.exit_pos}|"
+                          f"{board.get_state_key().hex()}|{metric}")
+        digest = hashlib.sha1(self.signature.encode()).hexdigest()[:16]
+        self.directory = os.path.join(directory or DEFAULT_DIRECTORY, f"rushhour_{digest}_{metric}")
+
+        self.depth = 0  # Indice de la dernière couche terminée
+        self.layer_sizes = []
+        self.goal_key = None
+        self.complete = False  # True si tout l'espace accessible a été parcouru
+        self.nodes_explored = 0  # États développés pendant cette exécution
+        self._load_progress()
+
+    def _layer_path(self, depth):
+        return os.path.join(self.directory, f"layer_{depth:06d}.bin")
+
+    def _meta_path(self):
+        return os.path.join(self.directory, 'progress.json')
+
+    def _encode(self, key):
+        return key.to_bytes(self.record_size, 'big')
+
+    def _load_progress(self):
+        """Reprend un parcours interrompu, ou prépare un répertoire vierge."""
+        try:
+            with open(self._meta_path()) as f:
+                meta = json.load(f)
+            if meta['signature'] == self.signature and os.path.exists(self._layer_path(meta['depth'])):
+                self.depth = meta['depth']
+                self.layer_sizes = meta['layer_sizes']
+                self.goal_key = meta['goal']
+                self.complete = meta['complete']
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        # Pas de reprise possible : on repart de l'état initial
+        os.makedirs(self.directory, exist_ok=True)
+        self._remove_work_files()
+        start_key = self.engine.initial_state()[1]
+        with open(self._layer_path(0), 'wb') as f:
+            f.write(self._encode(start_key))
+        self.depth = 0
+        self.layer_sizes = [1]
+        self.goal_key = start_key if self.engine.is_goal((0, start_key)) else None
+        self._save_progress()
+
+    def _save_progress(self):
+        """Enregistre l'avancement (écriture atomique)."""
+        meta = {
+            'signature': self.signature,
+            'depth': self.depth,
+            'layer_sizes': self.layer_sizes,
+            'goal': self.goal_key,
+            'complete': self.complete,
+        }
+        temporary = self._meta_path() + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(meta, f)
+        os.replace(temporary, self._meta_path())
+
+    def _state(self, key):
+        """Reconstruit l'état complet (occupation, clé) à partir de la clé."""
+        return self.engine.state_from_positions(self.engine.positions(key))
+
+    def _flush(self, buffer, runs):
+        """Trie un paquet de successeurs et l'écrit dans un fichier temporaire."""
+        path = os.path.join(self.directory, f"run_{len(runs):06d}.tmp")
+        with open(path, 'wb') as f:
+            f.write(b''.join(self._encode(key) for key in sorted(buffer)))
+        runs.append(path)
+        buffer.clear()
+
+    def _discard(self, paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def run(self, should_stop):
+        """
+        Poursuit le parcours jusqu'à la sortie, l'épuisement de l'espace d'états ou l'interruption.
+
+        Args:
+            should_stop (callable): should_stop(nodes_explored) renvoie True pour interrompre
+
+        Returns:
+            int: Clé de l'état résolu le plus proche, ou None (insoluble si `complete`, interrompu sinon)
+        """
+        engine = self.engine
+        metric = self.metric
+        record_size = self.record_size
+
+        while self.goal_key is None and not self.complete:
+            # 1. Développement de la couche courante, par paquets triés
+            runs = []
+            buffer = set()
+            for record in _read_keys(self._layer_path(self.depth), record_size):
+                self.nodes_explored += 1
+                if self.nodes_explored % 1024 == 0 and should_stop(self.nodes_explored):
+                    self._discard(runs)
+                    return None
+
+                for _, neighbor in engine.neighbors(self._state(int.from_bytes(record, 'big')), metric):
+                    buffer.add(neighbor[1])
+                if len(buffer) >= self.buffer_size:
+                    self._flush(buffer, runs)
+            if buffer:
+                self._flush(buffer, runs)
+
+            # 2. Fusion des paquets, sans les états des deux couches précédentes
+            #    (les tampons de lecture se partagent `buffer_size` enregistrements)
+            previous = [self._layer_path(self.depth)]
+            if self.depth > 0:
+                previous.append(self._layer_path(self.depth - 1))
+            chunk = max(256, self.buffer_size // (len(runs) + len(previous)))
+            candidates = heapq.merge(*(_read_keys(path, record_size, chunk) for path in runs))
+            excluded = heapq.merge(*(_read_keys(path, record_size, chunk) for path in previous))
+
+            next_path = self._layer_path(self.depth + 1)
+            temporary = next_path + '.tmp'
+            count = 0
+            goal_key = None
+            with open(temporary, 'wb') as f:
+                for record in _subtract(candidates, excluded):
+                    f.write(record)
+                    count += 1
+                    if goal_key is None:
+                        key = int.from_bytes(record, 'big')
+                        if engine.is_goal((0, key)):
+                            goal_key = key
+            os.replace(temporary, next_path)
+            self._discard(runs)
+
+            # 3. La couche est terminée : l'avancement est enregistré
+            self.depth += 1
+            self.layer_sizes.append(count)
+            self.goal_key = goal_key
+            self.complete = count == 0
+            self._save_progress()
+
+        return self.goal_key
+
+    def reconstruct(self, goal_key):
+        """
+        Retrouve les mouvements menant à un état de la dernière couche.
+
+        Pour chaque couche, en remontant, on cherche parmi les voisins de l'état
+        courant un état de la couche précédente (recherche dans le fichier projeté).
+
+        Args:
+            goal_key (int): Clé d'un état de la couche `self.depth`
+
+        Returns:
+            list: Mouvements codés (voir `BitboardEngine.neighbors`), du départ vers l'état
+        """
+        engine = self.engine
+        moves = []
+        state = self._state(goal_key)
+        for depth in range(self.depth - 1, -1, -1):
+            layer = LayerFile(self._layer_path(depth), self.record_size)
+            try:
+                parent = next(neighbor for _, neighbor in engine.neighbors(state, self.metric)
+                              if self._encode(neighbor[1]) in layer)
+            finally:
+                layer.close()
+            moves.append(next(move for move, neighbor in engine.neighbors(parent, self.metric)
+                              if neighbor[1] == state[1]))
+            state = parent
+        moves.reverse()
+        return moves
+
+    def disk_usage(self):
+        """Retourne la place occupée par les couches, en octets."""
+        return sum(os.path.getsize(self._layer_path(depth)) for depth in range(self.depth + 1))
+
+    def _remove_work_files(self):
+        """Supprime les fichiers écrits par le parcours dans son répertoire."""
+        for pattern in WORK_FILES:
+            self._discard(glob.glob(os.path.join(glob.escape(self.directory), pattern)))
+
+    def cleanup(self):
+        """
+        Supprime les fichiers du parcours (qui ne pourra plus être repris), puis
+        son répertoire s'il est vide.
+        """
+        self._remove_work_files()
+        try:
+            os.rmdir(self.directory)
+        except OSError:
+            pass
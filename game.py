@@ -1,25 +1,57 @@
 # game.py
+import os
 import time
 import random
 from board import Board
-from vehicle import Vehicle
 from solver import Solver
-from level_generator import LevelGenerator
+from cluster import ClusterAnalysis
+from level_generator import LevelGenerator, DIFFICULTY_SETTINGS
+from level_pool import LevelPool
+from solution_cache import default_cache
+from difficulty import analyze_difficulty
 import levels
 
 
 class Game:
-    def __init__(self):
-        """Initialise le jeu."""
+    def __init__(self, generation_workers=None):
+        """
+        Initialise le jeu.
+
+        Args:
+            generation_workers (int): Nombre de processus de génération des niveaux
+                                      aléatoires (1 : génération séquentielle). Par défaut,
+                                      un par cœur, sauf quand la réserve de niveaux tourne
+        """
         # Initialisation des attributs principaux
         self.board = None
         self.initial_board = None
         self.current_level = 1  # Niveau par défaut (entier pour les niveaux prédéfinis)
         self.moves_count = 0
-        self.solutions = {}  # Cache des solutions: {niveau: solution}
+        self.redo_stack = []  # Mouvements annulés, rejouables avec redo_move
+        self.count_history = []  # (moves_count, last_move) avant chaque mouvement du journal
+        self.solutions = {}  # Cache des solutions: {(métrique, clé exacte du plateau initial): solution}
+        self.solution_cache = default_cache()  # Cache persistant partagé entre les parties (ou None)
+        self.difficulties = {}  # Analyses de difficulté (difficulty.py) par clé exacte du plateau initial
 
-        # Taille standard du plateau
+        # Métrique de comptage des mouvements : 'step' (case par case) ou 'slide' (glissement)
+        self.metric = 'step'
+        self.last_move = None  # Dernier mouvement joué, pour regrouper les glissements
+
+        # Table des distances à la sortie pour tous les états du niveau courant
+        self.cluster = None
+        self.cluster_source = None  # Plateau initial à partir duquel le cluster a été calculé
+
+        # Format des niveaux aléatoires : plateau standard 6x6, sortie à droite
         self.board_size = 6
+        self.board_height = None  # None pour un plateau carré
+        self.exit_side = 'right'
+
+        # Nombre de processus de génération des niveaux aléatoires (None : choix automatique,
+        # voir _generation_workers)
+        self.generation_workers = generation_workers
+
+        # Réserve de niveaux aléatoires prêts à jouer (voir start_level_pool)
+        self.level_pool = None
 
         # Crée un plateau vide initial
         from board import Board
@@ -33,90 +65,111 @@ class Game:
 
         print(f"Jeu initialisé avec le niveau {self.current_level}")
 
-    def load_level(self, level_number):
+    def start_level_pool(self, capacity=5):
         """
-        Charge un niveau prédéfini.
+        Démarre la réserve de niveaux aléatoires et son producteur en arrière-plan.
 
         Args:
-            level_number (int): Numéro du niveau
+            capacity (int): Nombre de niveaux gardés prêts par difficulté
         """
-        self.current_level = level_number
-        self.moves_count = 0
-
-        # Crée un nouveau plateau
-        self.board = Board()
-
-        # Ajoute les véhicules du niveau
-        vehicles = levels.get_level(level_number)
-        for vehicle in vehicles:
-            success = self.board.add_vehicle(vehicle)
-            if not success:
-                print(f"Erreur: Impossible d'ajouter le véhicule {vehicle.id} - position occupée")
-
-        # Sauvegarde l'état initial du plateau
-        self.initial_board = self.board.clone()
-
-        # Réinitialise la solution en cache pour ce niveau
-        if level_number in self.solutions:
-            del self.solutions[level_number]
-
-        # Vérifie que le niveau est soluble
-        solver = Solver(self.board.clone())
-        solution = solver.solve(max_time=5.0)
-
-        if solution is None:
-            print(f"ALERTE: Le niveau {level_number} pourrait être insoluble!")
-            # Tente de charger un niveau aléatoire à la place
-            if not self.generate_random_level('medium'):
-                # Si la génération échoue, crée un niveau très simple soluble
-                self.board = Board()
-                self.board.add_vehicle(Vehicle('X', 1, 2, 2, 'H', True))
-                self.board.add_vehicle(Vehicle('A', 3, 2, 2, 'V'))
-                self.initial_board = self.board.clone()
+        if self.level_pool is None or not self.level_pool.matches(self.board_size, self.board_height,
+                                                                  self.exit_side):
+            self.stop_level_pool()
+            self.level_pool = LevelPool(self.board_size, self.board_height, self.exit_side, capacity,
+                                        solution_cache=self.solution_cache)
+        self.level_pool.start()
+
+    def stop_level_pool(self):
+        """Arrête le producteur de la réserve et l'enregistre sur disque."""
+        if self.level_pool is not None:
+            self.level_pool.stop()
+
+    def _generation_workers(self):
+        """
+        Retourne le nombre de processus à consacrer à la génération d'un niveau aléatoire.
 
-    def generate_random_level(self, difficulty='medium'):
+        Sans réglage explicite, la génération est répartie sur tous les cœurs, sauf
+        quand le producteur de la réserve de niveaux tourne : il occupe déjà un cœur,
+        et un pool d'un processus par cœur le concurrencerait.
+        """
+        if self.generation_workers is not None:
+            return self.generation_workers
+        if self.level_pool is not None and self.level_pool.thread is not None:
+            return 1
+        return os.cpu_count() or 1
+
+    def _load_generated_level(self, level_name, board, solution):
+        """Charge un niveau aléatoire et mémorise sa solution (comptée case par case)."""
+        self.solutions[self._solution_key(board, 'step')] = solution
+        self.current_level = level_name
+        self.board = board
+        self.initial_board = board.clone()
+        self._reset_progress()
+
+    def generate_random_level(self, difficulty='medium', cancel_event=None, progress=None):
         """
         Génère un niveau aléatoire fiable.
 
+        Le niveau est tiré de la réserve (voir `start_level_pool`) quand elle en
+        contient un ; il n'est généré sur le moment que si elle est vide.
+
         Args:
             difficulty (str): 'easy', 'medium' ou 'hard'
+            cancel_event (threading.Event): Interrompt la génération ; le niveau actuel est alors conservé
+            progress (dict): Reçoit la progression du générateur ('attempts', 'nodes_explored')
 
         Returns:
             bool: True si un niveau a été généré avec succès
         """
+        # Indicateur spécial pour marquer qu'il s'agit d'un niveau aléatoire
+        level_name = f"Aléatoire ({difficulty})"
+
+        # Un niveau de la réserve, s'il y en a un, est servi immédiatement
+        if self.level_pool is not None and self.level_pool.matches(self.board_size, self.board_height,
+                                                                   self.exit_side):
+            board, solution = self.level_pool.take(difficulty)
+            if board is not None:
+                self._load_generated_level(level_name, board, solution)
+                print(f"Niveau aléatoire tiré de la réserve: {len(board.vehicles)} véhicules, "
+                      f"{len(solution)} mouvements")
+                return True
+
         # Paramètres selon la difficulté
-        if difficulty == 'easy':
-            min_vehicles = 5
-            max_vehicles = 8
-            min_moves = 5
-            max_moves = 15
-        elif difficulty == 'medium':
-            min_vehicles = 7
-            max_vehicles = 10
-            min_moves = 10
-            max_moves = 25
-        else:  # 'hard'
-            min_vehicles = 9
-            max_vehicles = 13
-            min_moves = 15
-            max_moves = 40
+        settings = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS['hard'])
+        min_vehicles = settings['min_vehicles']
+        max_vehicles = settings['max_vehicles']
+        min_moves = settings['min_moves']
+        max_moves = settings['max_moves']
 
         # Crée un générateur de niveaux
-        generator = LevelGenerator()
+        generator = LevelGenerator(self.board_size, cancel_event=cancel_event, progress=progress,
+                                   solution_cache=self.solution_cache, height=self.board_height,
+                                   exit_side=self.exit_side)
 
-        # Indicateur spécial pour marquer qu'il s'agit d'un niveau aléatoire
-        self.current_level = f"Aléatoire ({difficulty})"
-
-        # Nombre maximum de tentatives
-        max_attempts = 5
+        # Nombre maximum de tentatives ; en génération parallèle, un seul appel suffit :
+        # generate_parallel mène déjà toutes ses tentatives dans le même pool de processus
+        workers = self._generation_workers()
+        max_attempts = 1 if workers > 1 else 5
 
         # Tentatives multiples pour générer un niveau
         for attempt in range(max_attempts):
+            if generator.cancel_event.is_set():
+                print("Génération annulée")
+                return False
+
             try:
                 print(f"Tentative {attempt + 1}/{max_attempts} de génération de niveau aléatoire {difficulty}")
 
-                # Tente de générer un niveau aléatoire
-                board, solution = generator.generate_level(min_vehicles, max_vehicles)
+                # Tente de générer un niveau aléatoire, à une distance de la sortie tirée dans la plage
+                target_moves = random.randint(min_moves, max_moves)
+                if workers > 1:
+                    # Tentatives réparties sur plusieurs processus : la première réussie l'emporte
+                    board, solution = generator.generate_parallel(min_vehicles, max_vehicles, min_moves, max_moves,
+                                                                  target_moves=target_moves,
+                                                                  workers=workers)
+                else:
+                    board, solution = generator.generate_from_cluster(min_vehicles, max_vehicles, min_moves,
+                                                                      max_moves, target_moves=target_moves)
 
                 if board and solution:
                     # Vérifie si la solution est dans la plage de mouvements souhaitée
@@ -128,13 +181,7 @@ class Game:
                         print(f"Solution trop longue: {len(solution)} mouvements")
                         continue  # Trop difficile, essaie encore
 
-                    # Stocke la solution
-                    self.solutions[self.current_level] = solution
-
-                    # Charge le plateau généré
-                    self.board = board
-                    self.initial_board = board.clone()
-                    self.moves_count = 0
+                    self._load_generated_level(level_name, board, solution)
 
                     print(
                         f"Niveau aléatoire généré avec succès: {len(board.vehicles)} véhicules, {len(solution)} mouvements")
@@ -142,6 +189,10 @@ class Game:
             except Exception as e:
                 print(f"Erreur lors de la génération: {e}")
 
+        if generator.cancel_event.is_set():
+            print("Génération annulée")
+            return False
+
         # Si toutes les tentatives échouent, on génère un niveau de secours basé sur un niveau prédéfini
         # avec quelques modifications pour le rendre légèrement différent
         print("Utilisation d'un niveau de secours basé sur un niveau prédéfini")
@@ -155,17 +206,12 @@ class Game:
             if not vehicle.is_main:  # Ne pas toucher à la voiture rouge
                 # 50% de chance de déplacer le véhicule d'une case si possible
                 if random.random() < 0.5:
-                    if vehicle.orientation == 'H':
-                        offset = random.choice([-1, 1])
-                        if 0 <= vehicle.x + offset <= 6 - vehicle.length:
-                            vehicle.x += offset
-                    else:  # Vertical
-                        offset = random.choice([-1, 1])
-                        if 0 <= vehicle.y + offset <= 6 - vehicle.length:
-                            vehicle.y += offset
+                    offset = random.choice([-1, 1])
+                    if 0 <= vehicle.position + offset <= 6 - vehicle.length:
+                        vehicle.position += offset
 
         # Crée un nouveau plateau avec ces véhicules
-        self.board = Board(6)
+        board = Board(6)
 
         # Ajoute les véhicules en vérifiant qu'il n'y a pas de chevauchement
         valid_vehicles = []
@@ -196,16 +242,22 @@ class Game:
 
         # Ajoute les véhicules valides au plateau
         for vehicle in valid_vehicles:
-            self.board.add_vehicle(vehicle)
+            board.add_vehicle(vehicle)
 
         # Trouve une solution pour ce niveau de secours
-        solver = Solver(self.board)
-        solution = solver.solve()
+        solver = Solver(board, cancel_event=generator.cancel_event, progress=progress)
+        solution = solver.solve(method='bfs')
+
+        if generator.cancel_event.is_set():
+            print("Génération annulée")
+            return False
 
         if solution:
-            self.solutions[self.current_level] = solution
-            self.initial_board = self.board.clone()
-            self.moves_count = 0
+            self.solutions[self._solution_key(board, 'step')] = solution
+            self.current_level = level_name
+            self.board = board
+            self.initial_board = board.clone()
+            self._reset_progress()
             print(f"Niveau de secours généré avec {len(valid_vehicles)} véhicules")
             return True
 
@@ -233,47 +285,144 @@ class Game:
             level_number (int): Numéro du niveau
         """
         self.current_level = level_number
-        self.moves_count = 0
+        self._reset_progress()
 
-        # Crée un nouveau plateau
-        self.board = Board(6)
-
-        # Ajoute les véhicules du niveau
-        vehicles = levels.get_level(level_number)
-        for vehicle in vehicles:
-            self.board.add_vehicle(vehicle)
+        # Crée le plateau du niveau (prédéfini, ou lu dans la base de niveaux)
+        self.board = levels.get_board(level_number)
 
         # Sauvegarde l'état initial du plateau
         self.initial_board = self.board.clone()
 
-        # Réinitialise la solution en cache pour ce niveau
-        if level_number in self.solutions:
-            del self.solutions[level_number]
+        # Reprend la solution déjà calculée lors d'une partie précédente, le cas échéant ;
+        # sinon, get_solution la calculera (solution optimale, par le cluster ou un BFS)
+        solution = self._load_cached_solution(self.initial_board)
+
+        if solution is not None:
+            print(f"Niveau {level_number} chargé avec {len(self.board.vehicles)} véhicules, "
+                  f"{len(solution)} mouvements optimaux")
+        else:
+            print(f"Niveau {level_number} chargé avec {len(self.board.vehicles)} véhicules")
+
+    def load_random_level(self, difficulty='medium'):
+        """
+        Charge un niveau de la base de niveaux tiré au hasard dans une difficulté.
+
+        Args:
+            difficulty (str or int): 'easy', 'medium' ou 'hard' (plage de mouvements de
+                                     DIFFICULTY_SETTINGS), ou nombre exact de mouvements
+
+        Returns:
+            bool: True si un niveau a été chargé, False si la base n'en contient aucun
+        """
+        if isinstance(difficulty, int):
+            level_number = levels.random_level_number(difficulty)
+        else:
+            settings = DIFFICULTY_SETTINGS[difficulty]
+            level_number = levels.random_level_number(settings['min_moves'], settings['max_moves'])
 
-        print(f"Niveau {level_number} chargé avec {len(vehicles)} véhicules")
+        if level_number is None:
+            return False
+        self.load_level(level_number)
+        return True
 
     def reset_level(self):
-        """Réinitialise le niveau actuel."""
+        """
+        Réinitialise le niveau actuel.
+
+        Les mouvements du journal sont annulés sur place ; le plateau n'est recopié
+        depuis l'état initial que s'il ne peut pas y revenir par le journal
+        (par exemple après le chargement d'une sauvegarde).
+        """
         if self.initial_board:
-            self.board = self.initial_board.clone()
-            self.moves_count = 0
+            while self.board.undo():
+                pass
+            if self.board.get_state_key() != self.initial_board.get_state_key():
+                self.board = self.initial_board.clone()
+            self._reset_progress()
+
+    def _reset_progress(self):
+        """Remet à zéro le compteur de mouvements et les piles d'annulation."""
+        self.moves_count = 0
+        self.last_move = None
+        self.redo_stack = []
+        self.count_history = []
+        if self.board is not None:
+            self.board.history = []
+
+    def set_metric(self, metric):
+        """
+        Change la métrique de comptage des mouvements.
+
+        Args:
+            metric (str): 'step' (chaque case compte) ou 'slide' (un glissement compte pour un)
+        """
+        if metric not in ('step', 'slide'):
+            raise ValueError(f"Métrique inconnue: {metric}")
+
+        self.metric = metric
 
-    def move_vehicle(self, vehicle_id, direction):
+    def move_vehicle(self, vehicle_id, direction, distance=1):
         """
         Déplace un véhicule dans la direction donnée.
 
+        En métrique 'slide', un déplacement qui prolonge le précédent (même véhicule,
+        même direction) n'est pas compté comme un nouveau mouvement.
+
         Args:
             vehicle_id (str): ID du véhicule à déplacer
             direction (str): 'up', 'down', 'left', 'right'
+            distance (int): Nombre de cases à parcourir
 
         Returns:
             bool: True si le mouvement a été effectué
         """
-        if self.board.move_vehicle(vehicle_id, direction):
-            self.moves_count += 1
+        if self._play((vehicle_id, direction, distance)):
+            # Un nouveau mouvement rend caducs les mouvements annulés
+            self.redo_stack = []
             return True
         return False
 
+    def _play(self, move):
+        """Joue un mouvement via le journal du plateau et met à jour le compteur."""
+        vehicle_id, direction, distance = move
+        count_before = (self.moves_count, self.last_move)
+        if not self.board.apply(move):
+            return False
+
+        self.count_history.append(count_before)
+        if self.metric == 'step':
+            self.moves_count += distance
+        elif self.last_move != (vehicle_id, direction):
+            self.moves_count += 1
+        self.last_move = (vehicle_id, direction)
+        return True
+
+    def undo_move(self):
+        """
+        Annule le dernier mouvement du joueur.
+
+        Returns:
+            bool: True si un mouvement a été annulé
+        """
+        move = self.board.undo()
+        if move is None:
+            return False
+
+        self.redo_stack.append(move)
+        self.moves_count, self.last_move = self.count_history.pop()
+        return True
+
+    def redo_move(self):
+        """
+        Rejoue le dernier mouvement annulé.
+
+        Returns:
+            bool: True si un mouvement a été rejoué
+        """
+        if not self.redo_stack:
+            return False
+        return self._play(self.redo_stack.pop())
+
     def is_solved(self):
         """
         Vérifie si la grille est résolu.
@@ -283,26 +432,109 @@ class Game:
         """
         return self.board.is_solved()
 
-    def get_solution(self):
+    def get_cluster(self, cancel_event=None, progress=None):
+        """
+        Retourne l'analyse du cluster du niveau courant, calculée au premier appel.
+
+        Args:
+            cancel_event (threading.Event): Interrompt l'analyse
+            progress (dict): Reçoit le nombre d'états énumérés
+
+        Returns:
+            ClusterAnalysis: Table des distances à la sortie, ou None si le cluster
+                             est trop grand pour être analysé
+        """
+        if (self.cluster is None or self.cluster_source is not self.initial_board
+                or self.cluster.metric != self.metric):
+            cluster = ClusterAnalysis(self.initial_board, self.metric)
+            cluster.analyze(cancel_event=cancel_event, progress=progress)
+            if cancel_event is not None and cancel_event.is_set():
+                # Analyse incomplète : elle sera relancée au prochain appel
+                return None
+            self.cluster = cluster
+            self.cluster_source = self.initial_board
+
+        return self.cluster if self.cluster.analyzed else None
+
+    def get_solution(self, from_current=False, cancel_event=None, progress=None):
         """
         Retourne la solution de la grille actuelle.
 
+        Args:
+            from_current (bool): True pour partir de la position actuelle du joueur
+                                 plutôt que de l'état initial du niveau
+            cancel_event (threading.Event): Interrompt le calcul (la solution n'est alors pas mise en cache)
+            progress (dict): Reçoit la progression du calcul ('nodes_explored')
+
         Returns:
-            list: Liste de tuples (vehicle_id, direction), ou None si pas de solution
+            list: Liste de tuples (vehicle_id, direction), ou (vehicle_id, direction, distance)
+                en métrique 'slide', ou None si pas de solution
         """
-        # Vérifie si la solution est en cache
-        if self.current_level in self.solutions:
-            return self.solutions[self.current_level]
+        if from_current:
+            cluster = self.get_cluster(cancel_event, progress)
+            if cluster:
+                return cluster.solution_from(self.board)
+            solver = Solver(self.board.clone(), self.metric, cancel_event=cancel_event, progress=progress)
+            return solver.solve(method='bfs')
+
+        # Vérifie si la solution est en cache (en mémoire, puis sur disque)
+        key = self._solution_key(self.initial_board)
+        if key in self.solutions:
+            return self.solutions[key]
+        solution = self._load_cached_solution(self.initial_board)
+        if solution is not None:
+            return solution
+
+        # Sinon, lit la solution optimale dans la table du cluster
+        cluster = self.get_cluster(cancel_event, progress)
+        if cluster:
+            solution = cluster.solution_from(self.initial_board)
+        else:
+            solver = Solver(self.initial_board.clone(), self.metric, cancel_event=cancel_event, progress=progress)
+            solution = solver.solve(method='bfs')
 
-        # Sinon, calcule la solution
-        solver = Solver(self.initial_board.clone())
-        solution = solver.solve()
+        if cancel_event is not None and cancel_event.is_set():
+            return None
 
         # Stocke la solution en cache
-        self.solutions[self.current_level] = solution
+        self.solutions[key] = solution
+        if self.solution_cache is not None:
+            self.solution_cache.put(self.initial_board, self.metric, solution)
 
         return solution
 
+    def _load_cached_solution(self, board):
+        """
+        Cherche la solution d'un plateau initial dans le cache persistant et la
+        recopie dans le cache en mémoire.
+
+        Args:
+            board (Board): Plateau initial du niveau
+
+        Returns:
+            list: Solution dans la métrique courante, ou None si absente
+        """
+        if self.solution_cache is None:
+            return None
+
+        solution = self.solution_cache.get(board, self.metric)
+        if solution is not None:
+            self.solutions[self._solution_key(board)] = solution
+        return solution
+
+    def _solution_key(self, board, metric=None):
+        """
+        Retourne la clé du cache des solutions pour un plateau initial.
+
+        Args:
+            board (Board): Plateau initial du niveau
+            metric (str): Métrique de la solution (par défaut, celle du jeu)
+
+        Returns:
+            tuple: (métrique, clé exacte du plateau)
+        """
+        return metric or self.metric, board.get_state_key()
+
     def get_current_state(self):
         """
         Retourne l'état actuel du jeu pour sauvegarder.
@@ -329,9 +561,10 @@ class Game:
         """
         try:
             self.current_level = state['current_level']
-            self.moves_count = state['moves_count']
             self.board = self.deserialize_board(state['board'])
             self.initial_board = self.deserialize_board(state['initial_board'])
+            self._reset_progress()
+            self.moves_count = state['moves_count']
             return True
         except Exception as e:
             print(f"Erreur lors du chargement de l'état: {e}")
@@ -348,22 +581,7 @@ class Game:
         Returns:
             dict: Plateau sérialisé
         """
-        vehicles_data = []
-        for vehicle in board.vehicles.values():
-            vehicles_data.append({
-                'id': vehicle.id,
-                'x': vehicle.x,
-                'y': vehicle.y,
-                'length': vehicle.length,
-                'orientation': vehicle.orientation,
-                'is_main': vehicle.is_main
-            })
-
-        return {
-            'size': board.size,
-            'exit_pos': board.exit_pos,
-            'vehicles': vehicles_data
-        }
+        return board.to_dict()
 
     @staticmethod
     def deserialize_board(data):
@@ -376,30 +594,43 @@ class Game:
         Returns:
             Board: Plateau désérialisé
         """
-        board = Board(data['size'])
-        board.exit_pos = data['exit_pos']
-
-        for vehicle_data in data['vehicles']:
-            vehicle = Vehicle(
-                vehicle_data['id'],
-                vehicle_data['x'],
-                vehicle_data['y'],
-                vehicle_data['length'],
-                vehicle_data['orientation'],
-                vehicle_data['is_main']
-            )
-            board.add_vehicle(vehicle)
+        return Board.from_dict(data)
 
-        return board
-
-    def get_level_difficulty(self):
+    def get_level_difficulty(self, compute=True, cancel_event=None, progress=None):
         """
         Retourne la difficulté estimée du niveau actuel.
 
+        La difficulté est donnée par le modèle multi-facteurs de difficulty.py ;
+        tant que l'analyse n'a pas été menée, elle est estimée d'après la seule
+        longueur de la solution.
+
+        Args:
+            compute (bool): False pour ne lire que les résultats en cache, sans lancer
+                            de recherche (utile depuis le thread de l'interface)
+            cancel_event (threading.Event): Interrompt l'analyse
+            progress (dict): Reçoit la progression de l'analyse
+
         Returns:
             tuple: (difficulté en texte, nombre de mouvements)
         """
-        solution = self.get_solution()
+        key = self.initial_board.get_state_key()
+        analysis = self.difficulties.get(key)
+        if analysis is None and compute:
+            # L'analyse réutilise le cluster du niveau quand il est compté case par case
+            cluster = self.get_cluster(cancel_event, progress) if self.metric == 'step' else None
+            analysis = analyze_difficulty(self.initial_board, cluster=cluster, cancel_event=cancel_event,
+                                          progress=progress)
+            if analysis is not None:
+                self.difficulties[key] = analysis
+                self.solutions.setdefault(self._solution_key(self.initial_board, 'step'), analysis['solution'])
+
+        if analysis is not None:
+            return analysis['label'], analysis['step_moves' if self.metric == 'step' else 'slide_moves']
+
+        if compute:
+            solution = self.get_solution()
+        else:
+            solution = self.solutions.get(self._solution_key(self.initial_board))
 
         if not solution:
             return "Inconnue", 0
@@ -420,12 +651,19 @@ class Game:
         """
         Retourne un indice pour le mouvement suivant.
 
+        L'indice est lu dans la table du cluster à partir de la position actuelle,
+        il reste donc valable même si le joueur s'est écarté de la solution.
+
         Returns:
-            tuple: (vehicle_id, direction) ou None
+            tuple: (vehicle_id, direction), (vehicle_id, direction, distance) en
+                métrique 'slide', ou None
         """
-        solution = self.get_solution()
+        cluster = self.get_cluster()
+        if cluster:
+            return cluster.best_move(self.board)
 
-        if not solution or self.moves_count >= len(solution):
+        solution = self.get_solution(from_current=True)
+        if not solution:
             return None
 
-        return solution[self.moves_count]
\ No newline at end of file
+        return solution[0]
\ No newline at end of file
@@ -5,6 +5,8 @@ import time
 import os
 import random
 from PIL import Image, ImageTk, ImageDraw, ImageFilter
+from solver import move_distance
+from jobs import BackgroundJob
 
 
 class GameGUI:
@@ -18,13 +20,18 @@ class GameGUI:
         """
         self.root = root
         self.game = game
-        self.cell_size = 80
+        self.max_cell_size = 80
+        self.max_board_pixels = 560  # Côté maximal du plateau : les cases rétrécissent au-delà de 7x7
+        self.cell_size = self.max_cell_size
         self.selected_vehicle = None
         self.animation_speed = 400
 
         # Flag pour indiquer si une animation est en cours
         self.animation_in_progress = False
 
+        # Calcul en arrière-plan (génération, résolution), None si aucun
+        self.job = None
+
         # Palette de couleurs inspirée d'Apple avec des touches modernes
         self.colors = {
             # Couleurs de base
@@ -68,7 +75,8 @@ class GameGUI:
         self.root.resizable(False, False)
 
         # Dimensionnement de l'interface
-        board_size = self.cell_size * self.game.board.size
+        self.cell_size = min(self.max_cell_size, self.max_board_pixels // self.game.board.size)
+        board_width, board_height = self._board_pixels()
         control_width = 240  # Largeur de la zone de contrôle
 
         # Frame principale
@@ -80,7 +88,7 @@ class GameGUI:
         self.board_frame.grid(row=0, column=0, padx=10, pady=10)
 
         # Canvas pour dessiner le plateau
-        self.canvas = tk.Canvas(self.board_frame, width=board_size, height=board_size,
+        self.canvas = tk.Canvas(self.board_frame, width=board_width, height=board_height,
                                 bg='#E5E5EA', highlightthickness=0)
         self.canvas.pack()
 
@@ -175,6 +183,12 @@ class GameGUI:
                                                lambda: self.reset_level_wrapper())
         self.reset_button.pack(fill='x', pady=5)
 
+        # Bouton pour annuler un calcul en cours (actif uniquement pendant un calcul)
+        self.cancel_button = self.create_button(self.control_frame, "Annuler le calcul",
+                                                lambda: self.cancel_job())
+        self.cancel_button.config(state='disabled')
+        self.cancel_button.pack(fill='x', pady=5)
+
         # Séparateur
         self.add_separator(self.control_frame)
 
@@ -444,6 +458,14 @@ class GameGUI:
         filemenu.add_command(label="Quitter", command=self.root.quit)
         menubar.add_cascade(label="Fichier", menu=filemenu)
 
+        # Menu Édition
+        editmenu = tk.Menu(menubar, tearoff=0)
+        editmenu.add_command(label="Annuler", accelerator="Ctrl+Z", command=self.undo_move)
+        editmenu.add_command(label="Rétablir", accelerator="Ctrl+Y", command=self.redo_move)
+        menubar.add_cascade(label="Édition", menu=editmenu)
+        self.root.bind("<Control-z>", lambda e: self.undo_move())
+        self.root.bind("<Control-y>", lambda e: self.redo_move())
+
         # Menu Aide
         helpmenu = tk.Menu(menubar, tearoff=0)
         helpmenu.add_command(label="Règles", command=self.show_rules)
@@ -466,55 +488,103 @@ class GameGUI:
 
         optionsmenu.add_cascade(label="Vitesse d'animation", menu=speedmenu)
 
+        # Sous-menu pour la métrique de comptage des mouvements
+        metricmenu = tk.Menu(optionsmenu, tearoff=0)
+        self.metric_var = tk.StringVar(value=self.game.metric)
+
+        metricmenu.add_radiobutton(label="Case par case", variable=self.metric_var, value='step',
+                                   command=lambda: self.set_metric('step'))
+        metricmenu.add_radiobutton(label="Glissement", variable=self.metric_var, value='slide',
+                                   command=lambda: self.set_metric('slide'))
+
+        optionsmenu.add_cascade(label="Comptage des mouvements", menu=metricmenu)
+
         menubar.add_cascade(label="Options", menu=optionsmenu)
 
         self.root.config(menu=menubar)
 
+    def undo_move(self):
+        """Annule le dernier mouvement du joueur."""
+        if self.is_busy():
+            return
+
+        if self.game.undo_move():
+            self.draw_board()
+
+    def redo_move(self):
+        """Rejoue le dernier mouvement annulé."""
+        if self.is_busy():
+            return
+
+        if self.game.redo_move():
+            self.draw_board()
+            if self.game.is_solved():
+                self.show_victory_message()
+
     def set_animation_speed(self, speed):
         """Définit la vitesse d'animation."""
         self.animation_speed = speed
 
+    def set_metric(self, metric):
+        """Définit la métrique de comptage des mouvements ('step' ou 'slide')."""
+        if self.is_busy():
+            self.metric_var.set(self.game.metric)
+            return
+
+        self.game.set_metric(metric)
+        self.draw_board()
+
+    def _board_pixels(self):
+        """Retourne la largeur et la hauteur du plateau en pixels."""
+        board = self.game.board
+        return self.cell_size * board.width, self.cell_size * board.height
+
     def draw_board(self):
         """Dessine le plateau de jeu et les véhicules stylisés."""
         # Efface le canvas
         self.canvas.delete("all")
 
-        # Taille du plateau
-        board_size = self.cell_size * self.game.board.size
+        # Adapte la taille des cases et du canvas aux dimensions du plateau
+        board = self.game.board
+        self.cell_size = min(self.max_cell_size, self.max_board_pixels // board.size)
+        board_width, board_height = self._board_pixels()
+        self.canvas.config(width=board_width, height=board_height)
 
         # Dessine l'arrière-plan
-        self.canvas.create_rectangle(0, 0, board_size, board_size,
+        self.canvas.create_rectangle(0, 0, board_width, board_height,
                                      fill='#E5E5EA', outline='')
 
         # Dessine la grille subtile
-        for i in range(self.game.board.size + 1):
+        for i in range(board.height + 1):
             # Lignes horizontales
             self.canvas.create_line(
                 0, i * self.cell_size,
-                   self.game.board.size * self.cell_size, i * self.cell_size,
+                   board_width, i * self.cell_size,
                 fill="#D1D1D6", width=1
             )
+        for i in range(board.width + 1):
             # Lignes verticales
             self.canvas.create_line(
                 i * self.cell_size, 0,
-                i * self.cell_size, self.game.board.size * self.cell_size,
+                i * self.cell_size, board_height,
                 fill="#D1D1D6", width=1
             )
 
-        # Dessine la sortie (à droite en position y=2)
-        exit_x, exit_y = self.game.board.exit_pos
+        # Dessine la sortie (case du bord indiquée par board.exit_pos)
+        exit_x, exit_y = board.exit_pos
         self.canvas.create_rectangle(
             exit_x * self.cell_size, exit_y * self.cell_size,
             (exit_x + 1) * self.cell_size, (exit_y + 1) * self.cell_size,
             fill="#FFD426", outline="", stipple="gray50"
         )
 
-        # Dessine une flèche pour indiquer la sortie
+        # Dessine une flèche pointant vers le bord de la sortie
         arrow_x = exit_x * self.cell_size + self.cell_size * 0.5
         arrow_y = exit_y * self.cell_size + self.cell_size * 0.5
+        dx, dy = {'right': (20, 0), 'left': (-20, 0), 'bottom': (0, 20), 'top': (0, -20)}[board.exit_side]
         self.canvas.create_line(
-            arrow_x - 20, arrow_y,
-            arrow_x + 20, arrow_y,
+            arrow_x - dx, arrow_y - dy,
+            arrow_x + dx, arrow_y + dy,
             arrow='last', width=3, fill="#333333"
         )
 
@@ -554,7 +624,7 @@ class GameGUI:
 
                 # Affiche l'image
                 self.canvas.create_image(x1, y1, anchor='nw', image=photo,
-                                         tags=("vehicle", vehicle.id))
+                                         tags=("vehicle", f"vehicle_{vehicle.id}"))
             else:
                 # Fallback: crée un rectangle coloré si l'image n'est pas disponible
                 color = self.colors['X'] if vehicle.is_main else (
@@ -563,7 +633,7 @@ class GameGUI:
                 self.canvas.create_rectangle(
                     x1, y1, x2, y2,
                     fill=color, outline="#000000", width=2,
-                    tags=("vehicle", vehicle.id)
+                    tags=("vehicle", f"vehicle_{vehicle.id}")
                 )
 
             # Ajoute l'identifiant au centre du véhicule
@@ -578,7 +648,8 @@ class GameGUI:
         self.moves_label.config(text=str(self.game.moves_count))
 
         # Met à jour le niveau affiché
-        difficulty, moves = self.game.get_level_difficulty()
+        # (lecture du cache uniquement : aucune recherche dans le thread de l'interface)
+        difficulty, moves = self.game.get_level_difficulty(compute=False)
 
         # Vérifie si le niveau est une chaîne de caractères (aléatoire) ou un nombre (prédéfini)
         if isinstance(self.game.current_level, str):
@@ -593,8 +664,8 @@ class GameGUI:
 
     def on_canvas_click(self, event):
         """Gère les clics sur le canvas."""
-        # Si une animation est en cours, ignore les clics
-        if self.animation_in_progress:
+        # Si une animation ou un calcul est en cours, ignore les clics
+        if self.is_busy():
             return
 
         # Convertit les coordonnées du clic en coordonnées de cellule
@@ -627,8 +698,8 @@ class GameGUI:
 
     def on_canvas_drag(self, event):
         """Gère le glisser-déposer d'un véhicule avec animation fluide."""
-        # Si une animation est en cours ou aucun véhicule n'est sélectionné, ignore
-        if self.animation_in_progress or not self.selected_vehicle:
+        # Si une animation ou un calcul est en cours ou aucun véhicule n'est sélectionné, ignore
+        if self.is_busy() or not self.selected_vehicle:
             return
 
         # Efface les effets de sélection précédents
@@ -673,8 +744,8 @@ class GameGUI:
 
     def on_canvas_release(self, event):
         """Gère le relâchement du clic."""
-        # Si une animation est en cours, ignore
-        if self.animation_in_progress:
+        # Si une animation ou un calcul est en cours, ignore
+        if self.is_busy():
             return
 
         # Efface les effets de sélection
@@ -689,7 +760,7 @@ class GameGUI:
 
     def change_level(self, level):
         """Change le niveau du jeu pour un niveau prédéfini."""
-        if self.animation_in_progress:
+        if self.is_busy():
             return
 
         if self.game.moves_count > 0:
@@ -702,24 +773,17 @@ class GameGUI:
             if not confirm:
                 return
 
-        # Animation de chargement
-        self.canvas.delete("all")
-        self.canvas.create_text(
-            self.cell_size * self.game.board.size / 2,
-            self.cell_size * self.game.board.size / 2,
-            text=f"Chargement du niveau {level}...",
-            font=self.fonts['large'],
-            fill=self.colors['accent']
-        )
-        self.root.update()
+        def work(job):
+            # Charge le niveau puis calcule sa solution et sa difficulté (affichées avec le niveau)
+            self.game.load_level(level)
+            self.game.get_solution(cancel_event=job.cancel_event, progress=job.progress)
+            self.game.get_level_difficulty(cancel_event=job.cancel_event, progress=job.progress)
 
-        # Charge le niveau
-        self.game.load_level(level)
-        self.draw_board()
+        self.run_in_background(f"Chargement du niveau {level}...", work, lambda job: self.draw_board())
 
     def generate_random_level(self, difficulty):
         """Génère un niveau aléatoire avec animation de chargement."""
-        if self.animation_in_progress:
+        if self.is_busy():
             return
 
         if self.game.moves_count > 0:
@@ -732,40 +796,111 @@ class GameGUI:
             if not confirm:
                 return
 
-        # Animation de chargement
-        self.canvas.delete("all")
+        def on_done(job):
+            # En cas d'annulation, le niveau précédent est conservé
+            self.draw_board()
+            if not job.cancelled and not job.result:
+                messagebox.showerror("Erreur", "Impossible de générer un niveau aléatoire. Réessayez.")
+
+        self.run_in_background(
+            f"Génération niveau {difficulty} aléatoire...",
+            lambda job: self.game.generate_random_level(difficulty, job.cancel_event, job.progress),
+            on_done
+        )
+
+    def is_busy(self):
+        """True si une animation ou un calcul en arrière-plan est en cours."""
+        return self.animation_in_progress or self.job is not None
+
+    def run_in_background(self, message, work, on_done):
+        """
+        Exécute un calcul long hors du thread de l'interface.
+
+        Le plateau est recouvert d'un message indiquant la progression, le bouton
+        d'annulation est activé, et `on_done(job)` est appelé dans le thread Tk
+        une fois le calcul terminé (y compris après une annulation).
+
+        Args:
+            message (str): Texte affiché pendant le calcul
+            work (callable): Fonction work(job) exécutée en arrière-plan
+            on_done (callable): Fonction on_done(job) appelée à la fin du calcul
+        """
+        board_width, board_height = self._board_pixels()
+        self.canvas.create_rectangle(
+            0, 0, board_width, board_height,
+            fill=self.colors['background'],
+            stipple="gray50",
+            tags="job_overlay"
+        )
         self.canvas.create_text(
-            self.cell_size * self.game.board.size / 2,
-            self.cell_size * self.game.board.size / 2,
-            text=f"Génération niveau {difficulty} aléatoire...",
+            board_width / 2, board_height / 2 - 15,
+            text=message,
             font=self.fonts['large'],
-            fill=self.colors['accent']
+            fill=self.colors['accent'],
+            tags="job_overlay"
         )
-        self.root.update()
+        self.canvas.create_text(
+            board_width / 2, board_height / 2 + 20,
+            text="",
+            font=self.fonts['small'],
+            fill=self.colors['foreground'],
+            tags=("job_overlay", "job_progress")
+        )
+        self.cancel_button.config(state='normal')
+
+        self.job = BackgroundJob(work).start()
+        self.root.after(100, lambda: self._poll_job(on_done))
+
+    def _poll_job(self, on_done):
+        """Met à jour l'affichage de la progression jusqu'à la fin du calcul."""
+        job = self.job
+        if not job.is_done():
+            details = []
+            if 'attempts' in job.progress:
+                details.append(f"{job.progress['attempts']} tentatives")
+            if 'nodes_explored' in job.progress:
+                details.append(f"{job.progress['nodes_explored']} états explorés")
+            if job.cancelled:
+                details.append("annulation...")
+            self.canvas.itemconfig("job_progress", text=" - ".join(details))
+            self.root.after(100, lambda: self._poll_job(on_done))
+            return
+
+        self.job = None
+        self.cancel_button.config(state='disabled')
+        self.canvas.delete("job_overlay")
 
-        # Génère le niveau
-        if self.game.generate_random_level(difficulty):
+        if job.error is not None:
+            print(f"Erreur lors du calcul en arrière-plan: {job.error}")
             self.draw_board()
-        else:
-            messagebox.showerror("Erreur", "Impossible de générer un niveau aléatoire. Réessayez.")
+            messagebox.showerror("Erreur", "Le calcul a échoué. Réessayez.")
+            return
+
+        on_done(job)
+
+    def cancel_job(self):
+        """Annule le calcul en cours, s'il y en a un."""
+        if self.job is not None:
+            self.job.cancel()
 
     def reset_level(self):
         """Réinitialise le niveau actuel avec une animation élégante."""
-        if self.animation_in_progress:
+        if self.is_busy():
             return
 
         # Animation de réinitialisation
+        board_width, board_height = self._board_pixels()
         self.canvas.create_rectangle(
             0, 0,
-            self.cell_size * self.game.board.size,
-            self.cell_size * self.game.board.size,
+            board_width,
+            board_height,
             fill=self.colors['background'],
             stipple="gray50",
             tags="reset_overlay"
         )
         self.canvas.create_text(
-            self.cell_size * self.game.board.size / 2,
-            self.cell_size * self.game.board.size / 2,
+            board_width / 2,
+            board_height / 2,
             text="Réinitialisation...",
             font=self.fonts['large'],
             fill=self.colors['accent'],
@@ -783,10 +918,22 @@ class GameGUI:
 
     def show_solution(self):
         """Montre la solution du niveau actuel avec animation élégante."""
-        if self.animation_in_progress:
+        if self.is_busy():
+            return
+
+        # La recherche de la solution se fait en arrière-plan
+        self.run_in_background(
+            "Recherche de la solution...",
+            lambda job: self.game.get_solution(cancel_event=job.cancel_event, progress=job.progress),
+            self.play_solution
+        )
+
+    def play_solution(self, job):
+        """Propose puis anime la solution calculée en arrière-plan."""
+        if job.cancelled:
             return
 
-        solution = self.game.get_solution()
+        solution = job.result
 
         if not solution:
             messagebox.showinfo("Solution", "Aucune solution trouvée pour ce niveau.")
@@ -817,22 +964,24 @@ class GameGUI:
         Anime la solution pas à pas avec effets visuels.
 
         Args:
-            solution (list): Liste de tuples (vehicle_id, direction)
+            solution (list): Liste de tuples (vehicle_id, direction) ou
+                (vehicle_id, direction, distance) en métrique 'slide'
             index (int): Index du mouvement actuel
         """
         if index >= len(solution):
             # Animation finale
+            board_width, board_height = self._board_pixels()
             self.canvas.create_rectangle(
                 0, 0,
-                self.cell_size * self.game.board.size,
-                self.cell_size * self.game.board.size,
+                board_width,
+                board_height,
                 fill=self.colors['success'],
                 stipple="gray50",
                 tags="success_overlay"
             )
             self.canvas.create_text(
-                self.cell_size * self.game.board.size / 2,
-                self.cell_size * self.game.board.size / 2,
+                board_width / 2,
+                board_height / 2,
                 text="Solution terminée!",
                 font=self.fonts['large'],
                 fill="white",
@@ -847,7 +996,8 @@ class GameGUI:
             return
 
         # Récupère le mouvement actuel
-        vehicle_id, direction = solution[index]
+        vehicle_id, direction = solution[index][:2]
+        distance = move_distance(solution[index])
 
         # Highlight du véhicule sélectionné
         vehicle = self.game.board.vehicles.get(vehicle_id)
@@ -868,7 +1018,7 @@ class GameGUI:
             self.root.after(200)  # Pause pour l'effet
 
         # Effectue le mouvement
-        self.game.move_vehicle(vehicle_id, direction)
+        self.game.move_vehicle(vehicle_id, direction, distance)
 
         # Redessine le plateau
         self.draw_board()
@@ -880,14 +1030,14 @@ class GameGUI:
     def show_victory_message(self):
         """Affiche un message de victoire élégant."""
         # Effet de victoire
-        board_size = self.cell_size * self.game.board.size
+        board_width, board_height = self._board_pixels()
 
         # Active le flag d'animation
         self.animation_in_progress = True
 
         # Overlay semi-transparent
         overlay = self.canvas.create_rectangle(
-            0, 0, board_size, board_size,
+            0, 0, board_width, board_height,
             fill=self.colors['success'],
             stipple="gray50",
             tags="victory_overlay"
@@ -895,7 +1045,7 @@ class GameGUI:
 
         # Texte de victoire
         victory_text = self.canvas.create_text(
-            board_size / 2, board_size / 2 - 20,
+            board_width / 2, board_height / 2 - 20,
             text="Niveau résolu!",
             font=self.fonts['large'],
             fill="white",
@@ -904,7 +1054,7 @@ class GameGUI:
 
         # Sous-texte
         moves_text = self.canvas.create_text(
-            board_size / 2, board_size / 2 + 20,
+            board_width / 2, board_height / 2 + 20,
             text=f"En {self.game.moves_count} mouvements",
             font=self.fonts['medium'],
             fill="white",
@@ -0,0 +1,47 @@
+# jobs.py
+import threading
+
+
+class BackgroundJob:
+    def __init__(self, work):
+        """
+        Prépare une tâche longue (résolution, génération) à exécuter hors du thread Tk.
+
+        La fonction `work` reçoit la tâche en argument : elle doit transmettre
+        `job.cancel_event` et `job.progress` aux solveurs et générateurs qu'elle
+        utilise, pour que l'interface puisse suivre leur progression et les annuler.
+
+        Args:
+            work (callable): Fonction work(job) dont la valeur de retour devient `job.result`
+        """
+        self.work = work
+        self.cancel_event = threading.Event()
+        self.progress = {}  # Mis à jour par les solveurs/générateurs (nœuds explorés, tentatives)
+        self.result = None
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        """Exécute la tâche et mémorise son résultat ou son erreur."""
+        try:
+            self.result = self.work(self)
+        except Exception as e:
+            self.error = e
+
+    def start(self):
+        """Démarre la tâche dans un thread d'arrière-plan."""
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Demande l'arrêt de la tâche ; les recherches en cours s'interrompent rapidement."""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        """True si l'annulation a été demandée."""
+        return self.cancel_event.is_set()
+
+    def is_done(self):
+        """True quand la tâche est terminée (succès, erreur ou annulation)."""
+        return not self.thread.is_alive()
@@ -0,0 +1,73 @@
+# lanes.py
+
+# Tables déjà construites, par longueur de ligne
+_tables = {}
+
+
+class LaneTables:
+    def __init__(self, lane_size):
+        """
+        Précalcule les déplacements possibles sur une ligne (ou colonne) du plateau.
+
+        L'occupation d'une ligne tient sur `lane_size` bits (bit i à 1 si la case i
+        est occupée). Pour un véhicule de longueur donnée placé en `position`, la
+        table donne directement le nombre de cases libres derrière et devant lui,
+        sans tester les cases une à une.
+
+        Args:
+            lane_size (int): Nombre de cases de la ligne
+        """
+        self.lane_size = lane_size
+        self.full_mask = (1 << lane_size) - 1
+
+        # free[longueur][position][occupation] = (cases libres en reculant, cases libres en avançant)
+        self.free = {}
+        for length in range(1, lane_size + 1):
+            per_position = []
+            for position in range(lane_size - length + 1):
+                entries = []
+                for bits in range(1 << lane_size):
+                    back = 0
+                    while position - back - 1 >= 0 and not bits >> (position - back - 1) & 1:
+                        back += 1
+                    forward = 0
+                    end = position + length
+                    while end + forward < lane_size and not bits >> (end + forward) & 1:
+                        forward += 1
+                    entries.append((back, forward))
+                per_position.append(entries)
+            self.free[length] = per_position
+
+        # Nombre de cases occupées pour chaque occupation de ligne
+        self.counts = [bin(bits).count('1') for bits in range(1 << lane_size)]
+
+    def free_range(self, length, position, bits):
+        """
+        Retourne le nombre de cases libres de part et d'autre d'un véhicule.
+
+        Args:
+            length (int): Longueur du véhicule
+            position (int): Position du véhicule sur la ligne
+            bits (int): Occupation de la ligne (le véhicule lui-même peut y figurer)
+
+        Returns:
+            tuple: (cases libres en reculant, cases libres en avançant)
+        """
+        return self.free[length][position][bits]
+
+
+def lane_tables(lane_size):
+    """
+    Retourne les tables d'une longueur de ligne, construites au premier appel.
+
+    Args:
+        lane_size (int): Nombre de cases de la ligne
+
+    Returns:
+        LaneTables: Tables partagées
+    """
+    tables = _tables.get(lane_size)
+    if tables is None:
+        tables = LaneTables(lane_size)
+        _tables[lane_size] = tables
+    return tables
@@ -0,0 +1,293 @@
+# level_db.py
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+from board import Board
+from vehicle import Vehicle
+
+# Emplacement par défaut de la base de niveaux, à côté du code du jeu
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'levels.bin')
+
+MAGIC = b'RHLV'
+VERSION = 1
+
+# En-tête : signature, version, largeur, hauteur, ligne de sortie, nombre de niveaux,
+# taille de l'index par nombre de mouvements
+HEADER = struct.Struct('<4sBBBBII')
+
+# Fin de chaque enregistrement, après la grille : mouvements optimaux, taille du cluster
+RECORD_TAIL = struct.Struct('>HI')
+
+# Symboles des véhicules dans la grille ('X' est réservé à la voiture principale)
+EMPTY = '.'
+SYMBOLS = [chr(i) for i in range(65, 91) if chr(i) != 'X'] + [chr(i) for i in range(97, 123)]
+
+
+def encode_grid(board):
+    """
+    Encode un plateau en grille texte, une case par caractère, ligne par ligne.
+
+    Le plateau est d'abord ramené dans le repère où la sortie est à droite ; les
+    véhicules sont renommés par ordre d'apparition dans la grille ('X' pour la
+    voiture principale), si bien que deux plateaux identiques à un renommage près
+    ont la même grille.
+
+    Args:
+        board (Board): Plateau à encoder
+
+    Returns:
+        str: Grille de largeur * hauteur caractères ('.' pour une case vide)
+
+    Raises:
+        ValueError: Si le plateau compte plus de véhicules (hors voiture principale)
+                    que de symboles disponibles
+    """
+    others_count = sum(1 for vehicle in board.vehicles.values() if not vehicle.is_main)
+    if others_count > len(SYMBOLS):
+        raise ValueError(f"Plateau de {others_count} véhicules (hors voiture principale) : "
+                         f"la base de niveaux en accepte au plus {len(SYMBOLS)}")
+
+    if board.exit_side != 'right':
+        board = board.to_exit_frame()
+
+    symbols = {}
+    others = iter(SYMBOLS)
+    cells = []
+    for y in range(board.height):
+        for x in range(board.width):
+            vehicle_id = board.grid[y][x]
+            if vehicle_id is None:
+                cells.append(EMPTY)
+                continue
+            if vehicle_id not in symbols:
+                symbols[vehicle_id] = 'X' if board.vehicles[vehicle_id].is_main else next(others)
+            cells.append(symbols[vehicle_id])
+    return ''.join(cells)
+
+
+def decode_grid(grid, width, height, exit_row):
+    """
+    Reconstruit un plateau (sortie à droite) à partir de sa grille texte.
+
+    Args:
+        grid (str): Grille produite par `encode_grid`
+        width (int): Largeur du plateau
+        height (int): Hauteur du plateau
+        exit_row (int): Ligne de la sortie
+
+    Returns:
+        Board: Plateau dont les véhicules portent les symboles de la grille
+    """
+    cells = {}
+    for index, symbol in enumerate(grid):
+        if symbol != EMPTY:
+            cells.setdefault(symbol, []).append((index % width, index // width))
+
+    board = Board(width, height, 'right', exit_row)
+    for symbol, positions in cells.items():
+        x, y = positions[0]  # Première case dans l'ordre de lecture : coin haut-gauche du véhicule
+        orientation = 'H' if positions[-1][1] == y else 'V'
+        board.add_vehicle(Vehicle(symbol, x, y, len(positions), orientation, symbol == 'X'))
+    return board
+
+
+class LevelDatabase:
+    def __init__(self, path=DEFAULT_PATH):
+        """
+        Ouvre une base de niveaux en lecture, projetée en mémoire (mmap).
+
+        La base est un fichier binaire : un en-tête, un index par nombre de
+        mouvements, puis un enregistrement de taille fixe par niveau (grille
+        texte, nombre de mouvements optimal, taille du cluster). Les niveaux sont
+        triés par nombre de mouvements : l'index donne, pour chaque nombre de
+        mouvements, le premier niveau correspondant. Seuls l'en-tête et l'index
+        sont lus à l'ouverture ; les niveaux sont lus à la demande.
+
+        Args:
+            path (str): Fichier de la base (voir `write_database`)
+        """
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"Base de niveaux vide: {path}")
+
+        magic, version, self.width, self.height, self.exit_row, self.count, index_size = \
+            HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"Base de niveaux invalide: {path}")
+
+        # starts[m] : indice du premier niveau résolu en au moins m mouvements
+        self.starts = struct.unpack_from(f'<{index_size}I', self.data, HEADER.size) + (self.count,)
+        self.grid_size = self.width * self.height
+        self.record_size = self.grid_size + RECORD_TAIL.size
+        self.records_offset = HEADER.size + 4 * index_size
+
+    def __len__(self):
+        return self.count
+
+    def record(self, index):
+        """
+        Lit un enregistrement.
+
+        Args:
+            index (int): Indice du niveau (0 à len(base) - 1)
+
+        Returns:
+            tuple: (grille, mouvements optimaux, taille du cluster)
+        """
+        if not 0 <= index < self.count:
+            raise IndexError(f"Niveau {index} absent de la base ({self.count} niveaux)")
+        start = self.records_offset + index * self.record_size
+        grid = self.data[start:start + self.grid_size].decode('ascii')
+        moves, cluster_size = RECORD_TAIL.unpack_from(self.data, start + self.grid_size)
+        return grid, moves, cluster_size
+
+    def board(self, index):
+        """Retourne le plateau du niveau `index` (sortie à droite)."""
+        grid, _, _ = self.record(index)
+        return decode_grid(grid, self.width, self.height, self.exit_row)
+
+    def range_for(self, min_moves, max_moves=None):
+        """
+        Retourne les indices des niveaux résolus en `min_moves` à `max_moves` mouvements.
+
+        Args:
+            min_moves (int): Nombre minimum de mouvements
+            max_moves (int): Nombre maximum de mouvements (min_moves si None)
+
+        Returns:
+            range: Indices des niveaux (les niveaux sont triés par nombre de mouvements)
+        """
+        if max_moves is None:
+            max_moves = min_moves
+        last = len(self.starts) - 1
+        start = self.starts[min(max(min_moves, 0), last)]
+        end = self.starts[min(max(max_moves + 1, 0), last)]
+        return range(start, max(start, end))
+
+    def random_index(self, min_moves, max_moves=None):
+        """
+        Tire au hasard un niveau dont la solution compte entre `min_moves` et `max_moves` mouvements.
+
+        Returns:
+            int: Indice du niveau, ou None si aucun niveau ne correspond
+        """
+        indices = self.range_for(min_moves, max_moves)
+        return random.choice(indices) if indices else None
+
+    def close(self):
+        """Libère la projection et le fichier."""
+        self.data.close()
+        self.file.close()
+
+
+def write_database(path, levels, width=6, height=6, exit_row=2):
+    """
+    Écrit une base de niveaux.
+
+    Args:
+        path (str): Fichier à créer (remplacé de façon atomique)
+        levels (iterable): (plateau, mouvements optimaux, taille du cluster) ; les
+                           plateaux dont le format (une fois la sortie ramenée à
+                           droite) diffère de celui de la base sont ignorés
+        width (int): Largeur des plateaux
+        height (int): Hauteur des plateaux
+        exit_row (int): Ligne de la sortie
+
+    Returns:
+        int: Nombre de niveaux écrits
+    """
+    records = {}
+    for board, moves, cluster_size in levels:
+        if board.exit_side != 'right':
+            board = board.to_exit_frame()
+        if (board.width, board.height, board.exit_pos[1]) != (width, height, exit_row):
+            continue
+        # Un niveau présent plusieurs fois (à un renommage près) n'est gardé qu'une fois
+        records[encode_grid(board)] = (moves, cluster_size)
+
+    ordered = sorted(records.items(), key=lambda item: item[1][0])
+    index_size = ordered[-1][1][0] + 1 if ordered else 0
+
+    # Premier niveau de chaque nombre de mouvements (les niveaux sont triés)
+    starts = []
+    position = 0
+    for moves in range(index_size):
+        while position < len(ordered) and ordered[position][1][0] < moves:
+            position += 1
+        starts.append(position)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, width, height, exit_row, len(ordered), index_size))
+        f.write(struct.pack(f'<{index_size}I', *starts))
+        for grid, (moves, cluster_size) in ordered:
+            f.write(grid.encode('ascii') + RECORD_TAIL.pack(moves, cluster_size))
+    os.replace(temporary, path)
+    return len(ordered)
+
+
+def _analyze_lines(lines, max_time):
+    """Calcule, pour chaque plateau JSONL, le nombre de mouvements optimal et la taille du cluster."""
+    from cluster import ClusterAnalysis  # Import ici : inutile pour la seule lecture de la base
+
+    for line in lines:
+        if not line.strip():
+            continue
+        board = Board.from_dict(json.loads(line))
+        cluster = ClusterAnalysis(board, verbose=False)
+        if not cluster.analyze(max_time=max_time):
+            continue
+        moves = cluster.distance(board)
+        if moves:
+            yield board, moves, len(cluster.distances)
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : `python -m level_db build plateaux.jsonl`."""
+    parser = argparse.ArgumentParser(prog='python -m level_db', description="Base de niveaux Rush Hour")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Construit la base à partir d'un fichier JSONL de plateaux")
+    build.add_argument('input', help="Fichier JSONL, un plateau par ligne (format de Game.serialize_board)")
+    build.add_argument('-o', '--output', default=DEFAULT_PATH, help="Fichier de la base")
+    build.add_argument('--size', type=int, default=6, help="Largeur des plateaux")
+    build.add_argument('--height', type=int, default=None, help="Hauteur des plateaux (carrés par défaut)")
+    build.add_argument('--exit-row', type=int, default=None, help="Ligne de sortie (celle du milieu par défaut)")
+    build.add_argument('--max-time', type=float, default=30.0, help="Temps maximum d'analyse par plateau (s)")
+
+    info = subparsers.add_parser('info', help="Affiche le contenu d'une base")
+    info.add_argument('path', nargs='?', default=DEFAULT_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        height = args.height or args.size
+        exit_row = (height - 1) // 2 if args.exit_row is None else args.exit_row
+        with open(args.input) as lines:
+            count = write_database(args.output, _analyze_lines(lines, args.max_time), args.size, height, exit_row)
+        print(f"{count} niveaux écrits dans {args.output}")
+    else:
+        database = LevelDatabase(args.path)
+        try:
+            print(f"{len(database)} niveaux {database.width}x{database.height}, sortie ligne {database.exit_row}")
+            for moves in range(len(database.starts) - 1):
+                levels = database.range_for(moves)
+                if levels:
+                    print(f"  {moves} mouvements: {len(levels)} niveaux")
+        finally:
+            database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,153 +1,331 @@
 # level_generator.py
+import multiprocessing
 import random
+import threading
 import time
 from board import Board
 from vehicle import Vehicle
 from solver import Solver
+from static_analysis import find_deadlock
+from cluster import ClusterAnalysis
+
+# Poids de l'A* pondéré utilisé pour écarter rapidement les candidats
+SCREEN_EPSILON = 2.0
+
+# Paramètres des niveaux aléatoires selon la difficulté
+DIFFICULTY_SETTINGS = {
+    'easy': {'min_vehicles': 5, 'max_vehicles': 8, 'min_moves': 5, 'max_moves': 15},
+    'medium': {'min_vehicles': 7, 'max_vehicles': 10, 'min_moves': 10, 'max_moves': 25},
+    'hard': {'min_vehicles': 9, 'max_vehicles': 13, 'min_moves': 15, 'max_moves': 40},
+}
+
+
+def _generate_attempt(task):
+    """
+    Exécute une tentative de génération indépendante (dans un processus du pool).
+
+    Args:
+        task (tuple): (graine, paramètres du générateur, paramètres de la tentative)
+
+    Returns:
+        dict: Plateau sérialisé et solution, ou plateau None si la tentative a échoué
+    """
+    seed, settings, request = task
+    random.seed(seed)
+    generator = LevelGenerator(**settings)
+
+    if request['strategy'] == 'cluster':
+        board, solution = generator.generate_from_cluster(request['min_vehicles'], request['max_vehicles'],
+                                                          request['min_moves'], request['max_moves'],
+                                                          target_moves=request['target_moves'], max_attempts=1)
+    else:
+        board, solution = generator.generate_level(request['min_vehicles'], request['max_vehicles'], max_attempts=1)
+
+    if board is None or not request['min_moves'] <= len(solution) <= request['max_moves']:
+        return {'seed': seed, 'board': None}
+    return {'seed': seed, 'board': board.to_dict(), 'solution': solution}
 
 
 class LevelGenerator:
-    def __init__(self, size=6):
+    def __init__(self, size=6, cancel_event=None, progress=None, solution_cache=None,
+                 height=None, exit_side='right', exit_line=None):
         """
         Initialise le générateur de niveaux.
 
+        Les plateaux sont construits dans le repère où la sortie est à droite,
+        puis tournés vers le côté demandé (voir `Board.from_exit_frame`).
+
         Args:
-            size (int): Taille du plateau
+            size (int): Largeur du plateau
+            cancel_event (threading.Event): Interrompt la génération (et le solveur en cours)
+            progress (dict): Reçoit le numéro de tentative ('attempts') et le nombre
+                             de nœuds explorés par le solveur ('nodes_explored')
+            solution_cache (SolutionCache): Cache persistant consulté avant chaque résolution
+            height (int): Hauteur du plateau (None pour un plateau carré)
+            exit_side (str): Côté de la sortie : 'right', 'left', 'bottom' ou 'top'
+            exit_line (int): Ligne ou colonne de la sortie (celle du milieu par défaut)
         """
         self.size = size
+        self.height = height if height is not None else size
+        self.exit_side = exit_side
+
+        # Dimensions et ligne de sortie dans le repère où la sortie est à droite
+        if exit_side in ('right', 'left'):
+            self.frame_width, self.frame_height = size, self.height
+        else:
+            self.frame_width, self.frame_height = self.height, size
+        self.exit_row = (self.frame_height - 1) // 2 if exit_line is None else exit_line
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress = progress if progress is not None else {}
+        self.solution_cache = solution_cache
+
+    def _frame_board(self):
+        """Crée un plateau vide dans le repère où la sortie est à droite."""
+        return Board(self.frame_width, self.frame_height, 'right', self.exit_row)
+
+    def _orient(self, board):
+        """Tourne un plateau construit par `_frame_board` vers le côté de sortie demandé."""
+        if self.exit_side == 'right':
+            return board
+        return board.from_exit_frame(self.exit_side)
+
+    @staticmethod
+    def _vehicle_ids(count):
+        """
+        Retourne les identifiants disponibles pour `count` véhicules.
 
-    def generate_level(self, min_vehicles=5, max_vehicles=10, max_attempts=100):
+        Les lettres A-Z (sauf X, réservé à la voiture principale) suffisent jusqu'à
+        25 véhicules ; au-delà, les véhicules sont numérotés.
         """
-        Génère un niveau aléatoire avec une solution.
+        letters = [chr(i) for i in range(65, 91) if chr(i) != 'X']
+        if count <= len(letters):
+            return letters
+        return list(range(1, count + 1))
+
+    def _screen(self, board, min_moves, max_moves=None, max_time=1.0):
+        """
+        Écarte rapidement un candidat insoluble, trop facile ou trop difficile.
+
+        Une solution approchée (A* pondéré, au plus SCREEN_EPSILON fois plus longue
+        que l'optimale) suffit à conclure : si elle est plus courte que `min_moves`,
+        la solution optimale l'est aussi ; si elle dépasse `max_moves` d'un facteur
+        supérieur à la borne garantie, la solution optimale dépasse `max_moves`.
+
+        Args:
+            board (Board): Plateau candidat
+            min_moves (int): Nombre minimum de mouvements souhaité
+            max_moves (int): Nombre maximum de mouvements souhaité (None si illimité)
+            max_time (float): Temps maximum de la recherche approchée
+
+        Returns:
+            bool: True si le candidat mérite une résolution exacte
+        """
+        if self.solution_cache is not None and self.solution_cache.get(board, 'step') is not None:
+            return True
+
+        solver = Solver(board, verbose=False, cancel_event=self.cancel_event, progress=self.progress)
+        approximate = solver.solve(max_time=max_time, method='wastar', epsilon=SCREEN_EPSILON)
+        if approximate is None:
+            # Insoluble, sauf si la recherche a été interrompue : on laisse alors trancher la recherche exacte
+            return solver.stats.get('timed_out', False)
+
+        if len(approximate) < min_moves:
+            return False
+        if max_moves is not None and len(approximate) > solver.stats['suboptimality_bound'] * max_moves:
+            return False
+        return True
+
+    def _solve(self, board, max_time=10.0):
+        """
+        Résout un plateau candidat, en passant d'abord par le cache persistant.
+
+        Args:
+            board (Board): Plateau à résoudre
+            max_time (float): Temps maximum de recherche en secondes
+
+        Returns:
+            list: Solution optimale (métrique 'step'), ou None
+        """
+        if self.solution_cache is not None:
+            solution = self.solution_cache.get(board, 'step')
+            if solution is not None:
+                return solution
+
+        solver = Solver(board, cancel_event=self.cancel_event, progress=self.progress)
+        solution = solver.solve(max_time=max_time, method='bfs')
+
+        if solution is not None and self.solution_cache is not None:
+            self.solution_cache.put(board, 'step', solution)
+        return solution
+
+    def _random_layout(self, min_vehicles, max_vehicles):
+        """
+        Place la voiture principale et des véhicules au hasard, dans le repère où
+        la sortie est à droite.
 
         Args:
             min_vehicles (int): Nombre minimum de véhicules
             max_vehicles (int): Nombre maximum de véhicules
-            max_attempts (int): Nombre maximum de tentatives
 
         Returns:
-            tuple: (board, solution) ou (None, None) si aucune solution trouvée
+            Board: Plateau candidat, ou None si les véhicules n'ont pas pu être placés
         """
-        for attempt in range(max_attempts):
-            board = Board(self.size)
+        board = self._frame_board()
+        exit_row = self.exit_row
+        width, height = self.frame_width, self.frame_height
 
-            # Ajoute la voiture principale (rouge) en position fixe
-            # Varie un peu la position initiale de la voiture rouge pour plus de diversité
-            red_car_x = random.randint(0, 3)  # Position entre 0 et 3 (pour une grille 6x6)
-            main_car = Vehicle('X', red_car_x, 2, 2, 'H', True)
+        # Ajoute la voiture principale (rouge) sur la ligne de sortie
+        # Varie un peu la position initiale de la voiture rouge pour plus de diversité
+        red_car_x = random.randint(0, width - 3)  # Position entre 0 et 3 pour une grille 6x6
+        main_car = Vehicle('X', red_car_x, exit_row, 2, 'H', True)
 
-            if not board.add_vehicle(main_car):
-                continue
+        if not board.add_vehicle(main_car):
+            return None
 
-            # Variables pour contrôler la complexité du niveau
-            block_exit_directly = random.random() < 0.3  # 30% de chance d'avoir un bloqueur direct
-            exit_column = self.size - 1  # Colonne de sortie (5 pour une grille 6x6)
+        # Variables pour contrôler la complexité du niveau
+        block_exit_directly = random.random() < 0.3  # 30% de chance d'avoir un bloqueur direct
+        exit_column = width - 1  # Colonne de sortie (5 pour une grille 6x6)
 
-            # IDs disponibles pour les véhicules
-            available_ids = [chr(i) for i in range(65, 91) if chr(i) != 'X']  # A-Z sauf X
-            random.shuffle(available_ids)  # Mélange les IDs pour plus de variété
+        # IDs disponibles pour les véhicules
+        available_ids = self._vehicle_ids(max_vehicles)  # A-Z sauf X, ou des numéros
+        random.shuffle(available_ids)  # Mélange les IDs pour plus de variété
 
-            # Nombre aléatoire de véhicules à ajouter
-            num_vehicles = random.randint(min_vehicles, max_vehicles)
+        # Nombre aléatoire de véhicules à ajouter
+        num_vehicles = random.randint(min_vehicles, max_vehicles)
 
-            # Si on veut un bloqueur direct, ajoute-le d'abord
-            if block_exit_directly:
-                # Place un véhicule vertical qui bloque directement la sortie
-                blocker_id = available_ids.pop(0)
-                blocker_y = random.randint(0, 3)  # Position qui peut couvrir la ligne 2
-                blocker_length = 3 if blocker_y == 0 else random.choice([2, 3])
+        # Si on veut un bloqueur direct, ajoute-le d'abord
+        if block_exit_directly:
+            # Place un véhicule vertical qui bloque directement la sortie
+            blocker_id = available_ids.pop(0)
+            # Position qui peut couvrir la ligne de sortie
+            blocker_y = random.randint(max(0, exit_row - 2), min(exit_row, height - 2))
+            blocker_length = 3 if blocker_y == exit_row - 2 else random.choice([2, 3])
 
-                blocker = Vehicle(blocker_id, exit_column, blocker_y, blocker_length, 'V')
+            blocker = Vehicle(blocker_id, exit_column, blocker_y, blocker_length, 'V')
 
-                # Vérifie que le bloqueur couvre bien la ligne de sortie
-                blocker_coords = blocker.get_coordinates()
-                blocks_exit = (exit_column, 2) in blocker_coords
+            # Vérifie que le bloqueur couvre bien la ligne de sortie
+            blocker_coords = blocker.get_coordinates()
+            blocks_exit = (exit_column, exit_row) in blocker_coords
 
-                if blocks_exit and board.add_vehicle(blocker):
-                    num_vehicles -= 1  # On a déjà ajouté un véhicule
+            if blocks_exit and board.add_vehicle(blocker):
+                num_vehicles -= 1  # On a déjà ajouté un véhicule
 
-            # Ajoute des véhicules qui créeront un puzzle intéressant
-            vehicles_added = 0
-            placement_attempts = 0
+        # Ajoute des véhicules qui créeront un puzzle intéressant
+        vehicles_added = 0
+        placement_attempts = 0
 
-            while vehicles_added < num_vehicles and placement_attempts < 200 and available_ids:
-                placement_attempts += 1
+        while vehicles_added < num_vehicles and placement_attempts < 200 and available_ids:
+            placement_attempts += 1
 
-                vehicle_id = available_ids[0]
+            vehicle_id = available_ids[0]
 
-                # Détermine aléatoirement s'il s'agit d'une voiture ou d'un camion
-                length = random.choice([2, 3])  # 2 pour voiture, 3 pour camion
+            # Détermine aléatoirement s'il s'agit d'une voiture ou d'un camion
+            length = random.choice([2, 3])  # 2 pour voiture, 3 pour camion
 
-                # Orientation aléatoire
-                orientation = random.choice(['H', 'V'])
+            # Orientation aléatoire
+            orientation = random.choice(['H', 'V'])
 
-                # Position aléatoire en fonction de l'orientation et de la longueur
-                if orientation == 'H':
-                    x = random.randint(0, self.size - length)
-                    y = random.randint(0, self.size - 1)
+            # Position aléatoire en fonction de l'orientation et de la longueur
+            if orientation == 'H':
+                x = random.randint(0, width - length)
+                y = random.randint(0, height - 1)
 
-                    # Évite de bloquer la ligne de la voiture rouge
-                    if y == 2 and (x <= main_car.x + 1 and x + length > main_car.x):
-                        continue
+                # Évite de bloquer la ligne de la voiture rouge
+                if y == exit_row and (x <= main_car.x + 1 and x + length > main_car.x):
+                    continue
 
-                    # Pour les véhicules horizontaux, évite de les placer trop souvent à côté de X
-                    if y == 2 and x == main_car.x + 2 and random.random() < 0.7:
-                        continue  # 70% de chance de rejeter cette position
-
-                else:  # Vertical
-                    x = random.randint(0, self.size - 1)
-                    y = random.randint(0, self.size - length)
-
-                    # Évite de trop souvent bloquer le chemin de sortie directement
-                    if x == exit_column and y <= 2 and y + length > 2:
-                        # Si on a déjà un bloqueur direct ou si on a 70% de chance de rejeter
-                        if block_exit_directly or random.random() < 0.7:
-                            continue
-                        else:
-                            block_exit_directly = True  # On a maintenant un bloqueur direct
-
-                    # Favorise les véhicules qui créent des dépendances intéressantes
-                    # (ex: véhicules qui bloquent d'autres véhicules qui bloquent la voiture rouge)
-                    if 2 < x < exit_column and random.random() < 0.6:
-                        # 60% de chance de placer un véhicule vertical dans la zone de jeu
-                        pass
-                    elif x <= main_car.x and random.random() < 0.4:
-                        # 40% de chance de placer un véhicule vertical qui bloque la voiture rouge
-                        pass
-                    elif random.random() < 0.3:
-                        # Sinon, 30% de chance de rejeter pour favoriser d'autres positions
+                # Pour les véhicules horizontaux, évite de les placer trop souvent à côté de X
+                if y == exit_row and x == main_car.x + 2 and random.random() < 0.7:
+                    continue  # 70% de chance de rejeter cette position
+
+            else:  # Vertical
+                x = random.randint(0, width - 1)
+                y = random.randint(0, height - length)
+
+                # Évite de trop souvent bloquer le chemin de sortie directement
+                if x == exit_column and y <= exit_row and y + length > exit_row:
+                    # Si on a déjà un bloqueur direct ou si on a 70% de chance de rejeter
+                    if block_exit_directly or random.random() < 0.7:
                         continue
+                    else:
+                        block_exit_directly = True  # On a maintenant un bloqueur direct
+
+                # Favorise les véhicules qui créent des dépendances intéressantes
+                # (ex: véhicules qui bloquent d'autres véhicules qui bloquent la voiture rouge)
+                if 2 < x < exit_column and random.random() < 0.6:
+                    # 60% de chance de placer un véhicule vertical dans la zone de jeu
+                    pass
+                elif x <= main_car.x and random.random() < 0.4:
+                    # 40% de chance de placer un véhicule vertical qui bloque la voiture rouge
+                    pass
+                elif random.random() < 0.3:
+                    # Sinon, 30% de chance de rejeter pour favoriser d'autres positions
+                    continue
+
+            # Crée le véhicule
+            new_vehicle = Vehicle(vehicle_id, x, y, length, orientation)
+
+            # Tente d'ajouter le véhicule
+            if board.add_vehicle(new_vehicle):
+                available_ids.pop(0)  # Retire l'ID utilisé
+                vehicles_added += 1
+                placement_attempts = 0  # Réinitialise le compteur de tentatives
+
+        # Si on n'a pas pu ajouter assez de véhicules, on abandonne cette disposition
+        if vehicles_added < min_vehicles:
+            return None
+        return board
+
+    def generate_level(self, min_vehicles=5, max_vehicles=10, max_attempts=100):
+        """
+        Génère un niveau aléatoire avec une solution.
+
+        Args:
+            min_vehicles (int): Nombre minimum de véhicules
+            max_vehicles (int): Nombre maximum de véhicules
+            max_attempts (int): Nombre maximum de tentatives
 
-                # Crée le véhicule
-                new_vehicle = Vehicle(vehicle_id, x, y, length, orientation)
+        Returns:
+            tuple: (board, solution) ou (None, None) si aucune solution trouvée
+        """
+        for attempt in range(max_attempts):
+            if self.cancel_event.is_set():
+                return None, None
+            self.progress['attempts'] = self.progress.get('attempts', 0) + 1
 
-                # Tente d'ajouter le véhicule
-                if board.add_vehicle(new_vehicle):
-                    available_ids.pop(0)  # Retire l'ID utilisé
-                    vehicles_added += 1
-                    placement_attempts = 0  # Réinitialise le compteur de tentatives
+            board = self._random_layout(min_vehicles, max_vehicles)
+            if board is None:
+                continue
+
+            # Pour les niveaux faciles, on veut au moins 5 mouvements
+            # Pour les niveaux moyens, on veut au moins 10 mouvements
+            # Pour les niveaux difficiles, on veut au moins 15 mouvements
+            min_solution_length = 5
+            if min_vehicles >= 6:  # Niveau moyen
+                min_solution_length = 10
+            if min_vehicles >= 8:  # Niveau difficile
+                min_solution_length = 15
+
+            # Tourne le plateau vers le côté de sortie demandé
+            board = self._orient(board)
+
+            # Écarte sans recherche les candidats dont l'insolubilité est évidente
+            reason = find_deadlock(board)
+            if reason is not None:
+                print(f"Candidat rejeté: {reason}")
+                continue
 
-            # Si on n'a pas pu ajouter assez de véhicules, on continue
-            if vehicles_added < min_vehicles:
+            # Écarte en quelques millisecondes les candidats insolubles ou triviaux
+            if not self._screen(board, min_solution_length, 50):
                 continue
 
             # Trouve une solution
-            solver = Solver(board)
-            solution = solver.solve()
+            solution = self._solve(board)
 
             # Vérifie que la solution est suffisamment complexe
             if solution:
                 solution_length = len(solution)
 
-                # Pour les niveaux faciles, on veut au moins 5 mouvements
-                # Pour les niveaux moyens, on veut au moins 10 mouvements
-                # Pour les niveaux difficiles, on veut au moins 15 mouvements
-                min_solution_length = 5
-                if min_vehicles >= 6:  # Niveau moyen
-                    min_solution_length = 10
-                if min_vehicles >= 8:  # Niveau difficile
-                    min_solution_length = 15
-
                 # Rejette les solutions trop courtes
                 if solution_length < min_solution_length:
                     continue
@@ -162,6 +340,137 @@ class LevelGenerator:
         # Aucune solution trouvée après max_attempts
         return None, None
 
+    def generate_from_cluster(self, min_vehicles=5, max_vehicles=10, min_moves=5, max_moves=30,
+                              target_moves=None, max_attempts=10, max_states=500000):
+        """
+        Génère un niveau par recherche rétrograde dans le cluster d'une disposition aléatoire.
+
+        Plutôt que de résoudre des candidats et de rejeter ceux dont la solution
+        n'a pas la bonne longueur, on énumère une seule fois le cluster de la
+        disposition (voir `ClusterAnalysis`) et on y choisit un état à exactement
+        `target_moves` mouvements de la sortie, ou à défaut l'état le plus éloigné.
+        La difficulté du niveau obtenu est exacte et sa solution optimale est lue
+        dans la table des distances, sans nouvelle recherche.
+
+        Args:
+            min_vehicles (int): Nombre minimum de véhicules
+            max_vehicles (int): Nombre maximum de véhicules
+            min_moves (int): Nombre minimum de mouvements de la solution
+            max_moves (int): Nombre maximum de mouvements de la solution
+            target_moves (int): Distance visée (max_moves par défaut : l'état le plus
+                                difficile du cluster, dans la limite de max_moves)
+            max_attempts (int): Nombre maximum de dispositions essayées
+            max_states (int): Taille maximale d'un cluster ; au-delà, la disposition est abandonnée
+
+        Returns:
+            tuple: (board, solution) ou (None, None) si aucun cluster n'atteint min_moves
+        """
+        target = max_moves if target_moves is None else min(target_moves, max_moves)
+        best = None  # (distance, analyse) du meilleur cluster, à défaut d'atteindre la cible
+
+        for attempt in range(max_attempts):
+            if self.cancel_event.is_set():
+                return None, None
+            self.progress['attempts'] = self.progress.get('attempts', 0) + 1
+
+            board = self._random_layout(min_vehicles, max_vehicles)
+            if board is None:
+                continue
+            board = self._orient(board)
+
+            cluster = ClusterAnalysis(board)
+            if not cluster.analyze(max_states=max_states, cancel_event=self.cancel_event, progress=self.progress):
+                continue
+            if cluster.max_distance is None:
+                continue
+
+            # État à la distance visée, ou le plus éloigné de la sortie
+            distance = min(target, cluster.max_distance)
+            if distance < min_moves:
+                continue
+            if distance == target:
+                best = (distance, cluster)
+                break
+            if best is None or distance > best[0]:
+                best = (distance, cluster)
+
+        if best is None:
+            return None, None
+
+        distance, cluster = best
+        board = cluster.board_at(random.choice(cluster.states_at(distance)))
+        solution = cluster.solution_from(board)
+
+        if self.solution_cache is not None:
+            self.solution_cache.put(board, 'step', solution)
+
+        print(f"Niveau généré depuis un cluster de {len(cluster.distances)} états: "
+              f"{len(board.vehicles)} véhicules, {distance} mouvements")
+        return board, solution
+
+    def generate_parallel(self, min_vehicles=5, max_vehicles=10, min_moves=5, max_moves=30, target_moves=None,
+                          strategy='cluster', workers=None, max_attempts=100):
+        """
+        Génère un niveau en menant des tentatives indépendantes sur plusieurs processus.
+
+        Chaque tentative reçoit sa propre graine aléatoire ; dès qu'un processus
+        renvoie un niveau dont la solution est dans la plage demandée, les autres
+        tentatives sont abandonnées (le pool est arrêté).
+
+        Args:
+            min_vehicles (int): Nombre minimum de véhicules
+            max_vehicles (int): Nombre maximum de véhicules
+            min_moves (int): Nombre minimum de mouvements de la solution
+            max_moves (int): Nombre maximum de mouvements de la solution
+            target_moves (int): Distance visée par la stratégie 'cluster' (voir `generate_from_cluster`)
+            strategy (str): 'cluster' (`generate_from_cluster`) ou 'search' (`generate_level`)
+            workers (int): Nombre de processus (par défaut, un par cœur)
+            max_attempts (int): Nombre maximum de tentatives, tous processus confondus
+
+        Returns:
+            tuple: (board, solution) ou (None, None) si aucune tentative n'a abouti
+        """
+        settings = {'size': self.size, 'height': self.height, 'exit_side': self.exit_side,
+                    'exit_line': self.exit_row}
+        request = {'strategy': strategy, 'min_vehicles': min_vehicles, 'max_vehicles': max_vehicles,
+                   'min_moves': min_moves, 'max_moves': max_moves, 'target_moves': target_moves}
+        tasks = [(random.randrange(2 ** 32), settings, request) for _ in range(max_attempts)]
+
+        # Les processus sont lancés par 'spawn' et non par fork : le générateur est appelé
+        # depuis un thread (interface, réserve de niveaux), et un fork copierait les verrous
+        # tenus à cet instant par les autres threads (sortie standard, ...), au risque de bloquer
+        # un processus. La sortie du bloc `with` arrête le pool, et avec lui les tentatives en cours
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            results = pool.imap_unordered(_generate_attempt, tasks)
+            while True:
+                try:
+                    result = results.next(timeout=0.1)
+                except multiprocessing.TimeoutError:
+                    result = None
+                except StopIteration:
+                    return None, None
+
+                # Vérifiée après chaque résultat : un flux continu de tentatives hors plage
+                # ne doit pas retarder l'annulation
+                if self.cancel_event.is_set():
+                    return None, None
+                if result is None:
+                    continue
+
+                self.progress['attempts'] = self.progress.get('attempts', 0) + 1
+                # Seul un niveau dans la plage arrête le pool : les autres tentatives continuent
+                if result['board'] is not None and min_moves <= len(result['solution']) <= max_moves:
+                    break
+
+        board = Board.from_dict(result['board'])
+        solution = result['solution']
+        if self.solution_cache is not None:
+            self.solution_cache.put(board, 'step', solution)
+
+        print(f"Niveau généré en parallèle (graine {result['seed']}): "
+              f"{len(board.vehicles)} véhicules, {len(solution)} mouvements")
+        return board, solution
+
     def generate_guaranteed_solvable_level(self, min_vehicles=5, max_vehicles=10, min_moves=5, max_moves=30):
         """
         Génère un niveau garantie soluble en partant d'un état de base et en faisant des mouvements aléatoires
@@ -179,18 +488,25 @@ class LevelGenerator:
         max_tries = 5  # Nombre maximal de tentatives
 
         for attempt in range(max_tries):
+            if self.cancel_event.is_set():
+                return None, None
+            self.progress['attempts'] = self.progress.get('attempts', 0) + 1
+
             try:
                 print(f"Tentative de génération {attempt + 1}/{max_tries}")
 
                 # Crée un plateau avec la voiture rouge à une position initiale difficile
-                board = Board(self.size)
+                board = self._frame_board()
+                exit_row = self.exit_row
+                width, height = self.frame_width, self.frame_height
+
                 # Position à gauche (0 ou 1) pour garantir un challenge
                 red_car_x = random.randint(0, 1)  # Position 0 ou 1 pour plus de difficulté
-                main_car = Vehicle('X', red_car_x, 2, 2, 'H', True)
+                main_car = Vehicle('X', red_car_x, exit_row, 2, 'H', True)
                 board.add_vehicle(main_car)
 
                 # Ajoute plusieurs bloqueurs stratégiques sur le chemin vers la sortie
-                exit_x = self.size - 1
+                exit_x = width - 1
                 blocker_count = random.randint(2, 3)  # 2 ou 3 bloqueurs principaux
 
                 # Positions des bloqueurs, réparties le long du chemin
@@ -207,12 +523,12 @@ class LevelGenerator:
                     blocker_id = chr(ord('A') + i)
                     # Varie les positions verticales pour plus de complexité
                     if i % 2 == 0:
-                        # Bloqueur qui couvre la ligne 2 (chemin de la voiture rouge)
-                        by = random.choice([1, 0])
-                        bl = 3 if by == 0 else 2
+                        # Bloqueur qui couvre la ligne de sortie (chemin de la voiture rouge)
+                        by = random.choice([exit_row - 1, max(0, exit_row - 2)])
+                        bl = 3 if by == exit_row - 2 else 2
                     else:
-                        # Bloqueur qui couvre aussi la ligne 2
-                        by = random.choice([2, 1])
+                        # Bloqueur qui couvre aussi la ligne de sortie
+                        by = random.choice([exit_row, max(0, exit_row - 1)])
                         bl = 2
 
                     blocker = Vehicle(blocker_id, bx, by, bl, 'V')
@@ -229,24 +545,24 @@ class LevelGenerator:
                     # Ajoute un véhicule au-dessus ou en-dessous du bloqueur
                     if random.random() < 0.7:  # 70% de chance d'ajouter un bloqueur secondaire
                         h_id = chr(ord('D') + i * 2)
-                        h_y = random.choice([0, 4])  # En haut ou en bas du plateau
+                        h_y = random.choice([0, height - 2])  # En haut ou en bas du plateau
                         h_x = max(0, bx - random.randint(0, 1))
                         h_length = random.choice([2, 3])
 
-                        if h_x + h_length > self.size:
-                            h_x = max(0, self.size - h_length)
+                        if h_x + h_length > width:
+                            h_x = max(0, width - h_length)
 
                         horizontal_blockers.append((h_id, h_x, h_y, h_length, 'H'))
 
                     # Potentiellement un deuxième bloqueur secondaire
                     if random.random() < 0.5:  # 50% de chance d'en ajouter un deuxième
                         h_id = chr(ord('D') + i * 2 + 1)
-                        h_y = 5 - h_y if 'h_y' in locals() else random.choice([0, 4])
+                        h_y = height - 1 - h_y if 'h_y' in locals() else random.choice([0, height - 2])
                         h_x = max(0, bx - random.randint(0, 1))
                         h_length = random.choice([2, 3])
 
-                        if h_x + h_length > self.size:
-                            h_x = max(0, self.size - h_length)
+                        if h_x + h_length > width:
+                            h_x = max(0, width - h_length)
 
                         horizontal_blockers.append((h_id, h_x, h_y, h_length, 'H'))
 
@@ -262,7 +578,8 @@ class LevelGenerator:
                 # Ajoute des véhicules supplémentaires pour atteindre le nombre minimum
                 if vehicles_count < min_vehicles:
                     additional_needed = min_vehicles - vehicles_count
-                    additional_ids = [chr(ord('J') + i) for i in range(additional_needed)]
+                    additional_ids = [vehicle_id for vehicle_id in self._vehicle_ids(min_vehicles + 10)
+                                      if vehicle_id not in board.vehicles][:additional_needed]
 
                     # Positions potentielles pour des véhicules additionnels
                     for i, vehicle_id in enumerate(additional_ids):
@@ -272,18 +589,19 @@ class LevelGenerator:
                             v_length = random.choice([2, 3])
 
                             if v_orientation == 'H':
-                                v_x = random.randint(0, self.size - v_length)
-                                v_y = random.randint(0, self.size - 1)
+                                v_x = random.randint(0, width - v_length)
+                                v_y = random.randint(0, height - 1)
 
                                 # Évite de chevaucher la voiture rouge
-                                if v_y == 2 and (v_x <= main_car.x + 1 and v_x + v_length > main_car.x):
+                                if v_y == exit_row and (v_x <= main_car.x + 1 and v_x + v_length > main_car.x):
                                     continue
                             else:  # Vertical
-                                v_x = random.randint(0, self.size - 1)
-                                v_y = random.randint(0, self.size - v_length)
+                                v_x = random.randint(0, width - 1)
+                                v_y = random.randint(0, height - v_length)
 
                                 # Évite de chevaucher la voiture rouge
-                                if v_x >= main_car.x and v_x <= main_car.x + 1 and v_y <= 2 and v_y + v_length > 2:
+                                if (main_car.x <= v_x <= main_car.x + 1
+                                        and v_y <= exit_row and v_y + v_length > exit_row):
                                     continue
 
                             # Essaie d'ajouter le véhicule
@@ -297,11 +615,24 @@ class LevelGenerator:
                     print(f"Échec: seulement {len(board.vehicles)} véhicules sur {min_vehicles} requis")
                     continue
 
-                # À ce stade, nous avons un niveau avec tous les véhicules placés
+                # À ce stade, nous avons un niveau avec tous les véhicules placés,
+                # que l'on tourne vers le côté de sortie demandé
+                board = self._orient(board)
+
+                # Écarte sans recherche les niveaux dont l'insolubilité est évidente
+                reason = find_deadlock(board)
+                if reason is not None:
+                    print(f"Échec: niveau insoluble ({reason})")
+                    continue
+
+                # Écarte ensuite rapidement les candidats insolubles ou hors de la plage souhaitée
+                if not self._screen(board, min_moves, max_moves):
+                    print("Échec: niveau insoluble ou hors de la plage de mouvements")
+                    continue
+
                 # Maintenant, vérifions qu'il est soluble et obtenons la solution
-                solver = Solver(board)
                 start_time = time.time()
-                solution = solver.solve(max_time=10.0)  # Maximum 10 secondes pour trouver une solution
+                solution = self._solve(board, max_time=10.0)  # Maximum 10 secondes pour trouver une solution
                 solve_time = time.time() - start_time
 
                 if solution is None:
@@ -0,0 +1,173 @@
+# level_pool.py
+import json
+import os
+import random
+import threading
+from collections import deque
+from board import Board
+from level_generator import LevelGenerator, DIFFICULTY_SETTINGS
+
+# Répertoire des réserves de niveaux (un fichier par format de plateau)
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'pool')
+
+
+class LevelPool:
+    def __init__(self, size=6, height=None, exit_side='right', capacity=5, directory=DEFAULT_DIRECTORY,
+                 solution_cache=None):
+        """
+        Réserve de niveaux aléatoires déjà générés et résolus, par difficulté.
+
+        Un thread producteur complète la réserve en arrière-plan ; les niveaux
+        sont enregistrés sur disque pour être disponibles dès le prochain
+        lancement du jeu.
+
+        Args:
+            size (int): Largeur des plateaux
+            height (int): Hauteur des plateaux (None pour un plateau carré)
+            exit_side (str): Côté de la sortie
+            capacity (int): Nombre maximum de niveaux gardés par difficulté
+            directory (str): Répertoire des fichiers de réserve
+            solution_cache (SolutionCache): Cache persistant transmis au générateur
+        """
+        self.size = size
+        self.height = height if height is not None else size
+        self.exit_side = exit_side
+        self.capacity = capacity
+        self.solution_cache = solution_cache
+        self.path = os.path.join(directory, f"{self.size}x{self.height}_{exit_side}.json")
+
+        # Niveaux prêts par difficulté : deques de (plateau sérialisé, solution)
+        self.stocks = {difficulty: deque() for difficulty in DIFFICULTY_SETTINGS}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()  # Arrête le producteur (et sa génération en cours)
+        self.wakeup = threading.Event()  # Réveille le producteur quand un niveau est pris
+        self.thread = None
+        self.dirty = False  # True si la réserve a changé depuis le dernier enregistrement
+
+        self._load()
+
+    def matches(self, size, height, exit_side):
+        """True si la réserve contient des niveaux de ce format."""
+        return (size, height if height is not None else size, exit_side) == (self.size, self.height, self.exit_side)
+
+    def take(self, difficulty):
+        """
+        Retire un niveau de la réserve, en O(1).
+
+        Args:
+            difficulty (str): 'easy', 'medium' ou 'hard'
+
+        Returns:
+            tuple: (board, solution) ou (None, None) si la réserve est vide
+        """
+        with self.lock:
+            stock = self.stocks.get(difficulty)
+            if not stock:
+                return None, None
+            board_data, solution = stock.popleft()
+            self.dirty = True
+        self.wakeup.set()
+        return Board.from_dict(board_data), solution
+
+    def put(self, difficulty, board, solution):
+        """
+        Ajoute un niveau à la réserve, si elle n'est pas pleine.
+
+        Returns:
+            bool: True si le niveau a été ajouté
+        """
+        with self.lock:
+            stock = self.stocks[difficulty]
+            if len(stock) >= self.capacity:
+                return False
+            stock.append((board.to_dict(), [tuple(move) for move in solution]))
+            self.dirty = True
+        return True
+
+    def counts(self):
+        """Retourne le nombre de niveaux prêts par difficulté."""
+        with self.lock:
+            return {difficulty: len(stock) for difficulty, stock in self.stocks.items()}
+
+    def _load(self):
+        """Charge la réserve enregistrée, si elle existe."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for difficulty, levels in data.items():
+            if difficulty not in self.stocks:
+                continue
+            for level in levels[:self.capacity]:
+                self.stocks[difficulty].append((level['board'], [tuple(move) for move in level['solution']]))
+
+    def save(self):
+        """Enregistre la réserve sur disque (écriture atomique)."""
+        with self.lock:
+            data = {
+                difficulty: [{'board': board_data, 'solution': solution} for board_data, solution in stock]
+                for difficulty, stock in self.stocks.items()
+            }
+            self.dirty = False
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary = self.path + '.tmp'
+            with open(temporary, 'w') as f:
+                json.dump(data, f)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            print(f"Impossible d'enregistrer la réserve de niveaux: {e}")
+
+    def _next_difficulty(self):
+        """Retourne la difficulté la moins fournie, ou None si la réserve est pleine."""
+        counts = self.counts()
+        difficulty = min(counts, key=counts.get)
+        return difficulty if counts[difficulty] < self.capacity else None
+
+    def _produce(self):
+        """Boucle du thread producteur : complète la réserve jusqu'à l'arrêt."""
+        generator = LevelGenerator(self.size, cancel_event=self.stop_event, solution_cache=self.solution_cache,
+                                   height=self.height, exit_side=self.exit_side)
+
+        while not self.stop_event.is_set():
+            if self.dirty:
+                self.save()
+
+            difficulty = self._next_difficulty()
+            if difficulty is None:
+                # Réserve pleine : on attend qu'un niveau soit pris
+                self.wakeup.wait()
+                self.wakeup.clear()
+                continue
+
+            settings = DIFFICULTY_SETTINGS[difficulty]
+            try:
+                board, solution = generator.generate_from_cluster(
+                    settings['min_vehicles'], settings['max_vehicles'], settings['min_moves'], settings['max_moves'],
+                    target_moves=random.randint(settings['min_moves'], settings['max_moves']))
+            except Exception as e:
+                print(f"Erreur du producteur de niveaux: {e}")
+                continue
+
+            if board is not None:
+                self.put(difficulty, board, solution)
+
+    def start(self):
+        """Démarre le thread producteur."""
+        if self.thread is None:
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._produce, daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le producteur et enregistre la réserve."""
+        self.stop_event.set()
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+        self.save()
@@ -1,17 +1,99 @@
 # levels.py
+import os
+from struct import error as struct_error
+from board import Board
 from vehicle import Vehicle
+from level_db import LevelDatabase, DEFAULT_PATH
+
+# Nombre de niveaux prédéfinis ; les niveaux suivants sont lus dans la base de niveaux (level_db.py)
+BUILTIN_LEVELS = 3
+
+_database = None
+
+
+def get_database():
+    """
+    Retourne la base de niveaux par défaut, ouverte au premier appel.
+
+    Returns:
+        LevelDatabase: Base projetée en mémoire, ou None si elle est absente ou illisible
+    """
+    global _database
+    if _database is None and os.path.exists(DEFAULT_PATH):
+        try:
+            _database = LevelDatabase(DEFAULT_PATH)
+        except (OSError, ValueError, struct_error) as e:
+            print(f"Base de niveaux indisponible: {e}")
+    return _database
+
+
+def level_count():
+    """Retourne le nombre de niveaux disponibles (prédéfinis et base de niveaux)."""
+    database = get_database()
+    return BUILTIN_LEVELS + (len(database) if database is not None else 0)
+
+
+def random_level_number(min_moves, max_moves=None):
+    """
+    Tire au hasard un niveau de la base dont la solution compte entre `min_moves` et `max_moves` mouvements.
+
+    Returns:
+        int: Numéro du niveau, ou None si aucun niveau ne correspond
+    """
+    database = get_database()
+    if database is None:
+        return None
+    index = database.random_index(min_moves, max_moves)
+    return None if index is None else BUILTIN_LEVELS + 1 + index
+
+
+def _database_board(level_number):
+    """Retourne le plateau d'un niveau de la base, ou None s'il n'y figure pas."""
+    database = get_database()
+    index = level_number - BUILTIN_LEVELS - 1
+    if database is None or not 0 <= index < len(database):
+        return None
+    return database.board(index)
+
+
+def get_board(level_number):
+    """
+    Retourne le plateau d'un niveau.
+
+    Les niveaux 1 à BUILTIN_LEVELS sont prédéfinis ; les suivants sont lus dans
+    la base de niveaux, sans la charger entièrement en mémoire.
+
+    Args:
+        level_number (int): Numéro du niveau
+
+    Returns:
+        Board: Plateau du niveau
+    """
+    board = _database_board(level_number)
+    if board is not None:
+        return board
+
+    board = Board(6)
+    for vehicle in get_level(level_number):
+        board.add_vehicle(vehicle)
+    return board
 
 
 def get_level(level_number):
     """
-    Retourne une liste de véhicules pour un niveau prédéfini.
+    Retourne une liste de véhicules pour un niveau.
 
     Args:
-        level_number (int): Numéro du niveau (1, 2 ou 3)
+        level_number (int): Numéro du niveau (1, 2 ou 3 pour les niveaux prédéfinis,
+                            au-delà pour ceux de la base de niveaux)
 
     Returns:
         list: Liste de véhicules
     """
+    board = _database_board(level_number)
+    if board is not None:
+        return list(board.vehicles.values())
+
     if level_number == 1:
         # Niveau 1 - Facile (peu de véhicules, solution simple)
         return [
@@ -1,4 +1,5 @@
 # main.py
+import argparse
 import tkinter as tk
 import random
 from game import Game
@@ -13,7 +14,15 @@ def setup_appearance():
         pass
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rush Hour")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Nombre de processus de génération des niveaux aléatoires "
+                             "(1 : séquentielle ; par défaut, un par cœur sans la réserve de niveaux)")
+    parser.add_argument('--no-pool', action='store_true',
+                        help="Désactive la réserve de niveaux complétée en arrière-plan")
+    args = parser.parse_args(argv)
+
     # Crée la fenêtre principale
     root = tk.Tk()
     setup_appearance()
@@ -29,9 +38,13 @@ def main():
         pass
 
     # Initialise le jeu
-    game = Game()
+    game = Game(generation_workers=args.workers)
+
+    # Démarre la réserve de niveaux aléatoires (complétée en arrière-plan, conservée entre les parties)
+    if not args.no_pool:
+        game.start_level_pool()
 
-    # Génère un niveau aléatoire au démarrage
+    # Génère un niveau aléatoire au démarrage (tiré de la réserve si possible)
     difficulty = random.choice(['medium', 'hard'])  # Préfère les niveaux plus difficiles
     if not game.generate_random_level(difficulty):
         # Si la génération échoue, charge un niveau prédéfini
@@ -53,6 +66,9 @@ def main():
     # Lance la boucle principale
     root.mainloop()
 
+    # Enregistre la réserve de niveaux pour le prochain lancement
+    game.stop_level_pool()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,301 @@
+# parallel_bfs.py
+import multiprocessing
+import os
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from bitboard import BitboardEngine
+from board import Board
+
+# Constante multiplicative (nombre d'or sur 64 bits) qui mélange les bits des clés avant partition
+_MIX = 0x9E3779B97F4A7C15
+
+# Nombre d'octets du mouvement associé à chaque clé dans les segments partagés
+MOVE_BYTES = 4
+
+
+def owner(key, workers):
+    """
+    Retourne le processus responsable d'un état.
+
+    Args:
+        key (int): Clé d'état du BitboardEngine
+        workers (int): Nombre de processus
+
+    Returns:
+        int: Indice du processus qui mémorise cet état
+    """
+    return ((key * _MIX) >> 29) % workers
+
+
+class RecordFormat:
+    def __init__(self, engine):
+        """
+        Format des enregistrements échangés entre processus.
+
+        Un enregistrement est un entier de taille fixe qui regroupe l'occupation,
+        la clé de l'état et le mouvement qui y mène : le destinataire retrouve
+        l'état complet sans le reconstruire à partir des positions.
+
+        Args:
+            engine (BitboardEngine): Moteur du plateau résolu
+        """
+        self.key_bits = 8 * max(1, (len(engine.ids) * engine.bits + 7) // 8)
+        self.move_bits = 8 * MOVE_BYTES
+        occupancy_bits = 8 * ((engine.width * engine.height + 7) // 8)
+        self.size = (occupancy_bits + self.key_bits + self.move_bits) // 8
+        self.key_mask = (1 << self.key_bits) - 1
+        self.move_mask = (1 << self.move_bits) - 1
+
+    def pack(self, state, move):
+        occupancy, key = state
+        return (((occupancy << self.key_bits) | key) << self.move_bits | move).to_bytes(self.size, 'big')
+
+    def unpack(self, data, start):
+        value = int.from_bytes(data[start:start + self.size], 'big')
+        move = value & self.move_mask
+        value >>= self.move_bits
+        return (value >> self.key_bits, value & self.key_mask), move
+
+
+def _write_outbox(outgoing, record_format):
+    """
+    Écrit dans un segment de mémoire partagée les états à transmettre à chaque processus.
+
+    Le segment commence par un en-tête (position, nombre) par destinataire, suivi
+    des enregistrements (voir `RecordFormat`) regroupés par destinataire.
+    """
+    workers = len(outgoing)
+    header = struct.Struct(f'<{2 * workers}Q')
+
+    parts = []
+    positions = []
+    offset = header.size
+    for states in outgoing:
+        positions += [offset, len(states)]
+        parts.append(b''.join(record_format.pack(state, move) for state, move in states.values()))
+        offset += len(states) * record_format.size
+
+    segment = shared_memory.SharedMemory(create=True, size=offset)
+    segment.buf[:header.size] = header.pack(*positions)
+    offset = header.size
+    for part in parts:
+        segment.buf[offset:offset + len(part)] = part
+        offset += len(part)
+    return segment
+
+
+def _read_inbox(buffer, index, workers, record_format):
+    """Lit, dans le segment d'un autre processus, les états destinés au processus `index`."""
+    header = struct.Struct(f'<{2 * workers}Q')
+    positions = header.unpack_from(buffer, 0)
+    offset, count = positions[2 * index], positions[2 * index + 1]
+    data = bytes(buffer[offset:offset + count * record_format.size])
+    for start in range(0, len(data), record_format.size):
+        yield record_format.unpack(data, start)
+
+
+def _worker(connection, board_data, metric, index, workers):
+    """
+    Boucle d'un processus de la recherche parallèle.
+
+    Le processus mémorise les états dont il est responsable (voir `owner`) et le
+    mouvement qui y mène, et développe sa part de la frontière sur ordre du
+    processus principal. Les commandes reçues sont :
+        - ('expand',) : développe la frontière et publie les successeurs
+        - ('receive', noms) : lit dans les segments de tous les processus les
+          successeurs qui lui reviennent et forme la frontière suivante
+        - ('parent', clé) : renvoie le mouvement qui mène à un état
+        - ('stop',) : termine le processus
+    """
+    engine = BitboardEngine(Board.from_dict(board_data))
+    record_format = RecordFormat(engine)
+
+    came_from = {}
+    frontier = []
+    start_state = engine.initial_state()
+    if owner(start_state[1], workers) == index:
+        came_from[start_state[1]] = None
+        frontier.append(start_state)
+
+    outbox = None
+    try:
+        while True:
+            message = connection.recv()
+            command = message[0]
+
+            if command == 'expand':
+                # Tous les processus ont lu le segment précédent : il peut être libéré
+                if outbox is not None:
+                    outbox.close()
+                    outbox.unlink()
+
+                # Successeurs dédoublonnés par destinataire : {clé: (état, mouvement)}
+                outgoing = [{} for _ in range(workers)]
+                for state in frontier:
+                    for move, neighbor in engine.neighbors(state, metric):
+                        neighbor_key = neighbor[1]
+                        outgoing[owner(neighbor_key, workers)].setdefault(neighbor_key, (neighbor, move))
+                outbox = _write_outbox(outgoing, record_format)
+                connection.send((outbox.name, len(frontier)))
+
+            elif command == 'receive':
+                frontier = []
+                goal_key = None
+                for name in message[1]:
+                    segment = shared_memory.SharedMemory(name=name)
+                    try:
+                        for state, move in _read_inbox(segment.buf, index, workers, record_format):
+                            key = state[1]
+                            if key in came_from:
+                                continue
+                            came_from[key] = move
+                            frontier.append(state)
+                            if goal_key is None and engine.is_goal(state):
+                                goal_key = key
+                    finally:
+                        segment.close()
+                connection.send((len(frontier), goal_key))
+
+            elif command == 'parent':
+                connection.send(came_from.get(message[1]))
+
+            elif command == 'stop':
+                return
+    finally:
+        if outbox is not None:
+            outbox.close()
+            outbox.unlink()
+        connection.close()
+
+
+class ParallelBFS:
+    def __init__(self, board, metric='step', workers=None):
+        """
+        Parcours en largeur synchronisé par couche, réparti sur plusieurs processus.
+
+        Les états sont partitionnés par hachage de leur clé : chaque processus
+        mémorise les états qui lui reviennent et développe sa part de la frontière.
+        Les successeurs sont échangés sous forme d'enregistrements compacts dans des
+        segments `multiprocessing.shared_memory` ; seuls des noms de segments et
+        des compteurs transitent par les tubes, jamais de plateaux.
+
+        Args:
+            board (Board): Plateau de départ
+            metric (str): 'step' ou 'slide'
+            workers (int): Nombre de processus (par défaut, un par cœur)
+        """
+        self.board = board
+        self.metric = metric
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = BitboardEngine(board)
+
+        self.layer_sizes = []
+        self.nodes_explored = 0
+        self.complete = False  # True si tout l'espace accessible a été parcouru
+        self.processes = []
+        self.connections = []
+
+    def start(self):
+        """Lance les processus de travail."""
+        # Le suivi des segments partagés doit être commun à tous les processus : lancé
+        # après eux, chaque processus aurait le sien, qui supprimerait à sa sortie les
+        # segments des autres qu'il a ouverts
+        resource_tracker.ensure_running()
+
+        # Les processus sont lancés par 'spawn' et non par fork : la recherche peut être
+        # lancée depuis un thread (interface, réserve de niveaux), et un fork copierait les
+        # verrous tenus à cet instant par les autres threads, au risque de bloquer un processus
+        context = multiprocessing.get_context('spawn')
+        board_data = self.board.to_dict()
+        for index in range(self.workers):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(target=_worker, daemon=True,
+                                      args=(child_end, board_data, self.metric, index, self.workers))
+            process.start()
+            child_end.close()
+            self.processes.append(process)
+            self.connections.append(parent_end)
+
+    def _broadcast(self, message):
+        """Envoie une commande à tous les processus et renvoie leurs réponses."""
+        for connection in self.connections:
+            connection.send(message)
+        return [connection.recv() for connection in self.connections]
+
+    def run(self, should_stop):
+        """
+        Développe les couches jusqu'à la sortie, l'épuisement de l'espace d'états ou l'interruption.
+
+        L'interruption n'est vérifiée qu'entre deux couches.
+
+        Args:
+            should_stop (callable): should_stop(nodes_explored) renvoie True pour interrompre
+
+        Returns:
+            int: Clé de l'état résolu le plus proche, ou None (insoluble si `complete`, interrompu sinon)
+        """
+        start_key = self.engine.initial_state()[1]
+        if self.engine.is_goal((0, start_key)):
+            return start_key
+
+        self.layer_sizes = [1]
+        while not should_stop(self.nodes_explored):
+            replies = self._broadcast(('expand',))
+            self.nodes_explored += sum(expanded for _, expanded in replies)
+
+            replies = self._broadcast(('receive', [name for name, _ in replies]))
+            count = sum(size for size, _ in replies)
+            if count == 0:
+                self.complete = True
+                return None
+            self.layer_sizes.append(count)
+
+            for _, goal_key in replies:
+                if goal_key is not None:
+                    return goal_key
+        return None
+
+    def reconstruct(self, goal_key):
+        """
+        Retrouve les mouvements menant à un état, en interrogeant le processus
+        responsable de chaque état du chemin.
+
+        Args:
+            goal_key (int): Clé de l'état atteint
+
+        Returns:
+            list: Mouvements codés (voir `BitboardEngine.neighbors`), du départ vers l'état
+        """
+        engine = self.engine
+        moves = []
+        key = goal_key
+        while True:
+            connection = self.connections[owner(key, self.workers)]
+            connection.send(('parent', key))
+            move = connection.recv()
+            if move is None:
+                break
+            moves.append(move)
+
+            # Le mouvement inverse (même véhicule, même distance, sens opposé) ramène au parent
+            state = engine.state_from_positions(engine.positions(key))
+            key = next(neighbor[1] for code, neighbor in engine.neighbors(state, self.metric)
+                       if code == move ^ 1)
+        moves.reverse()
+        return moves
+
+    def close(self):
+        """Arrête les processus de travail."""
+        for connection in self.connections:
+            try:
+                connection.send(('stop',))
+            except (OSError, BrokenPipeError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self.connections:
+            connection.close()
+        self.processes = []
+        self.connections = []
@@ -0,0 +1,215 @@
+# pattern_db.py
+import json
+import os
+from itertools import product
+
+# Répertoire où les bases de motifs précalculées sont enregistrées
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Longueurs de véhicules précalculées (voitures et camions)
+VEHICLE_LENGTHS = (2, 3)
+
+_databases = {}
+
+
+def _column_layouts(size, lengths):
+    """
+    Énumère les positions possibles d'une suite de véhicules verticaux dans une colonne.
+
+    Les véhicules d'une même colonne ne peuvent pas se croiser : leur ordre est
+    fixe, seules leurs positions varient.
+
+    Args:
+        size (int): Hauteur de la colonne
+        lengths (tuple): Longueur de chaque véhicule, de haut en bas
+
+    Returns:
+        list: Tuples de positions (ligne du haut de chaque véhicule)
+    """
+    layouts = []
+
+    def place(index, start, positions):
+        if index == len(lengths):
+            layouts.append(tuple(positions))
+            return
+        remaining = sum(lengths[index + 1:])
+        for position in range(start, size - remaining - lengths[index] + 1):
+            positions.append(position)
+            place(index + 1, position + lengths[index], positions)
+            positions.pop()
+
+    place(0, 0, [])
+    return layouts
+
+
+def _column_neighbors(size, lengths, positions, metric):
+    """Génère les dispositions accessibles en un mouvement d'un véhicule de la colonne."""
+    for index, position in enumerate(positions):
+        low = positions[index - 1] + lengths[index - 1] if index > 0 else 0
+        high = positions[index + 1] - lengths[index] if index + 1 < len(positions) else size - lengths[index]
+        if metric == 'step':
+            targets = [p for p in (position - 1, position + 1) if low <= p <= high]
+        else:
+            targets = [p for p in range(low, high + 1) if p != position]
+        for target in targets:
+            yield positions[:index] + (target,) + positions[index + 1:]
+
+
+class ColumnPatternDatabase:
+    def __init__(self, size=6):
+        """
+        Base de motifs sur les colonnes qui croisent la ligne de sortie.
+
+        Pour une colonne, le motif est la position des véhicules verticaux qui s'y
+        trouvent. La base donne, pour chaque motif, le nombre minimal de mouvements
+        de ces seuls véhicules pour libérer la case de la ligne de sortie (les
+        véhicules horizontaux sont ignorés). Chaque véhicule vertical appartenant à
+        une seule colonne, les valeurs de plusieurs colonnes s'additionnent sans
+        surestimer : c'est une base de motifs additive.
+
+        Args:
+            size (int): Taille du plateau
+        """
+        self.size = size
+        self.tables = {}  # {(métrique, ligne de sortie, longueurs): {positions: coût}}
+
+    def table(self, metric, row, lengths):
+        """
+        Retourne la table d'un motif, calculée au premier appel.
+
+        Args:
+            metric (str): 'step' ou 'slide'
+            row (int): Ligne à libérer
+            lengths (tuple): Longueur de chaque véhicule vertical, de haut en bas
+
+        Returns:
+            dict: {positions: nombre minimal de mouvements} (inf si la ligne ne peut pas être libérée)
+        """
+        key = (metric, row, tuple(lengths))
+        table = self.tables.get(key)
+        if table is None:
+            table = self._compute(metric, row, tuple(lengths))
+            self.tables[key] = table
+        return table
+
+    def _compute(self, metric, row, lengths):
+        """Calcule une table par un parcours en largeur depuis toutes les dispositions qui libèrent la ligne."""
+        layouts = _column_layouts(self.size, lengths)
+        costs = dict.fromkeys(layouts, float('inf'))
+
+        frontier = []
+        for positions in layouts:
+            if all(not p <= row < p + length for p, length in zip(positions, lengths)):
+                costs[positions] = 0
+                frontier.append(positions)
+
+        # Les mouvements étant réversibles, la distance depuis les buts est la distance vers les buts
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for positions in frontier:
+                for neighbor in _column_neighbors(self.size, lengths, positions, metric):
+                    if costs[neighbor] == float('inf'):
+                        costs[neighbor] = depth
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        return costs
+
+    def precompute(self):
+        """Calcule les tables de tous les motifs de voitures et camions, pour toutes les lignes."""
+        for count in range(1, self.size // min(VEHICLE_LENGTHS) + 1):
+            for lengths in product(VEHICLE_LENGTHS, repeat=count):
+                if sum(lengths) > self.size:
+                    continue
+                for row in range(self.size):
+                    for metric in ('step', 'slide'):
+                        self.table(metric, row, lengths)
+
+    def save(self, path):
+        """
+        Enregistre les tables au format JSON.
+
+        Args:
+            path (str): Fichier de destination
+        """
+        entries = []
+        for (metric, row, lengths), table in self.tables.items():
+            entries.append({
+                'metric': metric,
+                'row': row,
+                'lengths': list(lengths),
+                'costs': [[list(positions), cost if cost != float('inf') else None]
+                          for positions, cost in table.items()],
+            })
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({'size': self.size, 'tables': entries}, f)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Charge des tables enregistrées par `save`.
+
+        Args:
+            path (str): Fichier JSON
+
+        Returns:
+            ColumnPatternDatabase: Base chargée
+        """
+        with open(path) as f:
+            data = json.load(f)
+
+        database = cls(data['size'])
+        for entry in data['tables']:
+            key = (entry['metric'], entry['row'], tuple(entry['lengths']))
+            database.tables[key] = {
+                tuple(positions): cost if cost is not None else float('inf')
+                for positions, cost in entry['costs']
+            }
+        return database
+
+
+def pattern_database(size=6, directory=DEFAULT_DIRECTORY):
+    """
+    Retourne la base de motifs d'une taille de plateau.
+
+    La base est lue sur disque si elle existe, sinon précalculée puis enregistrée
+    pour les lancements suivants.
+
+    Args:
+        size (int): Taille du plateau
+        directory (str): Répertoire des bases enregistrées
+
+    Returns:
+        ColumnPatternDatabase: Base partagée
+    """
+    database = _databases.get(size)
+    if database is not None:
+        return database
+
+    path = os.path.join(directory, f'pattern_db_{size}.json')
+    try:
+        database = ColumnPatternDatabase.load(path)
+    except (OSError, ValueError, KeyError):
+        database = ColumnPatternDatabase(size)
+        database.precompute()
+        try:
+            database.save(path)
+        except OSError as e:
+            print(f"Impossible d'enregistrer la base de motifs: {e}")
+
+    _databases[size] = database
+    return database
+
+
+if __name__ == '__main__':
+    # Précalcul explicite : python pattern_db.py
+    db = ColumnPatternDatabase(6)
+    db.precompute()
+    db.save(os.path.join(DEFAULT_DIRECTORY, 'pattern_db_6.json'))
+    print(f"{len(db.tables)} tables enregistrées dans {DEFAULT_DIRECTORY}")
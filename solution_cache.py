@@ -0,0 +1,175 @@
+# solution_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Emplacement par défaut de la base, à côté du code du jeu
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'solutions.sqlite')
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def canonical_form(board):
+    """
+    Calcule l'encodage canonique d'un plateau.
+
+    Les véhicules sont ordonnés par position (ligne puis colonne) et décrits sans
+    leur identifiant : deux plateaux identiques à un renommage près partagent donc
+    le même encodage.
+
+    Args:
+        board (Board): Plateau à encoder
+
+    Returns:
+        tuple: (encodage canonique, tuple des identifiants dans l'ordre canonique)
+    """
+    vehicles = sorted(board.vehicles.values(), key=lambda v: (v.y, v.x))
+    tokens = [
+        f"{v.orientation}{v.length}{'*' if v.is_main else ''}@{v.x},{v.y}"
+        for v in vehicles
+    ]
+    exit_x, exit_y = board.exit_pos
+    # Les plateaux carrés à sortie à droite gardent l'encodage d'origine
+    dimensions = str(board.width) if board.width == board.height else f"{board.width}x{board.height}"
+    if board.exit_side != 'right':
+        dimensions += board.exit_side[0]
+    key = f"{dimensions}:{exit_x},{exit_y}|" + ';'.join(tokens)
+    return key, tuple(v.id for v in vehicles)
+
+
+class SolutionCache:
+    def __init__(self, path=DEFAULT_PATH, max_entries=20000):
+        """
+        Ouvre (ou crée) le cache persistant des solutions.
+
+        Les solutions sont stockées dans une base SQLite, indexées par l'encodage
+        canonique du plateau et la métrique. Le nombre d'entrées est borné : au-delà
+        de `max_entries`, les solutions les moins récemment utilisées sont supprimées.
+
+        Args:
+            path (str): Chemin du fichier SQLite
+            max_entries (int): Nombre maximum de solutions conservées
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()  # La connexion est partagée entre le thread Tk et les calculs
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                " board TEXT NOT NULL,"
+                " metric TEXT NOT NULL,"
+                " solution TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (board, metric))"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)"
+            )
+
+    def get(self, board, metric='step'):
+        """
+        Cherche la solution d'un plateau dans le cache.
+
+        Args:
+            board (Board): Plateau de départ
+            metric (str): 'step' ou 'slide'
+
+        Returns:
+            list: Solution exprimée avec les identifiants de `board`, ou None si absente
+        """
+        key, ids = canonical_form(board)
+        try:
+            with self.lock, self.connection:
+                row = self.connection.execute(
+                    "SELECT solution FROM solutions WHERE board = ? AND metric = ?", (key, metric)
+                ).fetchone()
+                if row is None:
+                    return None
+                self.connection.execute(
+                    "UPDATE solutions SET last_used = ? WHERE board = ? AND metric = ?",
+                    (time.time(), key, metric)
+                )
+        except sqlite3.Error as e:
+            print(f"Erreur de lecture du cache des solutions: {e}")
+            return None
+
+        # Retraduit les indices canoniques en identifiants de véhicules
+        return [(ids[move[0]], *move[1:]) for move in json.loads(row[0])]
+
+    def put(self, board, metric, solution):
+        """
+        Enregistre la solution d'un plateau.
+
+        Args:
+            board (Board): Plateau de départ
+            metric (str): 'step' ou 'slide'
+            solution (list): Liste de mouvements ; None est ignoré
+        """
+        if solution is None:
+            return
+
+        key, ids = canonical_form(board)
+        index = {vid: i for i, vid in enumerate(ids)}
+        encoded = json.dumps([[index[move[0]], *move[1:]] for move in solution])
+
+        try:
+            with self.lock, self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO solutions (board, metric, solution, last_used) VALUES (?, ?, ?, ?)",
+                    (key, metric, encoded, time.time())
+                )
+
+                # Éviction des entrées les moins récemment utilisées
+                count = self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+                if count > self.max_entries:
+                    self.connection.execute(
+                        "DELETE FROM solutions WHERE rowid IN "
+                        "(SELECT rowid FROM solutions ORDER BY last_used LIMIT ?)",
+                        (count - self.max_entries,)
+                    )
+        except sqlite3.Error as e:
+            print(f"Erreur d'écriture dans le cache des solutions: {e}")
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def clear(self):
+        """Supprime toutes les solutions du cache."""
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM solutions")
+
+    def close(self):
+        """Ferme la base."""
+        with self.lock:
+            self.connection.close()
+
+
+def default_cache():
+    """
+    Retourne le cache partagé du jeu, ouvert au premier appel.
+
+    Returns:
+        SolutionCache: Cache persistant, ou None si la base ne peut pas être ouverte
+                       (le jeu fonctionne alors sans cache sur disque)
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            try:
+                _default_cache = SolutionCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Cache des solutions indisponible: {e}")
+                return None
+        return _default_cache
@@ -1,16 +1,85 @@
+import argparse
 import heapq
+import json
+import multiprocessing
+import sys
+import threading
 import time
+import tracemalloc
+from collections import OrderedDict
+from bitboard import BitboardEngine
+from board import Board
+from external_bfs import ExternalBFS
+from parallel_bfs import ParallelBFS
+from static_analysis import find_deadlock
+
+# Heuristiques disponibles : nom -> méthode du BitboardEngine
+# Seules les heuristiques admissibles garantissent une solution optimale avec IDA*
+HEURISTICS = {
+    'legacy': 'heuristic',  # Formule historique pondérée, non admissible
+    'blockers': 'lower_bound',  # Distance + véhicules bloquant la sortie, admissible
+    'blockers2': 'obstruction_bound',  # Ajoute les véhicules qui gênent les bloqueurs, admissible
+    'pdb': 'pattern_bound',  # Base de motifs additive sur les colonnes de la ligne de sortie, admissible
+}
+
+# Heuristiques qui ne surestiment jamais la distance à la sortie
+ADMISSIBLE_HEURISTICS = {'blockers', 'blockers2', 'pdb'}
+
+# Taille maximum de la table de transposition d'IDA* quand elle est dimensionnée
+# d'après le plateau (voir `Solver._default_tt_size`)
+MAX_TT_SIZE = 1000000
+
+
+def expand_moves(solution):
+    """
+    Convertit une solution en une suite de mouvements d'une seule case.
+
+    Args:
+        solution (list): Tuples (vehicle_id, direction) ou (vehicle_id, direction, distance)
+
+    Returns:
+        list: Liste de tuples (vehicle_id, direction)
+    """
+    steps = []
+    for move in solution:
+        steps.extend([(move[0], move[1])] * move_distance(move))
+    return steps
+
+
+def move_distance(move):
+    """Retourne le nombre de cases parcourues par un mouvement (1 en métrique 'step')."""
+    return move[2] if len(move) > 2 else 1
 
 
 class Solver:
-    def __init__(self, board):
+    def __init__(self, board, metric='step', verbose=True, cancel_event=None, progress=None):
         """
         Initialise le solveur avec la grille initial.
 
         Args:
             board (Board): État initial de la grille
+            metric (str): 'step' pour compter chaque case parcourue comme un mouvement,
+                'slide' pour compter un glissement de plusieurs cases comme un seul
+            verbose (bool): False pour ne pas afficher le bilan de chaque recherche
+            cancel_event (threading.Event): Événement qui interrompt la recherche dès qu'il est levé
+            progress (dict): Dictionnaire où la recherche publie régulièrement
+                             'nodes_explored' (lu par l'interface depuis un autre thread)
         """
+        if metric not in ('step', 'slide'):
+            raise ValueError(f"Métrique inconnue: {metric}")
+
         self.initial_board = board
+        self.metric = metric
+        self.verbose = verbose
+        self.cancel_event = cancel_event or threading.Event()
+        self.progress = progress
+
+        # Statistiques de la dernière recherche (méthode, nœuds, temps, ...)
+        self.stats = {}
+
+    def cancel(self):
+        """Demande l'arrêt de la recherche en cours (utilisable depuis un autre thread)."""
+        self.cancel_event.set()
 
     def heuristic(self, board):
         """
@@ -23,221 +92,847 @@ class Solver:
         Returns:
             float: Valeur heuristique
         """
-        # Trouve la voiture principale
-        main_car = None
-        for vehicle in board.vehicles.values():
-            if vehicle.is_main:
-                main_car = vehicle
-                break
-
-        if not main_car:
-            return float('inf')  # Pas de voiture principale trouvée
-
-        # 1. Distance directe à la sortie
-        exit_x = board.exit_pos[0]
-        distance_to_exit = exit_x - (main_car.x + main_car.length - 1)
-
-        # 2. Nombre de véhicules bloquant directement le chemin
-        direct_blockers = 0
-        blockers_ids = []
-
-        for x in range(main_car.x + main_car.length, exit_x + 1):
-            vehicle = board.get_vehicle_at(x, main_car.y)
-            if vehicle and vehicle.id not in blockers_ids:
-                direct_blockers += 1
-                blockers_ids.append(vehicle.id)
+        engine = BitboardEngine(board)
+        return engine.heuristic(engine.initial_state(), self.metric)
 
-        # 3. Pénalité pour les véhicules "bloquant les bloqueurs"
-        secondary_blockers = 0
-
-        for blocker_id in blockers_ids:
-            blocker = board.vehicles[blocker_id]
-            if blocker.orientation == 'V':  # Véhicule vertical
-                # Vérifie les blocages vers le haut
-                for y in range(blocker.y - 1, -1, -1):
-                    if not board.is_cell_empty(blocker.x, y):
-                        secondary_blockers += 1
-
-                # Vérifie les blocages vers le bas
-                for y in range(blocker.y + blocker.length, board.size):
-                    if not board.is_cell_empty(blocker.x, y):
-                        secondary_blockers += 1
+    def solve(self, max_time=10.0, method='astar', track_memory=False, heuristic=None, tt_size=None,
+              epsilon=2.0, beam_width=1000, work_dir=None, buffer_size=500000, workers=None):
+        """
+        Résout le puzzle.
+
+        Sept méthodes sont disponibles :
+            - 'astar' : A* guidé par `heuristic`, rapide mais sans garantie d'optimalité
+            - 'bfs' : parcours en largeur, renvoie toujours une solution la plus courte
+            - 'ida' : A* itératif en profondeur ; la mémoire utilisée est linéaire en
+              la longueur de la solution (plus une table de transposition bornée).
+              Chaque itération redéveloppe les états des précédentes : bien plus lent
+              que 'bfs' (plus de dix fois sur un plateau 8x8), à réserver aux cas où
+              la mémoire manque
+            - 'wastar' : A* pondéré (f = g + epsilon * h) ; avec une heuristique
+              admissible, la solution fait au plus epsilon fois la longueur optimale
+            - 'beam' : recherche en faisceau, ne garde que les `beam_width` meilleurs
+              états de chaque couche ; très rapide mais incomplète et sans borne
+            - 'external' : parcours en largeur dont les couches sont stockées sur
+              disque (voir external_bfs.py) ; la mémoire reste bornée par
+              `buffer_size` et un parcours interrompu reprend où il s'était arrêté
+            - 'parallel' : parcours en largeur réparti sur `workers` processus
+              (voir parallel_bfs.py), pour les grands espaces d'états
+
+        La borne garantie sur la longueur de la solution (rapport à l'optimum) est
+        enregistrée dans `self.stats['suboptimality_bound']` (None si aucune garantie).
+
+        Avant toute recherche, une analyse statique (`static_analysis.find_deadlock`)
+        écarte les plateaux manifestement insolubles ; la raison est alors
+        enregistrée dans `self.stats['unsolvable_reason']`.
+
+        La recherche travaille sur un `BitboardEngine` : un état est un masque
+        d'occupation et une clé entière exacte regroupant les positions, et les mouvements sont testés par
+        opérations binaires au lieu de cloner des plateaux. Chaque état découvert
+        ne mémorise que son parent et le mouvement qui y mène ; le chemin n'est
+        reconstruit qu'une fois la sortie atteinte.
 
-        total_vehicles = len(board.vehicles)
-        density_factor = total_vehicles / (board.size * board.size)
+        Args:
+            max_time (float): Temps maximum de recherche en secondes
+            method (str): 'astar', 'bfs', 'ida', 'wastar', 'beam', 'external' ou 'parallel'
+            track_memory (bool): True pour mesurer le pic de mémoire allouée pendant la
+                                 recherche (`self.stats['peak_memory']`, en octets)
+            heuristic (str): Nom de l'heuristique (voir `HEURISTICS`) ; par défaut
+                             'legacy' pour A* et 'blockers' pour IDA*. Avec une heuristique
+                             admissible ('blockers', 'blockers2', 'pdb'), A* renvoie une
+                             solution optimale
+            tt_size (int): Nombre maximum d'entrées de la table de transposition d'IDA*
+                           (par défaut, dimensionnée d'après le plateau)
+            epsilon (float): Poids de l'heuristique pour 'wastar' (1.0 = A* classique)
+            beam_width (int): Nombre d'états conservés par couche pour 'beam'
+            work_dir (str): Répertoire où 'external' crée le sous-répertoire de ses couches,
+                            propre au plateau et à la métrique (data/bfs par défaut) ; seuls
+                            les fichiers du parcours y sont supprimés
+            buffer_size (int): Nombre maximum de clés gardées en mémoire par 'external'
+            workers (int): Nombre de processus de 'parallel' (un par cœur par défaut)
 
-        # Combinaison des facteurs avec des poids optimisés
-        h_value = (
-                distance_to_exit * 1.0 +  # Poids standard pour la distance
-                direct_blockers * 2.0 +  # Les bloqueurs directs sont importants
-                secondary_blockers * 0.5 +  # Les bloqueurs secondaires sont moins importants
-                density_factor * 3.0  # La densité influence la difficulté de mouvement
-        )
+        Returns:
+            list: Liste de tuples (vehicle_id, direction) représentant la solution,
+                 ou None si aucune solution n'existe ou si le temps est dépassé.
+                 En métrique 'slide', les tuples sont (vehicle_id, direction, distance).
+        """
+        if method == 'bfs':
+            search = self._solve_bfs
+            bound = 1.0
+        elif method == 'astar':
+            heuristic = heuristic or 'legacy'
+            search = lambda limit: self._solve_astar(limit, heuristic)
+            bound = 1.0 if heuristic in ADMISSIBLE_HEURISTICS else None
+        elif method == 'ida':
+            heuristic = heuristic or 'blockers'
+            search = lambda limit: self._solve_ida(limit, heuristic, tt_size)
+            bound = 1.0 if heuristic in ADMISSIBLE_HEURISTICS else None
+        elif method == 'wastar':
+            if epsilon < 1.0:
+                raise ValueError(f"epsilon doit être supérieur ou égal à 1: {epsilon}")
+            heuristic = heuristic or 'blockers'
+            search = lambda limit: self._solve_astar(limit, heuristic, epsilon)
+            bound = epsilon if heuristic in ADMISSIBLE_HEURISTICS else None
+        elif method == 'beam':
+            heuristic = heuristic or 'blockers'
+            search = lambda limit: self._solve_beam(limit, heuristic, beam_width)
+            bound = None
+        elif method == 'external':
+            search = lambda limit: self._solve_external(limit, work_dir, buffer_size)
+            bound = 1.0
+        elif method == 'parallel':
+            search = lambda limit: self._solve_parallel(limit, workers)
+            bound = 1.0
+        else:
+            raise ValueError(f"Méthode de résolution inconnue: {method}")
 
-        return h_value
+        if heuristic is not None and heuristic not in HEURISTICS:
+            raise ValueError(f"Heuristique inconnue: {heuristic}")
 
-    def solve(self, max_time=10.0):
+        # Rejet immédiat des plateaux dont l'insolubilité se prouve sans recherche
+        start_time = time.time()
+        reason = find_deadlock(self.initial_board)
+        if reason is not None:
+            self._log(f"Plateau insoluble: {reason}")
+            self.stats = {
+                'method': method,
+                'metric': self.metric,
+                'nodes_explored': 0,
+                'time': time.time() - start_time,
+                'solution_length': None,
+                'timed_out': False,
+                'cancelled': False,
+                'unsolvable_reason': reason,
+                'suboptimality_bound': bound,
+            }
+            return None
+
+        if not track_memory:
+            solution = search(max_time)
+            self.stats['suboptimality_bound'] = bound
+            return solution
+
+        # tracemalloc ralentit la recherche : la mesure n'est faite qu'à la demande
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+            tracemalloc.reset_peak()
+        try:
+            solution = search(max_time)
+            self.stats['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            self.stats['suboptimality_bound'] = bound
+        finally:
+            if not already_tracing:
+                tracemalloc.stop()
+        return solution
+
+    def _solve_astar(self, max_time, heuristic, weight=1.0):
         """
-        Résout le puzzle en utilisant l'algorithme A* avec des optimisations.
+        Résout le puzzle avec l'algorithme A* (pondéré si `weight` > 1).
 
         Args:
             max_time (float): Temps maximum de recherche en secondes
+            heuristic (str): Nom de l'heuristique
+            weight (float): Poids de l'heuristique dans f = g + weight * h
 
         Returns:
-            list: Liste de tuples (vehicle_id, direction) représentant la solution,
-                 ou None si aucune solution n'existe ou si le temps est dépassé
+            list: Solution (liste de mouvements) ou None
         """
         start_time = time.time()
-        start_board = self.initial_board
-
-        # File de priorité pour A*
+        engine = BitboardEngine(self.initial_board)
+        start_state = engine.initial_state()
+        start_key = start_state[1]
+        metric = self.metric
+        evaluate = getattr(engine, HEURISTICS[heuristic])
+        method = 'astar' if weight == 1.0 else 'wastar'
+
+        # File de priorité pour A* : (f, compteur, g, état)
         open_set = []
+        counter = 0
+        peak_open = 1
 
-        # Ensemble des états déjà visités (utilise un set pour des recherches O(1))
+        # Ensemble des états déjà développés
         closed_set = set()
 
-        # Dictionnaire pour retracer le chemin
-        came_from = {}
-
         # Coût réel du départ à l'état actuel
-        g_score = {}
-        g_score[start_board.get_state_hash()] = 0
-
-        # Estimation du coût total
-        f_score = {}
-        f_score[start_board.get_state_hash()] = self.heuristic(start_board)
-
-        # Représente les mouvements qui ont mené à cet état
-        moves = {}
-        moves[start_board.get_state_hash()] = []
+        g_score = {start_key: 0}
 
-        # Ajoute l'état initial à la file de priorité
-        heapq.heappush(open_set, (f_score[start_board.get_state_hash()], id(start_board), start_board))
+        # Pour chaque état découvert : (état parent, mouvement) permettant d'y arriver
+        came_from = {start_key: None}
 
-        # Pour éviter les cycles, garde une trace des états déjà vus
-        seen = {start_board.get_state_hash()}
+        # Ajoute l'état initial à la file de priorité (sauf si l'heuristique prouve l'impasse)
+        start_h = evaluate(start_state, metric)
+        if start_h != float('inf'):
+            heapq.heappush(open_set, (weight * start_h, counter, 0, start_state))
 
         # Compteur de nœuds explorés pour le débogage
         nodes_explored = 0
+        popped = 0
 
-        while open_set and time.time() - start_time < max_time:
-            nodes_explored += 1
+        while open_set:
+            popped += 1
+            if popped % 256 == 0 and self._interrupted(start_time, max_time, nodes_explored):
+                break
 
             # Récupère l'état avec le score f le plus bas
-            _, _, current_board = heapq.heappop(open_set)
-            current_hash = current_board.get_state_hash()
+            _, _, current_g, current_state = heapq.heappop(open_set)
+            current_key = current_state[1]
+
+            # Une même position peut être empilée plusieurs fois avec des coûts différents
+            if current_key in closed_set:
+                continue
+            nodes_explored += 1
 
             # Vérifie si l'état actuel est une solution
-            if current_board.is_solved():
+            if engine.is_goal(current_state):
+                path = self._reconstruct_path(engine, came_from, current_key)
                 solve_time = time.time() - start_time
-                print(f"Solution trouvée en {solve_time:.3f}s après exploration de {nodes_explored} nœuds")
-                return moves[current_hash]
+                self._log(f"Solution trouvée en {solve_time:.3f}s après exploration de {nodes_explored} nœuds")
+                self.stats = {
+                    'method': method,
+                    'metric': metric,
+                    'heuristic': heuristic,
+                    'nodes_explored': nodes_explored,
+                    'time': solve_time,
+                    'solution_length': len(path),
+                    'timed_out': False,
+                    'cancelled': False,
+                    'stored_states': len(came_from),
+                    'peak_open': peak_open,
+                }
+                return path
 
             # Ajoute l'état actuel à l'ensemble des états visités
-            closed_set.add(current_hash)
+            closed_set.add(current_key)
 
-            # Génère tous les mouvements possibles dans un ordre optimisé
-            # Priorité aux véhicules bloquant directement la voiture principale
-            sorted_vehicles = self._prioritize_vehicles(current_board)
+            tentative_g_score = current_g + 1
+            for move, neighbor in engine.neighbors(current_state, metric):
+                neighbor_key = neighbor[1]
 
-            for vehicle_id in sorted_vehicles:
-                vehicle = current_board.vehicles[vehicle_id]
+                # Ignore les états déjà développés
+                if neighbor_key in closed_set:
+                    continue
 
-                # Détermine les directions possibles selon l'orientation
-                if vehicle.orientation == 'H':
-                    directions = ['left', 'right']
-                else:
-                    directions = ['up', 'down']
+                # Si cet état n'a pas encore été découvert ou le nouveau chemin est meilleur
+                if tentative_g_score < g_score.get(neighbor_key, float('inf')):
+                    h = evaluate(neighbor, metric)
+                    if h == float('inf'):
+                        # Impasse prouvée par l'heuristique : inutile de l'explorer
+                        continue
+                    g_score[neighbor_key] = tentative_g_score
 
-                for direction in directions:
-                    # Crée une copie du plateau pour tester le mouvement
-                    new_board = current_board.clone()
+                    # Enregistre le parent et le mouvement qui ont mené à cet état
+                    came_from[neighbor_key] = (current_key, move)
 
-                    # Tente de déplacer le véhicule
-                    if new_board.move_vehicle(vehicle_id, direction):
-                        neighbor_hash = new_board.get_state_hash()
+                    # Ajoute l'état à la file de priorité
+                    counter += 1
+                    f_score = tentative_g_score + weight * h
+                    heapq.heappush(open_set, (f_score, counter, tentative_g_score, neighbor))
 
-                        # Ignore les états déjà visités ou vus
-                        if neighbor_hash in closed_set or neighbor_hash in seen:
-                            continue
+            if len(open_set) > peak_open:
+                peak_open = len(open_set)
 
-                        # Marque cet état comme vu
-                        seen.add(neighbor_hash)
+        # Temps écoulé ou aucune solution trouvée
+        self._report_failure(method, start_time, max_time, nodes_explored, heuristic=heuristic,
+                             stored_states=len(came_from), peak_open=peak_open)
+        return None
 
-                        # Coût pour atteindre ce nouvel état
-                        tentative_g_score = g_score[current_hash] + 1
+    def _solve_bfs(self, max_time):
+        """
+        Résout le puzzle par un parcours en largeur, couche par couche.
 
-                        # Si cet état n'a pas encore été découvert ou le nouveau chemin est meilleur
-                        if neighbor_hash not in g_score or tentative_g_score < g_score[neighbor_hash]:
-                            # Met à jour les scores
-                            g_score[neighbor_hash] = tentative_g_score
-                            f_score[neighbor_hash] = tentative_g_score + self.heuristic(new_board)
+        Chaque état n'est ajouté qu'une fois à la frontière ; comme tous les
+        mouvements coûtent 1 (dans la métrique choisie), la première solution
+        rencontrée est la plus courte.
+        La taille de chaque couche est enregistrée dans `self.stats['layer_sizes']`.
 
-                            # Enregistre le mouvement qui a mené à cet état
-                            new_moves = moves[current_hash].copy()
-                            new_moves.append((vehicle_id, direction))
-                            moves[neighbor_hash] = new_moves
+        Args:
+            max_time (float): Temps maximum de recherche en secondes
 
-                            # Ajoute l'état à la file de priorité
-                            heapq.heappush(open_set, (f_score[neighbor_hash], id(new_board), new_board))
+        Returns:
+            list: Solution optimale (liste de tuples (vehicle_id, direction)) ou None
+        """
+        start_time = time.time()
+        engine = BitboardEngine(self.initial_board)
+        start_state = engine.initial_state()
+        metric = self.metric
+
+        # Pour chaque état découvert : (état parent, mouvement) permettant d'y arriver
+        came_from = {start_state[1]: None}
+        frontier = [start_state]
+        layer_sizes = []
+        nodes_explored = 0
+        goal_key = start_state[1] if engine.is_goal(start_state) else None
+
+        interrupted = False
+
+        while frontier and goal_key is None and not interrupted:
+            layer_sizes.append(len(frontier))
+            next_frontier = []
+
+            for state in frontier:
+                nodes_explored += 1
+                if nodes_explored % 1024 == 0 and self._interrupted(start_time, max_time, nodes_explored):
+                    interrupted = True
+                    break
+
+                for move, neighbor in engine.neighbors(state, metric):
+                    neighbor_key = neighbor[1]
+                    if neighbor_key in came_from:
+                        continue
+                    came_from[neighbor_key] = (state[1], move)
+
+                    # Test du but dès la génération : la couche suivante est la plus proche
+                    if engine.is_goal(neighbor):
+                        goal_key = neighbor_key
+                        break
+                    next_frontier.append(neighbor)
+
+                if goal_key is not None:
+                    break
+
+            frontier = next_frontier
+
+        if goal_key is None:
+            self._report_failure('bfs', start_time, max_time, nodes_explored,
+                                 stored_states=len(came_from), layer_sizes=layer_sizes)
+            return None
+
+        path = self._reconstruct_path(engine, came_from, goal_key)
+
+        solve_time = time.time() - start_time
+        self._log(f"Solution optimale trouvée en {solve_time:.3f}s après exploration de {nodes_explored} nœuds")
+        self.stats = {
+            'method': 'bfs',
+            'metric': metric,
+            'nodes_explored': nodes_explored,
+            'time': solve_time,
+            'solution_length': len(path),
+            'timed_out': False,
+            'cancelled': False,
+            'stored_states': len(came_from),
+            'layer_sizes': layer_sizes,
+        }
+        return path
+
+    def _solve_external(self, max_time, work_dir, buffer_size):
+        """
+        Résout le puzzle par un parcours en largeur sur disque (voir `ExternalBFS`).
 
-        # Temps écoulé ou aucune solution trouvée
-        if time.time() - start_time >= max_time:
-            print(f"Temps dépassé après exploration de {nodes_explored} nœuds")
-        else:
-            print(f"Aucune solution trouvée après exploration de {nodes_explored} nœuds")
+        Les couches terminées restent sur disque si la recherche est interrompue,
+        pour être reprises par un appel ultérieur sur le même plateau ; elles sont
+        supprimées une fois la recherche menée à terme.
 
-        return None
+        Args:
+            max_time (float): Temps maximum de recherche en secondes (pour cet appel)
+            work_dir (str): Répertoire où créer le sous-répertoire des couches (None pour data/bfs)
+            buffer_size (int): Nombre maximum de clés gardées en mémoire
 
-    def _prioritize_vehicles(self, board):
+        Returns:
+            list: Solution optimale ou None
+        """
+        start_time = time.time()
+        search = ExternalBFS(self.initial_board, self.metric, work_dir, buffer_size)
+        resumed_from = search.depth
+        if resumed_from:
+            self._log(f"Reprise du parcours sur disque à la profondeur {resumed_from}")
+
+        goal_key = search.run(lambda nodes: self._interrupted(start_time, max_time, nodes))
+        extra = {
+            'layer_sizes': list(search.layer_sizes),
+            'stored_states': sum(search.layer_sizes),
+            'disk_bytes': search.disk_usage(),
+            'resumed_from': resumed_from,
+            'work_dir': search.directory,
+        }
+
+        if goal_key is None:
+            self._report_failure('external', start_time, max_time, search.nodes_explored, **extra)
+            if search.complete:
+                search.cleanup()
+            return None
+
+        with_distance = self.metric == 'slide'
+        path = [search.engine.decode_move(move, with_distance) for move in search.reconstruct(goal_key)]
+        search.cleanup()
+
+        solve_time = time.time() - start_time
+        self._log(f"Solution optimale trouvée en {solve_time:.3f}s après exploration de "
+                  f"{search.nodes_explored} nœuds ({extra['disk_bytes']} octets sur disque)")
+        self.stats = {
+            'method': 'external',
+            'metric': self.metric,
+            'nodes_explored': search.nodes_explored,
+            'time': solve_time,
+            'solution_length': len(path),
+            'timed_out': False,
+            'cancelled': False,
+        }
+        self.stats.update(extra)
+        return path
+
+    def _solve_parallel(self, max_time, workers):
         """
-        Trie les véhicules pour prioriser ceux qui sont les plus pertinents à déplacer.
+        Résout le puzzle par un parcours en largeur multiprocessus (voir `ParallelBFS`).
 
         Args:
-            board (Board): État actuel de la grille
+            max_time (float): Temps maximum de recherche en secondes (vérifié entre deux couches)
+            workers (int): Nombre de processus
 
         Returns:
-            list: Liste triée des IDs de véhicules
+            list: Solution optimale ou None
+        """
+        start_time = time.time()
+        search = ParallelBFS(self.initial_board, self.metric, workers)
+        search.start()
+        try:
+            goal_key = search.run(lambda nodes: self._interrupted(start_time, max_time, nodes))
+            moves = search.reconstruct(goal_key) if goal_key is not None else None
+        finally:
+            search.close()
+
+        extra = {'layer_sizes': search.layer_sizes, 'workers': search.workers}
+        if moves is None:
+            self._report_failure('parallel', start_time, max_time, search.nodes_explored, **extra)
+            return None
+
+        with_distance = self.metric == 'slide'
+        path = [search.engine.decode_move(move, with_distance) for move in moves]
+
+        solve_time = time.time() - start_time
+        self._log(f"Solution optimale trouvée en {solve_time:.3f}s après exploration de "
+                  f"{search.nodes_explored} nœuds ({search.workers} processus)")
+        self.stats = {
+            'method': 'parallel',
+            'metric': self.metric,
+            'nodes_explored': search.nodes_explored,
+            'time': solve_time,
+            'solution_length': len(path),
+            'timed_out': False,
+            'cancelled': False,
+        }
+        self.stats.update(extra)
+        return path
+
+    def _solve_beam(self, max_time, heuristic, width):
         """
-        vehicles_scores = {}
-        main_car = None
+        Résout le puzzle par une recherche en faisceau.
 
-        # Trouve la voiture principale
-        for vehicle in board.vehicles.values():
-            if vehicle.is_main:
-                main_car = vehicle
+        Le parcours avance couche par couche comme un parcours en largeur, mais ne
+        conserve à chaque couche que les `width` états de plus faible heuristique.
+        Une solution trouvée prouve que le niveau est soluble ; un échec ne prouve
+        rien, des états écartés pouvant mener à la sortie.
+
+        Args:
+            max_time (float): Temps maximum de recherche en secondes
+            heuristic (str): Nom de l'heuristique qui classe les états
+            width (int): Nombre d'états conservés par couche
+
+        Returns:
+            list: Solution (liste de mouvements) ou None
+        """
+        start_time = time.time()
+        engine = BitboardEngine(self.initial_board)
+        start_state = engine.initial_state()
+        metric = self.metric
+        evaluate = getattr(engine, HEURISTICS[heuristic])
+
+        came_from = {start_state[1]: None}
+        frontier = [start_state]
+        nodes_explored = 0
+        goal_key = start_state[1] if engine.is_goal(start_state) else None
+        interrupted = False
+
+        while frontier and goal_key is None and not interrupted:
+            candidates = []
+            for state in frontier:
+                nodes_explored += 1
+                if nodes_explored % 1024 == 0 and self._interrupted(start_time, max_time, nodes_explored):
+                    interrupted = True
+                    break
+
+                for move, neighbor in engine.neighbors(state, metric):
+                    neighbor_key = neighbor[1]
+                    if neighbor_key in came_from:
+                        continue
+                    came_from[neighbor_key] = (state[1], move)
+
+                    if engine.is_goal(neighbor):
+                        goal_key = neighbor_key
+                        break
+                    h = evaluate(neighbor, metric)
+                    if h != float('inf'):
+                        candidates.append((h, neighbor_key, neighbor))
+
+                if goal_key is not None:
+                    break
+
+            # Ne garde que les meilleurs états pour la couche suivante
+            frontier = [state for _, _, state in heapq.nsmallest(width, candidates)]
+
+        if goal_key is None:
+            self._report_failure('beam', start_time, max_time, nodes_explored, heuristic=heuristic,
+                                 stored_states=len(came_from), beam_width=width)
+            return None
+
+        path = self._reconstruct_path(engine, came_from, goal_key)
+
+        solve_time = time.time() - start_time
+        self._log(f"Solution trouvée en {solve_time:.3f}s après exploration de {nodes_explored} nœuds")
+        self.stats = {
+            'method': 'beam',
+            'metric': metric,
+            'heuristic': heuristic,
+            'nodes_explored': nodes_explored,
+            'time': solve_time,
+            'solution_length': len(path),
+            'timed_out': False,
+            'cancelled': False,
+            'stored_states': len(came_from),
+            'beam_width': width,
+        }
+        return path
+
+    def _solve_ida(self, max_time, heuristic, tt_size):
+        """
+        Résout le puzzle avec IDA* (A* itératif en profondeur).
+
+        Chaque itération est une recherche en profondeur bornée par f = g + h ;
+        la borne suivante est le plus petit f qui l'a dépassée. Seuls le chemin
+        courant et une table de transposition bornée (éviction LRU) sont gardés en
+        mémoire. Avec une heuristique admissible, la solution est optimale.
+
+        Args:
+            max_time (float): Temps maximum de recherche en secondes
+            heuristic (str): Nom de l'heuristique
+            tt_size (int): Nombre maximum d'entrées de la table de transposition
+                           (None pour la dimensionner d'après le plateau)
+
+        Returns:
+            list: Solution (liste de mouvements) ou None
+        """
+        start_time = time.time()
+        engine = BitboardEngine(self.initial_board)
+        if tt_size is None:
+            tt_size = self._default_tt_size()
+        start_state = engine.initial_state()
+        metric = self.metric
+        evaluate = getattr(engine, HEURISTICS[heuristic])
+
+        bound = evaluate(start_state, metric)
+        iterations = []
+        nodes_explored = 0
+        generated = 0  # États générés, pour vérifier régulièrement le temps écoulé
+        interrupted = False
+        solution = None
+
+        if engine.is_goal(start_state):
+            solution = []
+
+        while solution is None and bound != float('inf'):
+            iteration_start = time.time()
+            iteration_nodes = 0
+            next_bound = float('inf')
+
+            # Table de transposition : clé -> plus petit g auquel l'état a été atteint
+            # pendant cette itération
+            table = OrderedDict()
+            table[start_state[1]] = 0
+
+            # Chemin courant : mouvements, clés (pour éviter les cycles) et générateurs de voisins
+            path_moves = []
+            path_keys = {start_state[1]}
+            path_key_list = [start_state[1]]
+            stack = [engine.neighbors(start_state, metric)]
+
+            while stack:
+                child = next(stack[-1], None)
+                if child is None:
+                    # Tous les voisins ont été essayés : retour arrière
+                    stack.pop()
+                    path_keys.discard(path_key_list.pop())
+                    if path_moves:
+                        path_moves.pop()
+                    continue
+
+                move, state = child
+                key = state[1]
+                g = len(path_moves) + 1
+
+                generated += 1
+                if generated % 1000 == 0 and self._interrupted(start_time, max_time,
+                                                               nodes_explored + iteration_nodes):
+                    interrupted = True
+                    break
+
+                if key in path_keys:
+                    continue
+
+                f = g + evaluate(state, metric)
+                if f > bound:
+                    if f < next_bound:
+                        next_bound = f
+                    continue
+
+                previous = table.get(key)
+                if previous is not None and previous <= g:
+                    continue
+                table[key] = g
+                table.move_to_end(key)
+                if len(table) > tt_size:
+                    table.popitem(last=False)
+
+                iteration_nodes += 1
+
+                if engine.is_goal(state):
+                    solution = path_moves + [move]
+                    break
+
+                path_moves.append(move)
+                path_keys.add(key)
+                path_key_list.append(key)
+                stack.append(engine.neighbors(state, metric))
+
+            nodes_explored += iteration_nodes
+            iterations.append({
+                'bound': bound,
+                'nodes': iteration_nodes,
+                'table_size': len(table),
+                'time': time.time() - iteration_start,
+            })
+
+            if interrupted:
                 break
+            bound = next_bound
+
+        if solution is None:
+            self._report_failure('ida', start_time, max_time, nodes_explored,
+                                 heuristic=heuristic, iterations=iterations)
+            return None
+
+        with_distance = metric == 'slide'
+        path = [engine.decode_move(move, with_distance) for move in solution]
+        solve_time = time.time() - start_time
+        self._log(f"Solution trouvée en {solve_time:.3f}s après exploration de {nodes_explored} nœuds "
+                  f"({len(iterations)} itérations)")
+        self.stats = {
+            'method': 'ida',
+            'metric': metric,
+            'heuristic': heuristic,
+            'nodes_explored': nodes_explored,
+            'time': solve_time,
+            'solution_length': len(path),
+            'timed_out': False,
+            'cancelled': False,
+            'iterations': iterations,
+        }
+        return path
+
+    def _default_tt_size(self):
+        """
+        Dimensionne la table de transposition d'IDA* d'après le plateau.
+
+        Le nombre d'états est majoré par le produit, sur tous les véhicules, du
+        nombre de positions sur leur ligne ; une table de cette taille (au plus
+        MAX_TT_SIZE entrées) ne perd aucun état par éviction sur les petits
+        plateaux, et la perte reste limitée sur les grands.
+
+        Returns:
+            int: Nombre maximum d'entrées de la table
+        """
+        board = self.initial_board
+        size = 1
+        for vehicle in board.vehicles.values():
+            size *= board.lane_size(vehicle) - vehicle.length + 1
+            if size >= MAX_TT_SIZE:
+                return MAX_TT_SIZE
+        return size
+
+    def _reconstruct_path(self, engine, came_from, goal_key):
+        """
+        Reconstruit la solution en remontant les parents depuis l'état final.
+
+        Args:
+            engine (BitboardEngine): Moteur ayant produit les mouvements
+            came_from (dict): Clé d'état -> (clé du parent, mouvement codé), ou None pour le départ
+            goal_key: Clé de l'état résolu
+
+        Returns:
+            list: Mouvements décodés, du départ vers la sortie
+        """
+        with_distance = self.metric == 'slide'
+        path = []
+        key = goal_key
+        while came_from[key] is not None:
+            key, move = came_from[key]
+            path.append(engine.decode_move(move, with_distance))
+        path.reverse()
+        return path
+
+    def _log(self, message):
+        """Affiche un message si le solveur est en mode verbeux."""
+        if self.verbose:
+            print(message)
+
+    def _interrupted(self, start_time, max_time, nodes_explored):
+        """
+        Publie la progression et indique si la recherche doit s'arrêter.
+
+        Appelée périodiquement par les boucles de recherche.
 
-        if not main_car:
-            return list(board.vehicles.keys())
-
-        # Évalue chaque véhicule
-        for vehicle_id, vehicle in board.vehicles.items():
-            # Par défaut, score moyen
-            score = 50
-
-            # La voiture principale est prioritaire
-            if vehicle.is_main:
-                score = 100
-
-            # Les véhicules qui bloquent directement la voiture principale sont prioritaires
-            elif (vehicle.orientation == 'V' and
-                  vehicle.x > main_car.x + main_car.length - 1 and
-                  vehicle.x <= board.exit_pos[0] and
-                  vehicle.y <= main_car.y and vehicle.y + vehicle.length > main_car.y):
-                score = 90
-
-            # Les véhicules qui bloquent les bloqueurs sont aussi importants
-            elif vehicle.orientation == 'H':
-                # Vérifie si ce véhicule bloque un véhicule vertical important
-                for other_id, other in board.vehicles.items():
-                    if other.orientation == 'V' and other.x > main_car.x:
-                        if (vehicle.y == other.y - 1 or vehicle.y == other.y + other.length) and \
-                                (other.x >= vehicle.x and other.x < vehicle.x + vehicle.length):
-                            score = 80
-                            break
-
-            vehicles_scores[vehicle_id] = score
-
-        # Trie les véhicules par score décroissant
-        return sorted(board.vehicles.keys(), key=lambda vid: vehicles_scores[vid], reverse=True)
+        Returns:
+            bool: True si le temps est écoulé ou si l'annulation a été demandée
+        """
+        if self.progress is not None:
+            self.progress['nodes_explored'] = nodes_explored
+        return self.cancel_event.is_set() or time.time() - start_time >= max_time
+
+    def _report_failure(self, method, start_time, max_time, nodes_explored, **extra):
+        """Affiche et enregistre les statistiques d'une recherche sans solution."""
+        elapsed = time.time() - start_time
+        cancelled = self.cancel_event.is_set()
+        timed_out = not cancelled and elapsed >= max_time
+        if cancelled:
+            self._log(f"Recherche annulée après exploration de {nodes_explored} nœuds")
+        elif timed_out:
+            self._log(f"Temps dépassé après exploration de {nodes_explored} nœuds")
+        else:
+            self._log(f"Aucune solution trouvée après exploration de {nodes_explored} nœuds")
+
+        self.stats = {
+            'method': method,
+            'metric': self.metric,
+            'nodes_explored': nodes_explored,
+            'time': elapsed,
+            'solution_length': None,
+            'timed_out': timed_out,
+            'cancelled': cancelled,
+        }
+        self.stats.update(extra)
+
+
+def _solve_record(task):
+    """
+    Résout un plateau d'un lot (exécuté dans un processus du pool).
+
+    Args:
+        task (tuple): (indice de la ligne, ligne JSON, options de résolution)
+
+    Returns:
+        dict: Résultat sérialisable en JSON
+    """
+    index, line, options = task
+    result = {'index': index}
+    try:
+        data = json.loads(line)
+        if 'id' in data:
+            result['id'] = data['id']
+
+        solver = Solver(Board.from_dict(data), options['metric'], verbose=False)
+        solution = solver.solve(max_time=options['max_time'], method=options['method'],
+                                heuristic=options['heuristic'])
+        stats = solver.stats
+
+        if solution is not None:
+            status = 'solved'
+        elif stats.get('timed_out'):
+            status = 'timeout'
+        elif options['method'] == 'beam':
+            status = 'unknown'  # Un échec de la recherche en faisceau ne prouve pas l'insolubilité
+        else:
+            status = 'unsolvable'
+
+        result.update({
+            'status': status,
+            'solution': solution,
+            'length': len(solution) if solution is not None else None,
+            'nodes': stats['nodes_explored'],
+            'time': stats['time'],
+            'suboptimality_bound': stats.get('suboptimality_bound'),
+        })
+        if 'unsolvable_reason' in stats:
+            result['reason'] = stats['unsolvable_reason']
+    except Exception as e:
+        result.update({'status': 'error', 'error': str(e)})
+    return result
+
+
+def solve_batch(input_path, output_path=None, max_time=10.0, method='bfs', metric='step', workers=None,
+                heuristic=None):
+    """
+    Résout tous les plateaux d'un fichier JSONL en parallèle.
+
+    Chaque ligne du fichier d'entrée est un plateau au format de
+    `Game.serialize_board` (avec éventuellement un champ 'id'). Les résultats
+    sont écrits en JSONL au fur et à mesure que les plateaux sont résolus, donc
+    dans un ordre quelconque : le champ 'index' donne la ligne d'origine.
+
+    Args:
+        input_path (str): Fichier JSONL des plateaux
+        output_path (str): Fichier JSONL des résultats (sortie standard si None)
+        max_time (float): Temps maximum de recherche par plateau, en secondes
+        method (str): Méthode de résolution ('bfs', 'astar', 'ida', 'wastar' ou 'beam')
+        metric (str): 'step' ou 'slide'
+        workers (int): Nombre de processus (par défaut, un par cœur)
+        heuristic (str): Heuristique d'A* et d'IDA* (voir `HEURISTICS`)
+
+    Returns:
+        dict: Bilan du lot (nombre de plateaux par statut, débit, ...)
+    """
+    options = {'max_time': max_time, 'method': method, 'metric': metric, 'heuristic': heuristic}
+    summary = {'puzzles': 0, 'solved': 0, 'unsolvable': 0, 'unknown': 0, 'timeout': 0, 'error': 0, 'nodes': 0}
+    start_time = time.time()
+
+    def tasks(lines):
+        for index, line in enumerate(lines):
+            if line.strip():
+                yield index, line, options
+
+    output = open(output_path, 'w') if output_path else sys.stdout
+    try:
+        with open(input_path) as lines, multiprocessing.Pool(workers) as pool:
+            for result in pool.imap_unordered(_solve_record, tasks(lines)):
+                output.write(json.dumps(result) + '\n')
+                output.flush()
+
+                summary['puzzles'] += 1
+                summary[result['status']] += 1
+                summary['nodes'] += result.get('nodes') or 0
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.time() - start_time
+    summary['time'] = elapsed
+    summary['puzzles_per_second'] = summary['puzzles'] / elapsed if elapsed > 0 else 0.0
+    summary['nodes_per_second'] = summary['nodes'] / elapsed if elapsed > 0 else 0.0
+    return summary
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande : `python -m solver batch plateaux.jsonl`."""
+    parser = argparse.ArgumentParser(prog='python -m solver', description="Solveur Rush Hour")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    batch = subparsers.add_parser('batch', help="Résout un fichier JSONL de plateaux")
+    batch.add_argument('input', help="Fichier JSONL, un plateau par ligne")
+    batch.add_argument('-o', '--output', help="Fichier JSONL des résultats (sortie standard par défaut)")
+    batch.add_argument('--max-time', type=float, default=10.0, help="Temps maximum par plateau (s)")
+    batch.add_argument('--method', choices=['bfs', 'astar', 'ida', 'wastar', 'beam'], default='bfs')
+    batch.add_argument('--metric', choices=['step', 'slide'], default='step')
+    batch.add_argument('--workers', type=int, default=None, help="Nombre de processus (un par cœur par défaut)")
+    batch.add_argument('--heuristic', choices=sorted(HEURISTICS), default=None,
+                       help="Heuristique d'A* et d'IDA* (pour comparer les nœuds explorés)")
+
+    args = parser.parse_args(argv)
+
+    summary = solve_batch(args.input, args.output, args.max_time, args.method, args.metric, args.workers,
+                          args.heuristic)
+    print(f"{summary['puzzles']} plateaux en {summary['time']:.2f}s "
+          f"({summary['puzzles_per_second']:.1f} plateaux/s, {summary['nodes_per_second']:.0f} nœuds/s) : "
+          f"{summary['solved']} résolus, {summary['unsolvable']} insolubles, {summary['unknown']} indéterminés, "
+          f"{summary['timeout']} hors délai, {summary['error']} erreurs", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+# static_analysis.py
+
+
+def _lane_cell(vehicle, position):
+    """Retourne la cellule (x, y) d'indice `position` sur la ligne (ou colonne) du véhicule."""
+    if vehicle.orientation == 'H':
+        return position, vehicle.y
+    return vehicle.x, position
+
+
+def reachable_ranges(board):
+    """
+    Borne les positions que chaque véhicule pourra jamais atteindre.
+
+    On part de l'hypothèse la plus stricte (chaque véhicule reste à sa place),
+    puis on l'élargit jusqu'à stabilité : les cellules couvertes par un véhicule
+    dans toutes les positions de son intervalle sont occupées en permanence, et
+    un autre véhicule ne peut s'étendre que vers des cellules qui ne le sont pas.
+    Aucun véhicule ne peut sortir le premier de son intervalle final : chaque
+    position réellement accessible y reste donc, et des véhicules qui se
+    bloquent mutuellement restent figés.
+
+    Args:
+        board (Board): Plateau à analyser
+
+    Returns:
+        dict: {vehicle_id: (position minimale, position maximale)} sur la ligne du véhicule
+    """
+    ranges = {}
+    for vehicle_id, vehicle in board.vehicles.items():
+        current = vehicle.x if vehicle.orientation == 'H' else vehicle.y
+        ranges[vehicle_id] = (current, current)
+
+    changed = True
+    while changed:
+        changed = False
+
+        # Cellules couvertes quelle que soit la position du véhicule dans son intervalle
+        permanent = {}
+        for vehicle_id, (low, high) in ranges.items():
+            vehicle = board.vehicles[vehicle_id]
+            for position in range(high, low + vehicle.length):
+                permanent[_lane_cell(vehicle, position)] = vehicle_id
+
+        for vehicle_id, (low, high) in ranges.items():
+            vehicle = board.vehicles[vehicle_id]
+
+            new_low = low
+            while new_low > 0 and permanent.get(_lane_cell(vehicle, new_low - 1), vehicle_id) == vehicle_id:
+                new_low -= 1
+            new_high = high
+            while (new_high < board.lane_size(vehicle) - vehicle.length
+                   and permanent.get(_lane_cell(vehicle, new_high + vehicle.length), vehicle_id) == vehicle_id):
+                new_high += 1
+
+            if (new_low, new_high) != (low, high):
+                ranges[vehicle_id] = (new_low, new_high)
+                changed = True
+
+    return ranges
+
+
+def frozen_vehicles(board):
+    """
+    Détermine les véhicules qui ne pourront jamais bouger.
+
+    Args:
+        board (Board): Plateau à analyser
+
+    Returns:
+        set: Identifiants des véhicules figés (bloqués par les bords ou par
+             d'autres véhicules eux-mêmes bloqués)
+    """
+    return {vehicle_id for vehicle_id, (low, high) in reachable_ranges(board).items() if low == high}
+
+
+def find_deadlock(board):
+    """
+    Cherche une raison structurelle pour laquelle le plateau est insoluble.
+
+    L'analyse ne parcourt aucun état : elle ne détecte que des blocages
+    définitifs (véhicule horizontal devant la voiture principale, véhicule figé
+    sur la ligne de sortie, véhicule qui ne peut pas dégager la ligne de sortie
+    entre les obstacles permanents de sa colonne). Un plateau pour lequel elle
+    ne trouve rien peut tout de même être insoluble.
+
+    L'analyse est menée dans le repère où la sortie est à droite (voir
+    `Board.to_exit_frame`).
+
+    Args:
+        board (Board): Plateau à analyser
+
+    Returns:
+        str: Raison de l'insolubilité, ou None si aucun blocage n'a été prouvé
+    """
+    if board.exit_side != 'right':
+        board = board.to_exit_frame()
+
+    main = next((v for v in board.vehicles.values() if v.is_main), None)
+    if main is None:
+        return "aucune voiture principale"
+
+    exit_x, exit_y = board.exit_pos
+    if main.orientation != 'H' or main.y != exit_y:
+        return f"la voiture principale {main.id} n'est pas sur la ligne de sortie"
+
+    if board.is_solved():
+        return None
+
+    main_end = main.x + main.length
+    row = main.y
+
+    # Un véhicule horizontal devant la voiture principale ne peut jamais lui céder la place
+    for vehicle in board.vehicles.values():
+        if vehicle is not main and vehicle.orientation == 'H' and vehicle.y == row and vehicle.x >= main_end:
+            return f"le véhicule horizontal {vehicle.id} est devant la voiture principale"
+
+    ranges = reachable_ranges(board)
+
+    # Un véhicule qui occupe en permanence une case de la ligne de sortie bloque la voiture principale
+    for x in range(main_end, exit_x + 1):
+        occupant = board.get_vehicle_at(x, row)
+        if occupant is None or occupant.orientation != 'V':
+            continue
+        low, high = ranges[occupant.id]
+        if high <= row < low + occupant.length:
+            if low == high:
+                return f"le véhicule {occupant.id} est figé sur la ligne de sortie"
+            return f"le véhicule {occupant.id} ne peut pas dégager la ligne de sortie"
+
+    if ranges[main.id][1] < exit_x - main.length + 1:
+        return f"la voiture principale {main.id} ne peut pas atteindre la sortie"
+
+    return None
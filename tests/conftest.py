@@ -0,0 +1,84 @@
+# conftest.py
+import os
+import sys
+import pytest
+
+# Les modules du jeu sont à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board
+from vehicle import Vehicle
+
+# Plateaux de référence : une ligne par rangée, une lettre par véhicule ('X' pour la
+# voiture principale), '.' pour une case vide ; avec la sortie et la longueur de la
+# solution optimale dans chaque métrique
+BOARDS = {
+    'easy': {
+        'rows': ["BB..L.",
+                 "....L.",
+                 "XXK.L.",
+                 "..K..S",
+                 "...WWS",
+                 ".YY..."],
+        'exit_side': 'right',
+        'moves': {'step': 10, 'slide': 4},
+    },
+    'hard': {
+        'rows': [".CCTT.",
+                 "KKNNN.",
+                 "..XXSU",
+                 "M.HHSU",
+                 "M.RQQU",
+                 "LLRBBB"],
+        'exit_side': 'right',
+        'moves': {'step': 22, 'slide': 12},
+    },
+    'bottom_exit': {
+        'rows': ["..X.DD",
+                 "GGX...",
+                 "L...R.",
+                 "LAAAR.",
+                 "L...R."],
+        'exit_side': 'bottom',
+        'moves': {'step': 9, 'slide': 5},
+    },
+}
+
+
+def parse_board(rows, exit_side='right', exit_line=None):
+    """
+    Construit un plateau à partir de sa grille texte.
+
+    Args:
+        rows (list): Rangées du plateau, de haut en bas
+        exit_side (str): Côté de la sortie
+        exit_line (int): Ligne ou colonne de la sortie (celle du milieu par défaut)
+
+    Returns:
+        Board: Plateau correspondant
+    """
+    cells = {}
+    for y, row in enumerate(rows):
+        for x, symbol in enumerate(row):
+            if symbol != '.':
+                cells.setdefault(symbol, []).append((x, y))
+
+    board = Board(len(rows[0]), len(rows), exit_side, exit_line)
+    for symbol, positions in sorted(cells.items()):
+        x, y = positions[0]
+        orientation = 'H' if positions[-1][1] == y else 'V'
+        assert board.add_vehicle(Vehicle(symbol, x, y, len(positions), orientation, symbol == 'X'))
+    return board
+
+
+@pytest.fixture
+def make_board():
+    """Fabrique de plateaux à partir de grilles texte (voir `parse_board`)."""
+    return parse_board
+
+
+@pytest.fixture(params=sorted(BOARDS))
+def reference(request):
+    """Plateau de référence et longueurs optimales connues ({métrique: mouvements}), pour chaque entrée de BOARDS."""
+    entry = BOARDS[request.param]
+    return parse_board(entry['rows'], entry['exit_side']), entry['moves']
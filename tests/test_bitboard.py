@@ -0,0 +1,59 @@
+# test_bitboard.py
+import random
+import pytest
+from bitboard import BitboardEngine
+
+STEPS = {'left': (-1, 0), 'right': (1, 0), 'up': (0, -1), 'down': (0, 1)}
+
+
+def legal_moves(board, metric):
+    """Mouvements possibles, trouvés case par case à partir des coordonnées des véhicules."""
+    occupied = {cell: vehicle_id for vehicle_id, vehicle in board.vehicles.items()
+                for cell in vehicle.get_coordinates()}
+    moves = set()
+    for vehicle_id, vehicle in board.vehicles.items():
+        directions = ('left', 'right') if vehicle.orientation == 'H' else ('up', 'down')
+        for direction in directions:
+            dx, dy = STEPS[direction]
+            distance = 1
+            while True:
+                cells = [(x + dx * distance, y + dy * distance) for x, y in vehicle.get_coordinates()]
+                if not all(0 <= x < board.width and 0 <= y < board.height
+                           and occupied.get((x, y), vehicle_id) == vehicle_id for x, y in cells):
+                    break
+                moves.add((vehicle_id, direction, distance) if metric == 'slide' else (vehicle_id, direction))
+                if metric == 'step':
+                    break
+                distance += 1
+    return moves
+
+
+@pytest.mark.parametrize('metric', ('step', 'slide'))
+def test_neighbors_match_board_moves(reference, metric):
+    """Sur une marche aléatoire, le moteur génère exactement les mouvements légaux du plateau, vers les bons états."""
+    board, _ = reference
+    engine = BitboardEngine(board)
+    walker = board.clone()
+    rng = random.Random(0)
+
+    for _ in range(200):
+        state = engine.state_from_board(walker)
+        assert engine.is_goal(state) == walker.is_solved()
+        assert engine.state_from_positions(engine.positions(state[1])) == state
+
+        neighbors = {engine.decode_move(move, metric == 'slide'): neighbor
+                     for move, neighbor in engine.neighbors(state, metric)}
+        assert set(neighbors) == legal_moves(walker, metric)
+
+        for move, neighbor in neighbors.items():
+            moved = walker.clone()
+            assert moved.apply(move)
+            assert engine.state_from_board(moved) == neighbor
+
+        walker.apply(rng.choice(sorted(neighbors, key=str)))
+
+
+def test_initial_state_matches_board(reference):
+    board, _ = reference
+    engine = BitboardEngine(board)
+    assert engine.initial_state() == engine.state_from_board(board)
@@ -0,0 +1,98 @@
+# test_board.py
+import random
+import pytest
+from board import Board
+
+DIRECTIONS = ('up', 'down', 'left', 'right')
+
+
+def random_walk(board, steps, seed):
+    """Joue au hasard `steps` mouvements (glissements compris) avec Board.apply ; renvoie le nombre joué."""
+    rng = random.Random(seed)
+    vehicle_ids = list(board.vehicles)
+    played = 0
+    for _ in range(steps):
+        move = (rng.choice(vehicle_ids), rng.choice(DIRECTIONS), rng.randint(1, 3))
+        if board.apply(move):
+            played += 1
+            board.check_consistency()
+    return played
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_apply_undo_round_trip(reference, seed):
+    """Annuler tous les mouvements joués ramène exactement au plateau de départ, sans incohérence."""
+    board, _ = reference
+    board.check_consistency()
+    start_key = board.get_state_key()
+    start_hash = board.get_state_hash()
+    start_grid = [row[:] for row in board.grid]
+
+    played = random_walk(board, 300, seed)
+    assert played > 0
+    assert len(board.history) == played
+
+    while board.undo() is not None:
+        board.check_consistency()
+
+    assert board.get_state_key() == start_key
+    assert board.get_state_hash() == start_hash
+    assert board.grid == start_grid
+
+
+def test_undo_returns_moves_in_reverse_order(reference):
+    board, _ = reference
+    random_walk(board, 50, 0)
+    played = list(board.history)
+    undone = []
+    while board.history:
+        undone.append(board.undo())
+    assert undone == played[::-1]
+    assert board.undo() is None
+
+
+def test_clone_is_independent(reference):
+    """Un clone a la même clé que l'original, et ses mouvements ne modifient pas l'original."""
+    board, _ = reference
+    key = board.get_state_key()
+    clone = board.clone()
+    assert clone.get_state_key() == key
+    assert clone.get_state_hash() == board.get_state_hash()
+
+    random_walk(clone, 100, 1)
+    clone.check_consistency()
+    board.check_consistency()
+    assert board.get_state_key() == key
+
+
+def test_state_key_identifies_position(reference):
+    """Deux plateaux ont la même clé si et seulement si tous leurs véhicules sont aux mêmes places."""
+    board, _ = reference
+    walker = board.clone()
+    rng = random.Random(2)
+    seen = {}
+    for _ in range(500):
+        move = (rng.choice(list(walker.vehicles)), rng.choice(DIRECTIONS))
+        if walker.apply(move):
+            positions = {vid: (v.x, v.y) for vid, v in walker.vehicles.items()}
+            previous = seen.setdefault(walker.get_state_key(), positions)
+            assert previous == positions
+
+    # La clé ne dépend pas de l'ordre d'ajout des véhicules
+    rebuilt = Board.from_dict(walker.to_dict())
+    assert rebuilt.get_state_key() == walker.get_state_key()
+    assert rebuilt.get_state_hash() == walker.get_state_hash()
+
+
+def test_invalid_move_is_not_recorded(make_board):
+    board = make_board(["......",
+                        "......",
+                        "XX....",
+                        "......",
+                        "......",
+                        "......"])
+    assert not board.apply(('X', 'left'))
+    assert not board.apply(('X', 'up'))
+    assert not board.apply(('Z', 'right'))
+    assert board.history == []
+    board.check_consistency()
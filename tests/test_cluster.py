@@ -0,0 +1,70 @@
+# test_cluster.py
+import random
+import threading
+import pytest
+from cluster import ClusterAnalysis
+from solver import Solver
+
+
+@pytest.mark.parametrize('metric', ('step', 'slide'))
+def test_distances_match_solver(reference, metric):
+    """La distance du plateau initial est la longueur optimale, et la solution du cluster mène à la sortie."""
+    board, moves = reference
+    cluster = ClusterAnalysis(board, metric, verbose=False)
+    assert cluster.analyze()
+    assert cluster.analyzed
+
+    assert cluster.distance(board) == moves[metric]
+    solution = cluster.solution_from(board)
+    assert len(solution) == moves[metric]
+    replay = board.clone()
+    for move in solution:
+        assert replay.apply(move)
+    assert replay.is_solved()
+
+
+def test_state_distances_are_exact(reference):
+    """Pour des états tirés au hasard dans le cluster, la distance enregistrée est celle du BFS."""
+    board, _ = reference
+    cluster = ClusterAnalysis(board, verbose=False)
+    assert cluster.analyze()
+
+    rng = random.Random(0)
+    keys = sorted(key for key, distance in cluster.distances.items() if distance is not None)
+    for key in rng.sample(keys, min(10, len(keys))):
+        state_board = cluster.board_at(key)
+        solution = Solver(state_board, verbose=False).solve(method='bfs')
+        assert len(solution) == cluster.distances[key]
+        assert cluster.distance(state_board) == cluster.distances[key]
+
+
+def test_analysis_stops_over_max_states(reference):
+    board, _ = reference
+    full = ClusterAnalysis(board, verbose=False)
+    assert full.analyze()
+    size = len(full.distances)
+
+    limited = ClusterAnalysis(board, verbose=False)
+    assert limited.analyze(max_states=size - 1) is False
+    assert not limited.analyzed
+    assert limited.distances == {}
+
+    assert ClusterAnalysis(board, verbose=False).analyze(max_states=size)
+
+
+def test_large_cluster_stops_early(make_board):
+    """Un plateau 8x8 presque vide a un très grand cluster : les limites arrêtent l'analyse en cours de couche."""
+    board = make_board(["A.......",
+                        "A.......",
+                        "...XX...",
+                        "..B.....",
+                        "..B..C..",
+                        ".....C..",
+                        "DD......",
+                        "......EE"])
+    assert ClusterAnalysis(board, verbose=False).analyze(max_states=5000) is False
+
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert ClusterAnalysis(board, verbose=False).analyze(cancel_event=cancel_event) is False
+    assert ClusterAnalysis(board, verbose=False).analyze(max_time=0.0) is False
@@ -0,0 +1,66 @@
+# test_difficulty.py
+import json
+from difficulty import REFERENCE, analyze_difficulty, difficulty_label, difficulty_score, rate_batch
+
+
+def test_analysis_measures_reference_boards(reference):
+    """Les facteurs mesurés reprennent les longueurs optimales connues dans les deux métriques."""
+    board, moves = reference
+    features = analyze_difficulty(board)
+
+    assert features['step_moves'] == moves['step']
+    assert features['slide_moves'] == moves['slide']
+    assert len(features['solution']) == moves['step']
+    assert 1 <= features['vehicles_moved'] <= len(board.vehicles)
+    assert 0 <= features['dead_end_ratio'] <= 1
+    assert 0 <= features['score'] <= 100
+    assert features['label'] == difficulty_label(features['score'])
+
+
+def test_score_grows_with_each_factor():
+    """À facteurs égaux par ailleurs, un facteur plus élevé donne un score plus élevé."""
+    median = {'slide_moves': 6, 'step_moves': 12, 'vehicles_moved': 5, 'cluster_size': 3000,
+              'dead_end_ratio': 0.08, 'branching_factor': 7.5}
+    base = difficulty_score(median)
+    for name in REFERENCE:
+        harder = dict(median, **{name: median[name] * 2})
+        assert difficulty_score(harder) > base, name
+
+
+def test_harder_board_scores_higher():
+    easy = {'slide_moves': 2, 'step_moves': 3, 'vehicles_moved': 2, 'cluster_size': 50,
+            'dead_end_ratio': 0.0, 'branching_factor': 4.0}
+    hard = {'slide_moves': 40, 'step_moves': 80, 'vehicles_moved': 12, 'cluster_size': 20000,
+            'dead_end_ratio': 0.3, 'branching_factor': 11.0}
+    assert difficulty_label(difficulty_score(easy)) == "Facile"
+    assert difficulty_label(difficulty_score(hard)) == "Difficile"
+
+
+def test_unsolvable_board_is_not_rated(make_board):
+    board = make_board(["......",
+                        "......",
+                        "XX..AA",
+                        "......",
+                        "......",
+                        "......"])
+    assert analyze_difficulty(board) is None
+
+
+def test_rate_batch(reference, make_board, tmp_path):
+    """La notation en lot produit une ligne par plateau, dans un ordre quelconque repéré par 'index'."""
+    board, moves = reference
+    unsolvable = make_board(["......", "......", "XX..AA", "......", "......", "......"])
+    input_path = tmp_path / 'levels.jsonl'
+    input_path.write_text('\n'.join([json.dumps(board.to_dict()), '', json.dumps(unsolvable.to_dict()),
+                                     'pas du json']) + '\n')
+    output_path = tmp_path / 'ratings.jsonl'
+
+    summary, rated = rate_batch(str(input_path), str(output_path), max_time=10.0, workers=1)
+
+    assert summary['levels'] == 3
+    assert (summary['rated'], summary['unrated'], summary['error']) == (1, 1, 1)
+    assert rated[0]['index'] == 0 and rated[0]['step_moves'] == moves['step']
+
+    results = {result['index']: result for result in map(json.loads, output_path.read_text().splitlines())}
+    assert {index: result['status'] for index, result in results.items()} == {0: 'rated', 2: 'unrated',
+                                                                                3: 'error'}
@@ -0,0 +1,39 @@
+# test_heuristics.py
+import pytest
+from cluster import ClusterAnalysis
+
+ADMISSIBLE_BOUNDS = ('lower_bound', 'obstruction_bound', 'pattern_bound')
+
+
+@pytest.mark.parametrize('metric', ('step', 'slide'))
+@pytest.mark.parametrize('bound_name', ADMISSIBLE_BOUNDS)
+def test_bounds_never_exceed_exact_distance(reference, metric, bound_name):
+    """Sur tout le cluster d'un plateau, une borne admissible ne dépasse jamais la distance exacte (BFS)."""
+    board, _ = reference
+    cluster = ClusterAnalysis(board, metric, verbose=False)
+    assert cluster.analyze()
+
+    engine = cluster.engine
+    bound = getattr(engine, bound_name)
+    checked = 0
+    for key, distance in cluster.distances.items():
+        if distance is None:
+            continue
+        state = engine.state_from_positions(engine.positions(key))
+        value = bound(state, metric)
+        assert value <= distance, f"{bound_name} = {value} > {distance} pour {engine.positions(key)}"
+        checked += 1
+    assert checked > 1
+
+
+@pytest.mark.parametrize('bound_name', ADMISSIBLE_BOUNDS)
+def test_bounds_are_zero_at_goal(make_board, bound_name):
+    board = make_board(["......",
+                        "..A...",
+                        "..A.XX",
+                        "......",
+                        "......",
+                        "......"])
+    cluster = ClusterAnalysis(board, verbose=False)
+    engine = cluster.engine
+    assert getattr(engine, bound_name)(engine.initial_state()) == 0
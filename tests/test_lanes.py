@@ -0,0 +1,49 @@
+# test_lanes.py
+import pytest
+from board import Board
+from lanes import lane_tables
+from vehicle import Vehicle
+
+
+def free_cells(length, position, bits, lane_size, step):
+    """Compte une à une les cases libres d'un côté du véhicule (step = -1 en reculant, 1 en avançant)."""
+    cell = position - 1 if step < 0 else position + length
+    count = 0
+    while 0 <= cell < lane_size and not bits >> cell & 1:
+        count += 1
+        cell += step
+    return count
+
+
+@pytest.mark.parametrize('lane_size', range(3, 9))
+def test_free_range_matches_cell_scan(lane_size):
+    """Pour toute occupation de ligne, la table donne les cases libres comptées une à une."""
+    tables = lane_tables(lane_size)
+    assert lane_tables(lane_size) is tables
+    for length in (1, 2, 3):
+        for position in range(lane_size - length + 1):
+            own = ((1 << length) - 1) << position
+            for bits in range(1 << lane_size):
+                expected = (free_cells(length, position, bits, lane_size, -1),
+                            free_cells(length, position, bits, lane_size, 1))
+                assert tables.free_range(length, position, bits | own) == expected
+
+
+@pytest.mark.parametrize('width, height', [(6, 6), (7, 5), (4, 8)])
+def test_can_move_matches_cell_scan(width, height):
+    """Sur des plateaux rectangulaires, can_move accepte exactement les glissements dont les cases sont libres."""
+    board = Board(width, height)
+    board.add_vehicle(Vehicle('X', 0, (height - 1) // 2, 2, 'H', True))
+    board.add_vehicle(Vehicle('A', width - 1, 0, 2, 'V'))
+    board.add_vehicle(Vehicle('B', 1, height - 1, 3, 'H'))
+    board.add_vehicle(Vehicle('C', 2, 0, 2, 'V'))
+
+    for vehicle in board.vehicles.values():
+        for direction, (dx, dy) in (('left', (-1, 0)), ('right', (1, 0)), ('up', (0, -1)), ('down', (0, 1))):
+            for distance in range(1, max(width, height) + 1):
+                along_axis = (dy == 0) == (vehicle.orientation == 'H')
+                path = [(x + dx * step, y + dy * step) for step in range(1, distance + 1)
+                        for x, y in vehicle.get_coordinates()]
+                expected = along_axis and all(board.get_vehicle_at(x, y) in (None, vehicle)
+                                              and 0 <= x < width and 0 <= y < height for x, y in path)
+                assert vehicle.can_move(direction, board, distance) == expected, (vehicle.id, direction, distance)
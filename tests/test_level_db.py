@@ -0,0 +1,79 @@
+# test_level_db.py
+import pytest
+from board import Board
+from vehicle import Vehicle
+from level_db import LevelDatabase, decode_grid, encode_grid, write_database
+from solver import Solver
+
+
+def occupied_cells(board):
+    """Cases occupées, groupées par véhicule, indépendamment des identifiants."""
+    return sorted((tuple(vehicle.get_coordinates()), vehicle.is_main) for vehicle in board.vehicles.values())
+
+
+def test_grid_round_trip(reference):
+    """Décoder puis réencoder une grille redonne la même grille, et le même plateau (sortie à droite)."""
+    board, moves = reference
+    framed = board.to_exit_frame() if board.exit_side != 'right' else board
+    grid = encode_grid(board)
+    assert len(grid) == framed.width * framed.height
+
+    decoded = decode_grid(grid, framed.width, framed.height, framed.exit_pos[1])
+    decoded.check_consistency()
+    assert encode_grid(decoded) == grid
+    assert occupied_cells(decoded) == occupied_cells(framed)
+    assert len(Solver(decoded, verbose=False).solve(method='bfs')) == moves['step']
+
+
+def test_database_round_trip(reference, make_board, tmp_path):
+    """Les niveaux écrits dans une base sont relus à l'identique, triés et indexés par nombre de mouvements."""
+    board, moves = reference
+    solved = make_board(["......",
+                         "......",
+                         "....XX",
+                         "......",
+                         "......",
+                         "......"])
+    path = str(tmp_path / 'levels.bin')
+    framed = board.to_exit_frame() if board.exit_side != 'right' else board
+    levels = [(board, moves['step'], 100), (solved, 0, 1), (board.clone(), moves['step'], 100)]
+    count = write_database(path, levels, framed.width, framed.height, framed.exit_pos[1])
+
+    # Le doublon n'est écrit qu'une fois ; le plateau résolu 6x6 n'a pas le format d'un plateau 6x5
+    expected = 2 if (framed.width, framed.height) == (6, 6) else 1
+    assert count == expected
+
+    database = LevelDatabase(path)
+    try:
+        assert len(database) == expected
+        index = database.random_index(moves['step'])
+        assert index is not None
+        grid, stored_moves, cluster_size = database.record(index)
+        assert (grid, stored_moves, cluster_size) == (encode_grid(board), moves['step'], 100)
+        assert occupied_cells(database.board(index)) == occupied_cells(framed)
+
+        assert list(database.range_for(0, moves['step'])) == list(range(expected))
+        assert database.random_index(moves['step'] + 1, moves['step'] + 10) is None
+        with pytest.raises(IndexError):
+            database.record(expected)
+    finally:
+        database.close()
+
+
+def crowded_board(count):
+    """Plateau 12x12 : la voiture principale et `count` voitures horizontales numérotées."""
+    board = Board(12, 12)
+    board.add_vehicle(Vehicle('X', 0, 5, 2, 'H', True))
+    cells = [(x, y) for y in range(12) if y != 5 for x in range(2, 12, 2)]
+    for vehicle_id, (x, y) in enumerate(cells[:count], 1):
+        assert board.add_vehicle(Vehicle(vehicle_id, x, y, 2, 'H'))
+    return board
+
+
+def test_too_many_vehicles_rejected():
+    """Au-delà des symboles disponibles, l'encodage échoue avec un ValueError explicite."""
+    with pytest.raises(ValueError):
+        encode_grid(crowded_board(52))
+
+    grid = encode_grid(crowded_board(51))
+    assert encode_grid(decode_grid(grid, 12, 12, 5)) == grid
@@ -0,0 +1,70 @@
+# test_solution_cache.py
+import random
+import pytest
+from board import Board
+from vehicle import Vehicle
+from solution_cache import SolutionCache, canonical_form
+from solver import Solver
+
+
+def renamed(board, seed):
+    """Copie du plateau dont les véhicules (hors voiture principale) sont renommés et ajoutés dans un autre ordre."""
+    rng = random.Random(seed)
+    vehicles = list(board.vehicles.values())
+    rng.shuffle(vehicles)
+    names = [f"V{i}" for i in range(len(vehicles))]
+    rng.shuffle(names)
+
+    copy = Board(board.width, board.height, board.exit_side,
+                 board.exit_pos[1] if board.exit_side in ('right', 'left') else board.exit_pos[0])
+    for vehicle, name in zip(vehicles, names):
+        vehicle_id = vehicle.id if vehicle.is_main else name
+        assert copy.add_vehicle(Vehicle(vehicle_id, vehicle.x, vehicle.y, vehicle.length,
+                                        vehicle.orientation, vehicle.is_main))
+    return copy
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_canonical_form_ignores_renaming(reference, seed):
+    board, _ = reference
+    copy = renamed(board, seed)
+    assert copy.get_state_key() != board.get_state_key()
+
+    key, ids = canonical_form(board)
+    copy_key, copy_ids = canonical_form(copy)
+    assert copy_key == key
+    # Les identifiants sont donnés dans le même ordre canonique : ils désignent les mêmes véhicules
+    for vehicle_id, copy_id in zip(ids, copy_ids):
+        original, other = board.vehicles[vehicle_id], copy.vehicles[copy_id]
+        assert (original.x, original.y, original.length) == (other.x, other.y, other.length)
+
+
+def test_canonical_form_distinguishes_positions(reference):
+    """Tout mouvement change l'encodage canonique."""
+    board, _ = reference
+    key, _ = canonical_form(board)
+    for vehicle_id in board.vehicles:
+        for direction in ('up', 'down', 'left', 'right'):
+            moved = board.clone()
+            if moved.move_vehicle(vehicle_id, direction):
+                assert canonical_form(moved)[0] != key
+
+
+def test_cached_solution_translated_to_new_names(reference, tmp_path):
+    """Une solution enregistrée pour un plateau sert à sa copie renommée, avec les noms de la copie."""
+    board, moves = reference
+    cache = SolutionCache(str(tmp_path / 'solutions.sqlite'))
+    try:
+        solution = Solver(board.clone(), verbose=False).solve(method='bfs')
+        cache.put(board, 'step', solution)
+
+        copy = renamed(board, 0)
+        cached = cache.get(copy, 'step')
+        assert len(cached) == moves['step']
+        replay = copy.clone()
+        for move in cached:
+            assert replay.apply(move)
+        assert replay.is_solved()
+        assert cache.get(copy, 'slide') is None
+    finally:
+        cache.close()
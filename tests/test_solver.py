@@ -0,0 +1,109 @@
+# test_solver.py
+import os
+import pytest
+from solver import Solver
+
+METRICS = ('step', 'slide')
+
+# Méthodes qui garantissent une solution optimale : (méthode, paramètres de solve)
+OPTIMAL_METHODS = [
+    ('bfs', {}),
+    ('astar', {'heuristic': 'blockers'}),
+    ('astar', {'heuristic': 'blockers2'}),
+    ('astar', {'heuristic': 'pdb'}),
+    ('ida', {}),
+    ('ida', {'heuristic': 'pdb'}),
+    ('wastar', {'heuristic': 'blockers', 'epsilon': 1.0}),
+    ('external', {'buffer_size': 100}),
+    ('parallel', {'workers': 2}),
+]
+
+
+def replay(board, solution):
+    """Rejoue une solution avec Board.apply et renvoie le plateau obtenu."""
+    board = board.clone()
+    for move in solution:
+        assert board.apply(move), f"Mouvement impossible: {move}"
+    return board
+
+
+def solve(board, metric, method, tmp_path=None, **options):
+    if method == 'external':
+        options['work_dir'] = str(tmp_path)
+    solver = Solver(board.clone(), metric, verbose=False)
+    return solver, solver.solve(max_time=60.0, method=method, **options)
+
+
+@pytest.mark.parametrize('metric', METRICS)
+@pytest.mark.parametrize('method, options', OPTIMAL_METHODS)
+def test_optimal_methods_agree(reference, metric, method, options, tmp_path):
+    """Les méthodes optimales trouvent toutes une solution de la longueur connue, qui mène à la sortie."""
+    board, moves = reference
+    solver, solution = solve(board, metric, method, tmp_path, **options)
+
+    assert solution is not None
+    assert len(solution) == moves[metric]
+    assert solver.stats['suboptimality_bound'] == 1.0
+    assert replay(board, solution).is_solved()
+
+
+@pytest.mark.parametrize('metric', METRICS)
+def test_weighted_astar_respects_bound(reference, metric):
+    """A* pondéré reste dans la borne annoncée sur la longueur de la solution."""
+    board, moves = reference
+    solver, solution = solve(board, metric, 'wastar', heuristic='blockers', epsilon=2.0)
+
+    assert solution is not None
+    assert moves[metric] <= len(solution) <= solver.stats['suboptimality_bound'] * moves[metric]
+    assert replay(board, solution).is_solved()
+
+
+@pytest.mark.parametrize('metric', METRICS)
+@pytest.mark.parametrize('method, options', [('astar', {}), ('beam', {})])
+def test_inexact_methods_reach_goal(reference, metric, method, options):
+    """A* historique et la recherche en faisceau renvoient une solution valide, jamais plus courte que l'optimum."""
+    board, moves = reference
+    _, solution = solve(board, metric, method, **options)
+
+    assert solution is not None
+    assert len(solution) >= moves[metric]
+    assert replay(board, solution).is_solved()
+
+
+def test_external_search_keeps_foreign_files(reference, tmp_path):
+    """Le parcours sur disque ne laisse aucun fichier et ne supprime pas ceux du répertoire fourni."""
+    board, moves = reference
+    notes = tmp_path / 'notes.txt'
+    notes.write_text('à garder')
+
+    _, solution = solve(board, 'step', 'external', tmp_path)
+
+    assert len(solution) == moves['step']
+    assert os.listdir(tmp_path) == ['notes.txt']
+    assert notes.read_text() == 'à garder'
+
+
+@pytest.mark.parametrize('method', ['bfs', 'astar', 'ida'])
+def test_solved_board_needs_no_move(make_board, method):
+    board = make_board(["......",
+                        "......",
+                        "....XX",
+                        "......",
+                        "......",
+                        "......"])
+    assert Solver(board, verbose=False).solve(method=method) == []
+
+
+@pytest.mark.parametrize('method', ['bfs', 'astar', 'ida', 'external', 'parallel'])
+def test_unsolvable_board_has_no_solution(make_board, method, tmp_path):
+    """Un véhicule horizontal devant la voiture principale : l'analyse statique conclut sans recherche."""
+    board = make_board(["......",
+                        "......",
+                        "XX..AA",
+                        "......",
+                        "......",
+                        "......"])
+    solver, solution = solve(board, 'step', method, tmp_path)
+    assert solution is None
+    assert solver.stats['unsolvable_reason']
+    assert solver.stats['nodes_explored'] == 0
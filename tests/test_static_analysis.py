@@ -0,0 +1,62 @@
+# test_static_analysis.py
+import random
+import pytest
+from cluster import ClusterAnalysis
+from level_generator import LevelGenerator
+from static_analysis import find_deadlock
+
+
+def test_no_deadlock_in_solvable_clusters(reference):
+    """Aucun état soluble du cluster d'un plateau de référence n'est déclaré insoluble."""
+    board, _ = reference
+    assert find_deadlock(board) is None
+
+    cluster = ClusterAnalysis(board, verbose=False)
+    assert cluster.analyze()
+    for key, distance in cluster.distances.items():
+        if distance is not None:
+            state_board = cluster.board_at(key)
+            assert find_deadlock(state_board) is None, state_board.to_dict()
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_no_deadlock_on_random_solvable_layouts(seed):
+    """Sur des dispositions aléatoires, tout plateau soluble (d'après le cluster) passe l'analyse statique."""
+    random.seed(seed)
+    generator = LevelGenerator(6)
+    checked = 0
+    while checked < 20:
+        board = generator._random_layout(6, 12)
+        if board is None:
+            continue
+        cluster = ClusterAnalysis(board, verbose=False)
+        if not cluster.analyze(max_states=20000):
+            continue  # Cluster trop grand pour un test rapide
+        if cluster.distance(board) is not None:
+            assert find_deadlock(board) is None, board.to_dict()
+            checked += 1
+
+
+@pytest.mark.parametrize('rows', [
+    # Véhicule horizontal devant la voiture principale
+    ["......",
+     "......",
+     "XX.AA.",
+     "......",
+     "......",
+     "......"],
+    # Camion vertical de hauteur 3 pris entre deux véhicules horizontaux qui occupent toute leur ligne
+    ["BBBCCC",
+     "..A...",
+     "XXA...",
+     "..A...",
+     "DDDEEE",
+     "......"],
+])
+def test_deadlock_detected(make_board, rows):
+    board = make_board(rows)
+    assert find_deadlock(board) is not None
+
+    cluster = ClusterAnalysis(board, verbose=False)
+    assert cluster.analyze()
+    assert cluster.distance(board) is None
@@ -0,0 +1,49 @@
+# test_vehicle.py
+import pickle
+import pytest
+from vehicle import Vehicle, VehicleSpec
+
+
+def test_spec_is_shared_and_immutable():
+    first = Vehicle('A', 2, 3, 2, 'H')
+    second = Vehicle('A', 0, 3, 2, 'H')
+    assert first.spec is second.spec
+    assert Vehicle('A', 2, 3, 2, 'V').spec is not first.spec
+
+    with pytest.raises(AttributeError):
+        first.spec.length = 3
+
+
+def test_spec_survives_pickling():
+    """Une description transmise à un autre processus redevient l'instance partagée."""
+    vehicle = Vehicle('T', 4, 1, 3, 'V')
+    copy = pickle.loads(pickle.dumps(vehicle.spec))
+    assert copy is vehicle.spec
+    assert copy is VehicleSpec.get('T', 3, 'V', False, 4)
+
+
+@pytest.mark.parametrize('orientation, direction, expected', [
+    ('H', 'right', (3, 1)),
+    ('H', 'left', (1, 1)),
+    ('V', 'down', (2, 2)),
+    ('V', 'up', (2, 0)),
+])
+def test_position_follows_orientation(orientation, direction, expected):
+    vehicle = Vehicle('A', 2, 1, 2, orientation)
+    vehicle.move(direction)
+    assert (vehicle.x, vehicle.y) == expected
+
+
+def test_board_clone_shares_specs(reference):
+    """Un clone partage les descriptions de ses véhicules mais pas leurs positions."""
+    board, _ = reference
+    clone = board.clone()
+    for vehicle_id, vehicle in board.vehicles.items():
+        assert clone.vehicles[vehicle_id].spec is vehicle.spec
+        assert clone.vehicles[vehicle_id] is not vehicle
+
+    vehicle_id, direction = next((vid, d) for vid in clone.vehicles for d in ('up', 'down', 'left', 'right')
+                                 if clone.vehicles[vid].can_move(d, clone))
+    before = board.vehicles[vehicle_id].position
+    assert clone.move_vehicle(vehicle_id, direction)
+    assert board.vehicles[vehicle_id].position == before
@@ -1,22 +1,119 @@
+from lanes import lane_tables
+
+# Descriptions immuables partagées : un même véhicule (ID, taille, orientation, ligne)
+# n'est décrit qu'une fois, quel que soit le nombre de plateaux qui le contiennent
+_specs = {}
+
+
+class VehicleSpec:
+    __slots__ = ('id', 'length', 'orientation', 'is_main', 'lane')
+
+    def __init__(self, id, length, orientation, is_main, lane):
+        """
+        Décrit la partie immuable d'un véhicule.
+
+        Args:
+            id (str): Identifiant du véhicule
+            length (int): Longueur du véhicule (2 ou 3)
+            orientation (str): 'H' pour horizontal, 'V' pour vertical
+            is_main (bool): True si c'est la voiture rouge principale
+            lane (int): Ligne (H) ou colonne (V) sur laquelle le véhicule se déplace
+        """
+        object.__setattr__(self, 'id', id)
+        object.__setattr__(self, 'length', length)
+        object.__setattr__(self, 'orientation', orientation)
+        object.__setattr__(self, 'is_main', is_main)
+        object.__setattr__(self, 'lane', lane)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("VehicleSpec est immuable")
+
+    def __reduce__(self):
+        return VehicleSpec.get, (self.id, self.length, self.orientation, self.is_main, self.lane)
+
+    @staticmethod
+    def get(id, length, orientation, is_main, lane):
+        """
+        Retourne la description partagée correspondant à ces caractéristiques.
+
+        Returns:
+            VehicleSpec: Instance unique pour ce quintuplet
+        """
+        key = (id, length, orientation, is_main, lane)
+        spec = _specs.get(key)
+        if spec is None:
+            spec = VehicleSpec(id, length, orientation, is_main, lane)
+            _specs[key] = spec
+        return spec
+
+
 class Vehicle:
+    __slots__ = ('spec', 'position')
+
     def __init__(self, id, x, y, length, orientation, is_main=False):
         """
         Initialise un véhicule.
 
+        Seule la position sur sa ligne (x pour un véhicule horizontal, y pour un
+        véhicule vertical) est propre à l'instance ; le reste est partagé via
+        `VehicleSpec`.
+
         Args:
-            id (str): Identifiant d'un véhicule (ex: 'A', 'B', etc.)
+            id (str | int): Identifiant d'un véhicule (ex: 'A', 'B', etc., ou un entier
+                            sur les grands plateaux)
             x (int): Position x initiale (colonne)
             y (int): Position y initiale (ligne)
             length (int): Longueur du véhicule (2 pour une voiture ou 3 pour un camion)
             orientation (str): 'H' pour horizontal, 'V' pour vertical
             is_main (bool): True si c'est la voiture rouge principale
         """
-        self.id = id
-        self.x = x
-        self.y = y
-        self.length = length
-        self.orientation = orientation
-        self.is_main = is_main
+        if orientation == 'H':
+            self.spec = VehicleSpec.get(id, length, orientation, is_main, y)
+            self.position = x
+        else:
+            self.spec = VehicleSpec.get(id, length, orientation, is_main, x)
+            self.position = y
+
+    @classmethod
+    def from_spec(cls, spec, position):
+        """
+        Crée un véhicule à partir d'une description partagée et d'une position.
+
+        Args:
+            spec (VehicleSpec): Description immuable du véhicule
+            position (int): Position sur sa ligne
+
+        Returns:
+            Vehicle: Nouveau véhicule
+        """
+        vehicle = cls.__new__(cls)
+        vehicle.spec = spec
+        vehicle.position = position
+        return vehicle
+
+    @property
+    def id(self):
+        return self.spec.id
+
+    @property
+    def length(self):
+        return self.spec.length
+
+    @property
+    def orientation(self):
+        return self.spec.orientation
+
+    @property
+    def is_main(self):
+        return self.spec.is_main
+
+    @property
+    def x(self):
+        return self.position if self.spec.orientation == 'H' else self.spec.lane
+
+    @property
+    def y(self):
+        return self.spec.lane if self.spec.orientation == 'H' else self.position
 
     def get_coordinates(self):
         """Retourne toutes les coordonnées occupées par le véhicule."""
@@ -29,66 +126,52 @@ class Vehicle:
                 coords.append((self.x, self.y + i))
         return coords
 
-    def can_move(self, direction, board):
+    def can_move(self, direction, board, distance=1):
         """
         Vérifie si le véhicule peut se déplacer dans la direction donnée.
 
         Args:
             direction (str): 'up', 'down', 'left', 'right'
             board (Board): L'état actuel du plateau
+            distance (int): Nombre de cases à parcourir (glissement)
 
         Returns:
             bool: True si le mouvement est possible
         """
+        if distance < 1:
+            return False
+
         if self.orientation == 'H':  # Horizontal
-            if direction in ['up', 'down']:
+            if direction not in ['left', 'right']:
                 return False  # Ne peut pas bouger verticalement
-
-            if direction == 'left':
-                new_x = self.x - 1
-                if new_x < 0:
-                    return False
-                return board.is_cell_empty(new_x, self.y)
-
-            if direction == 'right':
-                new_x = self.x + self.length
-                if new_x >= board.size:
-                    return False
-                return board.is_cell_empty(new_x, self.y)
-
+            bits = board.row_bits[self.y]
+            backward = direction == 'left'
         else:  # Vertical
-            if direction in ['left', 'right']:
+            if direction not in ['up', 'down']:
                 return False  # Ne peut pas bouger horizontalement
+            bits = board.column_bits[self.x]
+            backward = direction == 'up'
 
-            if direction == 'up':
-                new_y = self.y - 1
-                if new_y < 0:
-                    return False
-                return board.is_cell_empty(self.x, new_y)
-
-            if direction == 'down':
-                new_y = self.y + self.length
-                if new_y >= board.size:
-                    return False
-                return board.is_cell_empty(self.x, new_y)
-
-        return False
+        # Cases libres de part et d'autre du véhicule, lues dans la table de sa ligne
+        back, forward = lane_tables(board.lane_size(self)).free_range(self.length, self.position, bits)
+        return distance <= (back if backward else forward)
 
-    def move(self, direction):
+    def move(self, direction, distance=1):
         """
         Déplace le véhicule dans la direction donnée.
 
         Args:
             direction (str): 'up', 'down', 'left', 'right'
+            distance (int): Nombre de cases à parcourir
         """
         if self.orientation == 'H':  # Horizontal
             if direction == 'left':
-                self.x -= 1
+                self.position -= distance
             elif direction == 'right':
-                self.x += 1
+                self.position += distance
 
         else:  # Vertical
             if direction == 'up':
-                self.y -= 1
+                self.position -= distance
             elif direction == 'down':
-                self.y += 1
+                self.position += distance